@@ -0,0 +1,88 @@
+"""
+Cold-start population time on a fresh SQLite file.
+
+Loads the CSV catalog plus synthetic ingredients and recipes twice: once
+through the per-row add_category/add_ingredient/add_recipe calls (a SELECT,
+flush and commit each) and once through the bulk add_multiple_* paths
+that populate() uses.
+
+    python -m benchmarks.bench_bulk_populate
+"""
+
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from pantry.adapters import orm
+from pantry.adapters.database_repository import SqlAlchemyRepository
+from pantry.adapters.datareader.reader import DataReader
+from pantry.domainmodel.category import Category
+from pantry.domainmodel.ingredient import Ingredient
+from pantry.domainmodel.recipe import Recipe
+
+N_INGREDIENTS = 3_000
+N_RECIPES = 1_000
+
+
+def catalog():
+    reader = DataReader()
+    categories = list(reader.categories) + [Category(f"Synthetic {i}") for i in range(50)]
+    ingredients = list(reader.ingredients) + [
+        Ingredient(f"Synthetic Ingredient {i}", 0, "g",
+                   categories=[categories[i % len(categories)]], range_min=1, range_max=500, step=5)
+        for i in range(N_INGREDIENTS)
+    ]
+    recipes = list(reader.recipes) + [
+        Recipe(
+            id=10_000 + i, name=f"Synthetic Recipe {i}", description="",
+            ingredients=[("100", "g", f"Synthetic Ingredient {(i + j) % N_INGREDIENTS}") for j in range(8)],
+            methods=["mix", "cook"], prep_time_mins=5, cook_time_mins=10, total_time_mins=15,
+            difficulty="Easy", category="Main", cuisine="Test", tags=["synthetic"],
+            notes="", image_url="",
+        )
+        for i in range(N_RECIPES)
+    ]
+    return categories, ingredients, recipes
+
+
+def fresh_repo(path):
+    engine = create_engine(f"sqlite:///{path}")
+    orm.Base.metadata.create_all(engine)
+    orm.install_search_indexes(engine)
+    return engine, SqlAlchemyRepository(sessionmaker(bind=engine), str(engine.url))
+
+
+def row_by_row(repo, categories, ingredients, recipes):
+    for c in categories:
+        repo.add_category(c)
+    for i in ingredients:
+        repo.add_ingredient(i)
+    for r in recipes:
+        repo.add_recipe(r)
+
+
+def bulk(repo, categories, ingredients, recipes):
+    repo.add_multiple_categories(categories)
+    repo.add_multiple_ingredients(ingredients)
+    repo.add_multiple_recipes(recipes)
+
+
+def main():
+    data = catalog()
+    print(f"{len(data[0])} categories, {len(data[1])} ingredients, {len(data[2])} recipes\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, load in (("row by row", row_by_row), ("bulk", bulk)):
+            engine, repo = fresh_repo(os.path.join(tmp, f"{load.__name__}.db"))
+            start = time.perf_counter()
+            load(repo, *data)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<12}{elapsed:>8.2f} s")
+            repo._session_cm.close_current_session()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Memory footprint of the domain objects.
+
+Reports traced bytes per instance for each domain class (field values
+allocated up front, so only the object itself is counted), then builds a
+synthetic catalog of 100k recipes the way DataReader does, with every
+string freshly parsed, and reports the traced total and the RSS growth.
+
+    python -m benchmarks.bench_domain_memory
+"""
+
+import gc
+import random
+import tracemalloc
+
+from pantry.domainmodel.category import Category
+from pantry.domainmodel.ingredient import Ingredient
+from pantry.domainmodel.recipe import Recipe
+from pantry.domainmodel.user import User
+
+N_OBJECTS = 20_000
+N_RECIPES = 100_000
+
+UNITS = ["g", "kg", "ml", "l", "tsp", "tbsp", "cup", "pieces"]
+CUISINES = ["Italian", "Mexican", "Indian", "Thai", "French", "American", "Chinese"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+CATEGORIES = ["Main", "Dessert", "Breakfast", "Side", "Soup", "Salad"]
+TAGS = ["quick", "vegetarian", "spicy", "family", "chicken", "beef", "baking"]
+
+
+def rss_kib() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def fresh(value: str) -> str:
+    # a new str object with the same text, like csv parsing produces
+    return (" " + value)[1:]
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used, objects
+
+
+def per_object():
+    name, unit = "Carrot", "kg"
+    categories = [Category("Vegetable")]
+    methods, tags, ingredients = ("mix",), ("quick",), (("1", "kg", "Carrot"),)
+    builders = {
+        "Category": lambda: [Category(name) for _ in range(N_OBJECTS)],
+        "Ingredient": lambda: [
+            Ingredient(name, 0, unit, categories=categories) for _ in range(N_OBJECTS)
+        ],
+        "Recipe": lambda: [
+            Recipe(i, name, "", ingredients, methods, 1, 2, 3, "Easy", "Main",
+                   "Italian", tags, "", "")
+            for i in range(N_OBJECTS)
+        ],
+        "User": lambda: [User(i, name, name) for i in range(N_OBJECTS)],
+    }
+    for label, build in builders.items():
+        used, _ = traced(build)
+        # the list holding the objects is 8 bytes per slot
+        print(f"{label:<12}{used / N_OBJECTS - 8:>8.0f} bytes/object")
+
+
+def synthetic_catalog():
+    rng = random.Random(7)
+    recipes = []
+    for i in range(N_RECIPES):
+        ingredients = [
+            (fresh(str(rng.randint(1, 500))), fresh(rng.choice(UNITS)), fresh(f"Ingredient {rng.randint(0, 2000)}"))
+            for _ in range(8)
+        ]
+        recipes.append(
+            Recipe(
+                i, f"Recipe {i}", f"Description of recipe {i}", ingredients,
+                [fresh("Prepare the ingredients."), fresh("Cook until done.")],
+                10, 20, 30,
+                fresh(rng.choice(DIFFICULTIES)), fresh(rng.choice(CATEGORIES)),
+                fresh(rng.choice(CUISINES)), [fresh(t) for t in rng.sample(TAGS, 3)],
+                "", "",
+            )
+        )
+    return recipes
+
+
+def main():
+    # RSS first and without tracemalloc, whose bookkeeping inflates it
+    rss_before = rss_kib()
+    recipes = synthetic_catalog()
+    rss_growth = (rss_kib() - rss_before) / 1024
+    del recipes
+
+    per_object()
+    used, recipes = traced(synthetic_catalog)
+    print(f"\n{len(recipes)} recipes: {used / 2**20:.1f} MiB traced, "
+          f"{used / len(recipes):.0f} bytes/recipe, RSS +{rss_growth:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Substring search latency at 100k ingredients.
+
+Compares the old per-request scan (lowercase + ``in`` over every name, then
+sort) with the in-memory NGramIndex, and SQLite ``lower(name) LIKE`` with the
+FTS5 trigram index used by SqlAlchemyRepository.
+
+    python -m benchmarks.bench_search_index
+"""
+
+import random
+import string
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from pantry.adapters import orm
+from pantry.adapters.database_repository import SqlAlchemyRepository
+from pantry.adapters.search_index import NGramIndex
+
+N_INGREDIENTS = 100_000
+QUERIES = ["carrot", "pot", "chicken bre", "ella", "zzzq", "sauce"]
+REPEATS = 20
+
+WORDS = [
+    "carrot", "potato", "chicken", "breast", "thigh", "beef", "mince", "onion",
+    "garlic", "sauce", "tomato", "mozzarella", "cheddar", "parmesan", "rice",
+    "noodle", "pepper", "sweet", "smoked", "paprika", "honey", "mustard",
+]
+
+
+def synthetic_names(n):
+    rng = random.Random(42)
+    # a few thousand made-up words on top of the real ones, so that common
+    # queries hit a realistic fraction of the catalog
+    syllables = ["ba", "ko", "ri", "tan", "mel", "so", "vi", "dra", "pu", "len", "que", "zo"]
+    vocab = WORDS + ["".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(3000)]
+    names = set()
+    while len(names) < n:
+        words = rng.sample(vocab, rng.randint(1, 3))
+        suffix = "".join(rng.choices(string.ascii_lowercase, k=4))
+        names.add(" ".join(w.title() for w in words) + " " + suffix)
+    return sorted(names)
+
+
+def timed(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def linear_scan(names, query):
+    return sorted(n for n in names if query.lower() in n.lower())
+
+
+def main():
+    names = synthetic_names(N_INGREDIENTS)
+    print(f"{len(names)} ingredient names\n")
+
+    start = time.perf_counter()
+    index = NGramIndex()
+    index.add_many((n, n) for n in names)
+    print(f"NGramIndex build: {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+    engine = create_engine(
+        "sqlite:///file:bench?mode=memory&cache=shared&uri=true",
+        connect_args={"check_same_thread": False},
+    )
+    orm.Base.metadata.create_all(engine)
+    orm.install_search_indexes(engine)
+    with engine.begin() as conn:
+        conn.execute(orm.IngredientModel.__table__.insert(), [{"name": n} for n in names])
+    repo = SqlAlchemyRepository(sessionmaker(bind=engine), str(engine.url))
+    plain = SqlAlchemyRepository(sessionmaker(bind=engine), str(engine.url))
+    plain._search_tables = set()
+    session = repo._session_cm.session
+
+    def sql_ids(r, q):
+        return [m.name for m in r._search_by_name(orm.IngredientModel, q)]
+
+    header = f"{'query':<14}{'hits':>7}{'scan ms':>10}{'ngram ms':>10}{'LIKE ms':>10}{'FTS5 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for q in QUERIES:
+        scan_ms, expected = timed(lambda: linear_scan(names, q))
+        ngram_ms, got = timed(lambda: index.search(q))
+        assert got == expected
+        like_ms, like = timed(lambda: sql_ids(plain, q), repeats=3)
+        fts_ms, fts = timed(lambda: sql_ids(repo, q), repeats=3)
+        session.expunge_all()
+        assert like == fts == expected
+        print(f"{q:<14}{len(got):>7}{scan_ms:>10.2f}{ngram_ms:>10.2f}{like_ms:>10.2f}{fts_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
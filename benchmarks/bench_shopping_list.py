@@ -0,0 +1,55 @@
+"""
+Consolidating a week's shopping list.
+
+Builds a plan of 20 recipes from the CSV catalog (cycling through it) with every ingredient
+selected, plus a 30 item grocery list, and times consolidate() over all
+of the lines, then times plan_purchases() for a 48 recipe plan with half
+of each ingredient on hand.
+
+    python -m benchmarks.bench_shopping_list
+"""
+
+import itertools
+import timeit
+
+from pantry.adapters.datareader.reader import DataReader
+from pantry.domainmodel.shopping_list import consolidate, plan_purchases
+
+N_RECIPES = 20
+N_GROCERIES = 30
+N_PLAN_RECIPES = 48
+REPEAT = 2_000
+
+
+def main():
+    reader = DataReader()
+    # the catalog is small, so the week repeats some recipes
+    catalog_recipes = sorted(reader.recipes, key=lambda r: r.id)
+    recipes = list(itertools.islice(itertools.cycle(catalog_recipes), N_RECIPES))
+    lines = sorted(reader.ingredients, key=lambda i: i.name)[:N_GROCERIES]
+    for recipe in recipes:
+        lines.extend(recipe.ingredients)
+
+    items = consolidate(lines)
+    seconds = timeit.timeit(lambda: consolidate(lines), number=REPEAT) / REPEAT
+    print(f"{len(recipes)} recipes + {N_GROCERIES} groceries: {len(lines)} lines -> {len(items)} items")
+    print(f"consolidate: {seconds * 1e6:.1f} us per list")
+
+    catalog = {i.name.casefold(): i for i in reader.ingredients}
+    lines = sorted(reader.ingredients, key=lambda i: i.name)[:N_GROCERIES]
+    for recipe in itertools.islice(itertools.cycle(catalog_recipes), N_PLAN_RECIPES):
+        lines.extend(recipe.ingredients)
+    demand = consolidate(lines)
+    on_hand = [item._replace(quantity=(item.quantity or 0) / 2) for item in demand]
+
+    def plan():
+        return plan_purchases(consolidate(lines), on_hand, lambda name: catalog.get(name.casefold()))
+
+    purchases = plan()
+    seconds = timeit.timeit(plan, number=REPEAT) / REPEAT
+    print(f"\n{N_PLAN_RECIPES} recipes: {len(lines)} lines -> {len(purchases)} purchases")
+    print(f"consolidate + plan_purchases: {seconds * 1e6:.1f} us per plan")
+
+
+if __name__ == "__main__":
+    main()
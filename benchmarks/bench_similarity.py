@@ -0,0 +1,96 @@
+"""
+"More like this" and recommendations over 100k recipes.
+
+Builds 100k synthetic recipes (6-14 ingredients from a 3,000 name
+vocabulary, 1-3 of 40 tags, one of 20 cuisines and 8 categories), then
+times the initial build, single add_recipe updates and uncached
+similar()/recommend() queries (the memo is bypassed by asking for a new
+recipe each time). Also reports how close the returned top-k scores come to
+an exhaustive index with no posting budget.
+
+    python -m benchmarks.bench_similarity
+"""
+
+import random
+import statistics
+import time
+
+from pantry.adapters.similarity_index import RecipeSimilarityIndex
+from pantry.domainmodel.recipe import Recipe
+
+N_RECIPES = 100_000
+N_VOCABULARY = 3_000
+N_QUERIES = 200
+N_ADDS = 200
+
+
+def synthetic_recipes(rng, start, count):
+    vocabulary = [f"Ingredient {i}" for i in range(N_VOCABULARY)]
+    weights = [1 / (i + 1) for i in range(N_VOCABULARY)]
+    tags = [f"tag {i}" for i in range(40)]
+    cuisines = [f"Cuisine {i}" for i in range(20)]
+    categories = [f"Category {i}" for i in range(8)]
+    for rid in range(start, start + count):
+        names = set(rng.choices(vocabulary, weights, k=rng.randint(6, 14)))
+        yield Recipe(
+            rid, f"Recipe {rid}", "", tuple(("1", "", n) for n in names), (), 1, 1, 2, "Easy",
+            rng.choice(categories), rng.choice(cuisines), tuple(rng.sample(tags, rng.randint(1, 3))), "", "",
+        )
+
+
+def millis(samples):
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95)]
+    return f"median {statistics.median(ordered) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms"
+
+
+def main():
+    rng = random.Random(20)
+    recipes = list(synthetic_recipes(rng, 0, N_RECIPES))
+
+    index = RecipeSimilarityIndex()
+    start = time.perf_counter()
+    index.add_many(recipes)
+    index.similar(0)  # first query builds the weights
+    print(f"{N_RECIPES} recipes indexed in {time.perf_counter() - start:.1f} s\n")
+
+    samples = []
+    for recipe_id in rng.sample(range(N_RECIPES), N_QUERIES):
+        start = time.perf_counter()
+        index.similar(recipe_id, 4)
+        samples.append(time.perf_counter() - start)
+    print(f"similar, k=4:              {millis(samples)}")
+
+    samples = []
+    for _ in range(N_QUERIES):
+        saved = rng.sample(range(N_RECIPES), 12)
+        start = time.perf_counter()
+        index.recommend(saved, 6)
+        samples.append(time.perf_counter() - start)
+    print(f"recommend, 12 saved, k=6:  {millis(samples)}")
+
+    samples = []
+    for recipe in synthetic_recipes(rng, N_RECIPES, N_ADDS):
+        start = time.perf_counter()
+        index.add(recipe)
+        samples.append(time.perf_counter() - start)
+    print(f"add_recipe:                {millis(samples)}")
+
+    exhaustive = RecipeSimilarityIndex(posting_budget=10**9, rerank=10**9)
+    exhaustive.add_many(recipes)
+
+    def quality(query):
+        got, best = query(index), query(exhaustive)
+        return sum(score for _, score in got) / (sum(score for _, score in best) or 1.0)
+
+    ids = rng.sample(range(N_RECIPES), 50)
+    seeds = [rng.sample(range(N_RECIPES), 12) for _ in range(50)]
+    similar_q = [quality(lambda ix: ix.similar(rid, 4)) for rid in ids]
+    recommend_q = [quality(lambda ix: ix.recommend(saved, 6)) for saved in seeds]
+    print("\ntop-k score vs exhaustive:")
+    print(f"    similar    mean {statistics.mean(similar_q):.3f}, min {min(similar_q):.3f}")
+    print(f"    recommend  mean {statistics.mean(recommend_q):.3f}, min {min(recommend_q):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,3 +24,12 @@ class Config:
     SQLALCHEMY_ECHO = False
     if isinstance(echo_string, str) and echo_string.lower().strip() == "true":
         SQLALCHEMY_ECHO = True
+
+    # Cross-worker cache invalidation: a small SQLite file of version counters
+    # (defaults to one per database in the temp dir) polled at most this often.
+    VERSION_CHANNEL_PATH = environ.get("VERSION_CHANNEL_PATH")
+    VERSION_POLL_INTERVAL = float(environ.get("VERSION_POLL_INTERVAL", "1.0"))
+
+    # Build missing image derivatives in a background thread on first use
+    # (needs Pillow); `flask build-images` builds them all ahead of time.
+    IMAGE_DERIVATIVES_ON_DEMAND = environ.get("IMAGE_DERIVATIVES_ON_DEMAND", "true").lower().strip() == "true"
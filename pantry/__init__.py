@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 from flask import render_template
 from sqlalchemy import create_engine, NullPool, inspect
 from sqlalchemy.orm import sessionmaker, clear_mappers
+from werkzeug.exceptions import InternalServerError
 
 from pantry.adapters import repository
 from pantry.adapters.memory_repository import MemoryRepository
@@ -10,13 +11,17 @@ from pantry.blueprints.authentication.authentication import authentication_bluep
 from pantry.blueprints.home.home import home_bp
 from pantry.blueprints.inventory.inventory import inventory_bp
 from pantry.blueprints.recipes.recipes import recipes_bp
+from pantry.blueprints.search.search import search_bp
 from pantry.blueprints.shopping.shopping import shopping_bp
 from pantry.blueprints.user.user import user_bp
-from pantry.utilities.auth import get_current_user
+from pantry.utilities import assets, bundles, etags, images
+from pantry.utilities.auth import get_current_user, invalidate_current_user
 
 from pantry.blueprints.services import _repo
 
+from pantry.adapters.caching_repository import CachingRepository
 from pantry.adapters.database_repository import SqlAlchemyRepository
+from pantry.adapters.version_channel import VersionChannel, default_channel_path
 
 
 def create_app():
@@ -54,6 +59,13 @@ def create_app():
             autocommit=False, autoflush=True, bind=database_engine
         )
 
+        # shared with the other workers on this host, so their catalog
+        # caches notice our writes
+        versions = VersionChannel(
+            app.config["VERSION_CHANNEL_PATH"] or default_channel_path(database_uri),
+            poll_interval=app.config["VERSION_POLL_INTERVAL"],
+        )
+
         inspector = inspect(database_engine)
 
         clear_mappers()
@@ -62,29 +74,83 @@ def create_app():
         if len(inspector.get_table_names()) == 0:
             print("No tables found — creating tables and populating database...")
             orm.Base.metadata.create_all(database_engine)
-            repository.repo_instance = SqlAlchemyRepository(session_factory, database_uri)
+            orm.install_search_indexes(database_engine)
+            repository.repo_instance = CachingRepository(
+                SqlAlchemyRepository(session_factory, database_uri), versions
+            )
             database_mode = True
             populate(repository.repo_instance, database_mode)
         else:
             print("Tables found")
-            repository.repo_instance = SqlAlchemyRepository(session_factory, database_uri)
+            orm.upgrade_schema(database_engine)
+            orm.install_search_indexes(database_engine)
+            repository.repo_instance = CachingRepository(
+                SqlAlchemyRepository(session_factory, database_uri), versions
+            )
 
     app.register_blueprint(home_bp)
     app.register_blueprint(authentication_blueprint)
     app.register_blueprint(inventory_bp)
     app.register_blueprint(recipes_bp)
+    app.register_blueprint(search_bp)
     app.register_blueprint(shopping_bp)
     app.register_blueprint(user_bp)
 
+    # responsive_image() for templates and the `flask build-images` command
+    images.init_app(app)
+    # `flask build-bundles` (and stale bundles rebuilt per request in debug mode)
+    bundles.init_app(app)
+    # url_for('static', ...) -> content-hashed URLs, served as immutable
+    assets.init_app(app)
+    # build fingerprint behind the @etag() pages' ETags
+    etags.init_app(app)
+
+    # the current user is cached on flask.g for one request only; start each
+    # request empty in case the app context outlives it (e.g. under test)
+    @app.before_request
+    def reset_user_identity_map():
+        invalidate_current_user()
+
+    # and a write to a user's data drops the cached copy of that user
+    repository.user_write_hook = invalidate_current_user
+
+    # repository writes made while handling a request share one transaction,
+    # committed by commit_unit_of_work before the response goes out
+    @app.before_request
+    def begin_unit_of_work():
+        repo = repository.repo_instance
+        if repo is not None:
+            repo.begin_unit_of_work()
+
     @app.context_processor
     def inject_user():
-        return {"current_user": get_current_user() if get_current_user() else None}
+        return {"current_user": get_current_user()}
+
+    @app.after_request
+    def commit_unit_of_work(response):
+        repo = repository.repo_instance
+        # a failed request's writes are rolled back by cleanup_db_session
+        if repo is None or response.status_code >= 500:
+            return response
+        try:
+            repo.end_unit_of_work()
+        except Exception:
+            app.logger.exception("Could not commit request changes")
+            return InternalServerError().get_response()
+        return response
 
-    # Ensure we cleanup DB sessions after each request to avoid pending rollbacks
-    @app.teardown_appcontext
+    # Roll back whatever a failed request left uncommitted and clean up the
+    # DB session, so no rollback is left pending.
+    @app.teardown_request
     def cleanup_db_session(exception=None):
         try:
             repo = repository.repo_instance
+            if repo is not None:
+                try:
+                    # a no-op when commit_unit_of_work has ended it already
+                    repo.end_unit_of_work(exception or InternalServerError())
+                except Exception:
+                    app.logger.exception("Could not roll back request changes")
             if repo is not None and hasattr(repo, "_session_cm"):
                 try:
                     repo._session_cm.close_current_session()
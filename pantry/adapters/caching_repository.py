@@ -0,0 +1,339 @@
+import copy
+import threading
+from typing import Dict, List, Optional
+
+from pantry.adapters.repository import AbstractRepository
+from pantry.adapters.search_index import IngredientBitsetIndex
+from pantry.adapters.similarity_index import RecipeSimilarityIndex
+from pantry.adapters.version_channel import CATALOG, VersionChannel, user_key
+
+
+def _key(value: str) -> str:
+    return value.casefold()
+
+
+class CachingRepository(AbstractRepository):
+    """
+    Read-through cache for the static catalog (recipes and ingredients) in
+    front of another repository.
+
+    The catalog is loaded once and kept until the catalog version changes;
+    add_recipe/add_ingredient (and their bulk forms) bump the version, so the
+    next catalog read reloads it. Everything else is passed straight through
+    to the wrapped repository, and user writes bump that user's version.
+
+    The version lives in a VersionChannel. Give every worker process a
+    channel on the same file and a write in one worker makes the others
+    reload their catalog, and drop the wrapped repository's in-memory
+    indexes, within the channel's poll interval.
+
+    Cached recipes are shared between callers and must be treated as read
+    only. get_ingredient_by_name hands out a copy, since callers put the
+    result on a user's grocery list and change its quantity.
+
+    Inside a unit of work these bumps wait until it has been committed (or
+    rolled back), so no reader pairs the new version with uncommitted data;
+    outside one they happen at once.
+    """
+
+    def __init__(self, repo: AbstractRepository, versions: VersionChannel = None):
+        self.__repo = repo
+        self.__versions = versions if versions is not None else VersionChannel()
+        self.__indexes_version = None
+
+        self.__recipes_version = None
+        self.__recipes: List = []
+        self.__recipes_by_id: Dict[int, object] = {}
+        self.__recipes_by_key: Dict[str, object] = {}
+
+        self.__ingredients_version = None
+        self.__ingredients: List = []
+        self.__ingredients_by_key: Dict[str, object] = {}
+
+        self.__cookable_version = None
+        self.__cookable = None
+        self.__similarity_version = None
+        self.__similarity = None
+
+        # usernames written in this thread's unit of work
+        self.__unit_of_work = threading.local()
+
+    def __getattr__(self, name):
+        # implementation details of the wrapped repository (e.g. _session_cm)
+        if name.startswith("_CachingRepository__"):
+            raise AttributeError(name)
+        return getattr(self.__repo, name)
+
+    @property
+    def repo(self) -> AbstractRepository:
+        return self.__repo
+
+    @property
+    def versions(self) -> VersionChannel:
+        return self.__versions
+
+    @property
+    def catalog_version(self) -> int:
+        return self.__versions.get(CATALOG)
+
+    def invalidate_catalog(self):
+        self.__versions.bump(CATALOG)
+
+    def __touch_catalog(self):
+        if getattr(self.__unit_of_work, "catalog", None) is None:
+            self.invalidate_catalog()
+        else:
+            self.__unit_of_work.catalog = True
+
+    def state_version(self, key: str, fresh: bool = False) -> Optional[int]:
+        if fresh:
+            return self.__versions.read(key)
+        return self.__versions.get(key)
+
+    def __touch_user(self, user):
+        written = getattr(self.__unit_of_work, "users", None)
+        if written is None:
+            self.__versions.bump(user_key(user.username))
+        else:
+            written.add(user.username)
+        self.user_written(user)
+
+    def __check_indexes(self):
+        version = self.catalog_version
+        if self.__indexes_version != version:
+            if self.__indexes_version is not None:
+                self.__repo.invalidate_catalog_indexes()
+            self.__indexes_version = version
+
+    def __load_recipes(self):
+        version = self.catalog_version
+        if self.__recipes_version == version:
+            return
+        recipes = self.__repo.get_all_recipes()
+        self.__recipes = recipes
+        self.__recipes_by_id = {r.id: r for r in recipes}
+        self.__recipes_by_key = {}
+        for r in recipes:
+            self.__recipes_by_key.setdefault(_key(r.name), r)
+        self.__recipes_version = version
+
+    def __load_ingredients(self):
+        version = self.catalog_version
+        if self.__ingredients_version == version:
+            return
+        ingredients = self.__repo.get_all_ingredients()
+        self.__ingredients = ingredients
+        self.__ingredients_by_key = {}
+        for ing in ingredients:
+            self.__ingredients_by_key.setdefault(_key(ing.name), ing)
+        self.__ingredients_version = version
+
+    def invalidate_catalog_indexes(self):
+        self.__repo.invalidate_catalog_indexes()
+
+    # unit of work
+
+    def begin_unit_of_work(self):
+        self.__unit_of_work.users = set()
+        self.__unit_of_work.catalog = False
+        self.__repo.begin_unit_of_work()
+
+    def end_unit_of_work(self, exception=None):
+        written = getattr(self.__unit_of_work, "users", None)
+        catalog_written = getattr(self.__unit_of_work, "catalog", None)
+        self.__unit_of_work.users = None
+        self.__unit_of_work.catalog = None
+        try:
+            self.__repo.end_unit_of_work(exception)
+        finally:
+            # after the commit (or rollback), so no reader pairs the new
+            # version with data that isn't committed; on a rollback this
+            # drops a catalog loaded with the flushed, discarded writes
+            if catalog_written:
+                self.invalidate_catalog()
+            for username in written or ():
+                self.__versions.bump(user_key(username))
+
+    # ingredients
+
+    def add_ingredient(self, ingredient):
+        self.__repo.add_ingredient(ingredient)
+        self.__touch_catalog()
+
+    def add_multiple_ingredients(self, ingredients: List):
+        self.__repo.add_multiple_ingredients(ingredients)
+        self.__touch_catalog()
+
+    def get_ingredient_by_name(self, name: str):
+        self.__load_ingredients()
+        ingredient = self.__ingredients_by_key.get(_key(name))
+        return copy.copy(ingredient) if ingredient is not None else None
+
+    def get_ingredients_by_category(self, category: str) -> List:
+        return self.__repo.get_ingredients_by_category(category)
+
+    def get_all_ingredients(self) -> List:
+        self.__load_ingredients()
+        return list(self.__ingredients)
+
+    def sort_ingredients_by_name(self, name: str):
+        return self.__repo.sort_ingredients_by_name(name)
+
+    def sort_ingredients_by_category(self, category: str):
+        return self.__repo.sort_ingredients_by_category(category)
+
+    def suggest_names(self, prefix: str, limit: int = 10) -> List:
+        self.__check_indexes()
+        return self.__repo.suggest_names(prefix, limit)
+
+    # categories
+
+    def add_category(self, category):
+        self.__repo.add_category(category)
+
+    def add_multiple_categories(self, categories: List):
+        self.__repo.add_multiple_categories(categories)
+
+    def get_category_by_name(self, name: str):
+        return self.__repo.get_category_by_name(name)
+
+    def get_all_categories(self) -> List:
+        return self.__repo.get_all_categories()
+
+    # users
+
+    def add_user(self, user):
+        self.__repo.add_user(user)
+        self.__touch_user(user)
+
+    def get_user_by_username(self, username: str):
+        return self.__repo.get_user_by_username(username)
+
+    def get_all_users(self) -> List:
+        return self.__repo.get_all_users()
+
+    def get_total_user_size(self):
+        return self.__repo.get_total_user_size()
+
+    def create_user(self, username: str, email: str, password_hash: str):
+        return self.__repo.create_user(username, email, password_hash)
+
+    def get_user_by_email(self, email_clean):
+        return self.__repo.get_user_by_email(email_clean)
+
+    def get_user_saved_recipes(self, user):
+        return self.__repo.get_user_saved_recipes(user)
+
+    def user_has_saved_recipe(self, recipe, user):
+        return self.__repo.user_has_saved_recipe(recipe, user)
+
+    def add_saved_recipe(self, recipe, user):
+        self.__repo.add_saved_recipe(recipe, user)
+        self.__touch_user(user)
+
+    def remove_saved_recipe(self, recipe, user):
+        self.__repo.remove_saved_recipe(recipe, user)
+        self.__touch_user(user)
+
+    def get_user_recipe_ingredients_by_recipe_name(self, user, recipe_name):
+        return self.__repo.get_user_recipe_ingredients_by_recipe_name(user, recipe_name)
+
+    def add_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
+        self.__repo.add_user_recipe_ingredient(user, recipe_name, ingredient_string)
+        self.__touch_user(user)
+
+    def remove_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
+        self.__repo.remove_user_recipe_ingredient(user, recipe_name, ingredient_string)
+        self.__touch_user(user)
+
+    def add_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
+        self.__repo.add_multiple_user_recipe_ingredients(user, recipe_name, ingredient_strings)
+        self.__touch_user(user)
+
+    def remove_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
+        self.__repo.remove_multiple_user_recipe_ingredients(user, recipe_name, ingredient_strings)
+        self.__touch_user(user)
+
+    def clear_user_recipe_ingredients(self, user, recipe_name):
+        self.__repo.clear_user_recipe_ingredients(user, recipe_name)
+        self.__touch_user(user)
+
+    def delete_user_recipe_ingredients_per_recipe(self, user, recipe_name):
+        self.__repo.delete_user_recipe_ingredients_per_recipe(user, recipe_name)
+        self.__touch_user(user)
+
+    def clear_recipe_ingredients(self, user):
+        self.__repo.clear_recipe_ingredients(user)
+        self.__touch_user(user)
+
+    def update_user(self, user):
+        self.__repo.update_user(user)
+        self.__touch_user(user)
+
+    # recipes
+
+    def add_recipe(self, recipe):
+        self.__repo.add_recipe(recipe)
+        self.__touch_catalog()
+
+    def add_multiple_recipes(self, recipes: List):
+        self.__repo.add_multiple_recipes(recipes)
+        self.__touch_catalog()
+
+    def get_recipe_by_name(self, name: str):
+        self.__load_recipes()
+        return self.__recipes_by_key.get(_key(name))
+
+    def get_recipes_by_ids(self, recipe_ids: List[int]) -> List:
+        self.__load_recipes()
+        return [self.__recipes_by_id[rid] for rid in recipe_ids if rid in self.__recipes_by_id]
+
+    def get_cookable_recipes(self, ingredient_names: List[str], max_missing: int = 0) -> List:
+        # answered from the cached catalog, so no query at all
+        self.__load_recipes()
+        self.__load_ingredients()
+        if self.__cookable_version != (self.__recipes_version, self.__ingredients_version):
+            index = IngredientBitsetIndex(ing.name for ing in self.__ingredients)
+            index.add_many((r.id, (line.name for line in r.ingredients)) for r in self.__recipes)
+            self.__cookable = index
+            self.__cookable_version = (self.__recipes_version, self.__ingredients_version)
+        return [
+            (self.__recipes_by_id[rid], self.__cookable.names(missing))
+            for rid, missing in self.__cookable.cookable(ingredient_names, max_missing)
+        ]
+
+    def __similarity_index(self) -> RecipeSimilarityIndex:
+        self.__load_recipes()
+        if self.__similarity_version != self.__recipes_version:
+            index = RecipeSimilarityIndex()
+            index.add_many(self.__recipes)
+            self.__similarity = index
+            self.__similarity_version = self.__recipes_version
+        return self.__similarity
+
+    def get_similar_recipes(self, recipe_id: int, k: int = 5) -> List:
+        index = self.__similarity_index()
+        return [self.__recipes_by_id[rid] for rid, _ in index.similar(recipe_id, k)]
+
+    def get_recommended_recipes(self, recipe_ids: List[int], k: int = 5) -> List:
+        index = self.__similarity_index()
+        return [self.__recipes_by_id[rid] for rid, _ in index.recommend(recipe_ids, k)]
+
+    def get_recipes_by_category(self, category: str) -> List:
+        return self.__repo.get_recipes_by_category(category)
+
+    def get_recipes_by_cuisine(self, cuisine: str) -> List:
+        return self.__repo.get_recipes_by_cuisine(cuisine)
+
+    def get_recipes_by_tag(self, tag: str) -> List:
+        return self.__repo.get_recipes_by_tag(tag)
+
+    def get_all_recipes(self) -> List:
+        self.__load_recipes()
+        return list(self.__recipes)
+
+    def sort_recipes_by_name(self, name: str):
+        return self.__repo.sort_recipes_by_name(name)
+
+    def sort_recipes_by_category(self, category: str):
+        return self.__repo.sort_recipes_by_category(category)
@@ -1,8 +1,9 @@
+import threading
 from abc import ABC
 from typing import List, Tuple
 from pathlib import Path
 
-from sqlalchemy import func, select, text, inspect
+from sqlalchemy import func, select, update, text, inspect, cast, String, table, column
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm.exc import NoResultFound
@@ -11,12 +12,23 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
 
 from pantry.adapters.repository import AbstractRepository
+from pantry.adapters.search_index import IngredientBitsetIndex, PrefixIndex
+from pantry.adapters.similarity_index import RecipeSimilarityIndex
+from pantry.domainmodel.recipe_selections import RecipeIngredientSelections
+
+# rows per executemany batch in the bulk add_multiple_* paths
+BULK_BATCH_SIZE = 500
+
+# column values for an ingredient row nobody has configured yet
+_INGREDIENT_DEFAULTS = {"unit": None, "range_min": 1, "range_max": 100, "step": 1}
 
 
 class SessionContextManager:
     def __init__(self, session_factory):
         self.__session_factory = session_factory
         self.__session = scoped_session(self.__session_factory)
+        # per-thread unit-of-work state, like the scoped session itself
+        self.__unit_of_work = threading.local()
 
     def __enter__(self):
         return self
@@ -29,9 +41,32 @@ class SessionContextManager:
         # Return the actual Session instance from the scoped_session proxy
         return self.__session()
 
+    @property
+    def deferring(self) -> bool:
+        return getattr(self.__unit_of_work, "active", False)
+
+    def begin_deferred(self):
+        # until end_deferred, commit() only flushes
+        self.__unit_of_work.active = True
+        self.__unit_of_work.failed = False
+
+    def end_deferred(self, exception=None):
+        # commit everything since begin_deferred, or roll it all back
+        if not self.deferring:
+            return
+        failed = self.__unit_of_work.failed
+        self.__unit_of_work.active = False
+        if exception is None and not failed:
+            self.commit()
+        else:
+            self.rollback()
+
     def commit(self) -> object:
         try:
-            self.__session.commit()
+            if self.deferring:
+                self.__session.flush()
+            else:
+                self.__session.commit()
         except Exception:
             try:
                 self.rollback()
@@ -40,6 +75,9 @@ class SessionContextManager:
             raise
 
     def rollback(self):
+        if self.deferring:
+            # the earlier writes of this unit of work are gone with the rollback
+            self.__unit_of_work.failed = True
         try:
             self.__session.rollback()
         except Exception:
@@ -88,6 +126,38 @@ class SqlAlchemyRepository(AbstractRepository):
         from pantry.adapters import orm as _orm
 
         self._orm = _orm
+        # tables with an SQLite FTS5 trigram index (see orm.install_search_indexes)
+        self._search_tables = _orm.sqlite_search_tables(self._engine)
+        # typeahead index, built on first use and extended by add_ingredient/add_recipe
+        self._suggestions = None
+        # ingredient bitsets behind get_cookable_recipes, built on first use
+        # and extended the same way
+        self._cookable = None
+        self._similarity = None
+
+    def begin_unit_of_work(self):
+        self._session_cm.begin_deferred()
+
+    def end_unit_of_work(self, exception=None):
+        self._session_cm.end_deferred(exception)
+
+    def _search_by_name(self, model, name: str, options=()):
+        # case-insensitive contains, ordered by name
+        session = self._session_cm.session
+        query = session.query(model).options(*options)
+        table_name = model.__tablename__
+        if (
+            table_name in self._search_tables
+            and len(name) >= 3
+            and not any(ch in name for ch in "%_\\")
+        ):
+            # the FTS5 trigram index answers LIKE for patterns of 3+ chars
+            fts = table(self._orm.search_table_name(table_name), column("rowid"), column("name"))
+            query = query.join(fts, fts.c.rowid == model.id).filter(fts.c.name.like(f"%{name}%"))
+        else:
+            # on PostgreSQL this LIKE is served by the pg_trgm index
+            query = query.filter(func.lower(model.name).contains(name.lower(), autoescape=True))
+        return query.order_by(model.name).all()
 
     def add_ingredient(self, ingredient):
         session = self._session_cm.session
@@ -119,54 +189,174 @@ class SqlAlchemyRepository(AbstractRepository):
                 if cat_model not in ingr_model.categories:
                     ingr_model.categories.append(cat_model)
         self._session_cm.commit()
+        if self._suggestions is not None:
+            self._suggestions.add(ingr_model.name, "ingredient")
+        if self._cookable is not None:
+            self._cookable.add_vocabulary([ingr_model.name])
 
     def add_multiple_ingredients(self, ingredients: List):
-        for ing in ingredients:
-            self.add_ingredient(ing)
+        """
+        Bulk version of add_ingredient: one query for the existing rows,
+        batched inserts/updates, category links resolved in bulk and a
+        single commit at the end.
+        """
+        session = self._session_cm.session
+        ingredient_table = self._orm.IngredientModel.__table__
+        link_table = self._orm.ingredient_category
+        try:
+            existing = {
+                row.name: row
+                for row in session.execute(
+                    select(
+                        ingredient_table.c.id,
+                        ingredient_table.c.name,
+                        *(ingredient_table.c[k] for k in _INGREDIENT_DEFAULTS),
+                    )
+                )
+            }
+            stored = {
+                name: {k: getattr(row, k) for k in _INGREDIENT_DEFAULTS}
+                for name, row in existing.items()
+            }
+
+            # fold repeated names together the way repeated add_ingredient calls would
+            pending = {}
+            category_names = {}
+            for ing in ingredients:
+                name = ing.name.strip()
+                current = pending.get(name) or stored.get(name) or _INGREDIENT_DEFAULTS
+                pending[name] = _ingredient_values(ing, current)
+                names = category_names.setdefault(name, [])
+                for cat in getattr(ing, "categories", None) or []:
+                    cat_name = (cat if isinstance(cat, str) else cat.name).strip()
+                    if cat_name not in names:
+                        names.append(cat_name)
+
+            new_rows = [{"name": n, **v} for n, v in pending.items() if n not in existing]
+            changed_rows = [
+                {"id": existing[n].id, **v}
+                for n, v in pending.items()
+                if n in existing and v != stored[n]
+            ]
+            self._bulk_insert(ingredient_table, new_rows)
+            if changed_rows:
+                session.execute(update(self._orm.IngredientModel), changed_rows)
+
+            ingredient_ids = {n: row.id for n, row in existing.items()}
+            if new_rows:
+                ingredient_ids = dict(
+                    session.execute(select(ingredient_table.c.name, ingredient_table.c.id)).all()
+                )
+            category_ids = self._insert_missing_categories(
+                c for names in category_names.values() for c in names
+            )
+            linked = set(
+                session.execute(select(link_table.c.ingredient_id, link_table.c.category_id)).all()
+            )
+            links = []
+            for name, names in category_names.items():
+                for cat_name in names:
+                    pair = (ingredient_ids[name], category_ids[cat_name])
+                    if pair not in linked:
+                        linked.add(pair)
+                        links.append({"ingredient_id": pair[0], "category_id": pair[1]})
+            self._bulk_insert(link_table, links)
+        except Exception:
+            self._session_cm.rollback()
+            raise
+        self._session_cm.commit()
+        if self._suggestions is not None:
+            self._suggestions.add_many((row["name"], "ingredient") for row in new_rows)
+        if self._cookable is not None:
+            self._cookable.add_vocabulary(row["name"] for row in new_rows)
+
+    def _bulk_insert(self, target_table, rows: List[dict]):
+        # executemany in fixed-size batches, inside the session's transaction
+        session = self._session_cm.session
+        for start in range(0, len(rows), BULK_BATCH_SIZE):
+            session.execute(target_table.insert(), rows[start : start + BULK_BATCH_SIZE])
+
+    def _insert_missing_categories(self, names) -> dict:
+        # returns name -> id for every category, inserting the missing names
+        session = self._session_cm.session
+        category_table = self._orm.CategoryModel.__table__
+        query = select(category_table.c.name, category_table.c.id)
+        category_ids = dict(session.execute(query).all())
+        missing = [n for n in dict.fromkeys(names) if n not in category_ids]
+        if missing:
+            self._bulk_insert(category_table, [{"name": n} for n in missing])
+            category_ids = dict(session.execute(query).all())
+        return category_ids
 
     def get_ingredient_by_name(self, name: str):
         session = self._session_cm.session
-        model = session.query(self._orm.IngredientModel).filter_by(name=name).first()
+        model = (
+            session.query(self._orm.IngredientModel)
+            .options(*self._orm.ingredient_load_options())
+            .filter_by(name=name)
+            .first()
+        )
         if not model:
             return None
         return model.to_domain()
 
     def get_ingredients_by_category(self, category: str) -> List:
         session = self._session_cm.session
-        cat = session.query(self._orm.CategoryModel).filter(func.lower(self._orm.CategoryModel.name) == category.lower()).first()
-        if not cat:
-            return []
-        return [ing.to_domain() for ing in cat.ingredients]
+        models = (
+            session.query(self._orm.IngredientModel)
+            .join(self._orm.IngredientModel.categories)
+            .filter(func.lower(self._orm.CategoryModel.name) == category.lower())
+            .options(*self._orm.ingredient_load_options())
+            .order_by(self._orm.IngredientModel.name)
+            .all()
+        )
+        return [m.to_domain() for m in models]
 
     def get_all_ingredients(self) -> List:
         session = self._session_cm.session
-        models = session.query(self._orm.IngredientModel).all()
+        models = (
+            session.query(self._orm.IngredientModel)
+            .options(*self._orm.ingredient_load_options())
+            .all()
+        )
         return sorted([m.to_domain() for m in models], key=lambda i: i.name)
 
     def sort_ingredients_by_name(self, name: str):
+        models = self._search_by_name(
+            self._orm.IngredientModel, name, self._orm.ingredient_load_options()
+        )
+        return [m.to_domain() for m in models]
+
+    def sort_ingredients_by_category(self, category: str):
         session = self._session_cm.session
-        # case-insensitive contains
+        # ingredients in any category whose name contains the query, once each
+        matching = (
+            select(self._orm.ingredient_category.c.ingredient_id)
+            .join(self._orm.CategoryModel, self._orm.CategoryModel.id == self._orm.ingredient_category.c.category_id)
+            .where(func.lower(self._orm.CategoryModel.name).contains(category.lower(), autoescape=True))
+        )
         models = (
             session.query(self._orm.IngredientModel)
-            .filter(func.lower(self._orm.IngredientModel.name).contains(name.lower()))
+            .filter(self._orm.IngredientModel.id.in_(matching))
+            .options(*self._orm.ingredient_load_options())
             .order_by(self._orm.IngredientModel.name)
             .all()
         )
         return [m.to_domain() for m in models]
 
-    def sort_ingredients_by_category(self, category: str):
-        session = self._session_cm.session
-        # find categories that match then collect unique ingredients
-        cats = (
-            session.query(self._orm.CategoryModel)
-            .filter(func.lower(self._orm.CategoryModel.name).contains(category.lower()))
-            .all()
-        )
-        ingredients = set()
-        for c in cats:
-            for ing in c.ingredients:
-                ingredients.add(ing)
-        return sorted([ing.to_domain() for ing in ingredients], key=lambda i: i.name)
+    def invalidate_catalog_indexes(self):
+        self._suggestions = None
+        self._cookable = None
+        self._similarity = None
+
+    def suggest_names(self, prefix: str, limit: int = 10):
+        if self._suggestions is None:
+            session = self._session_cm.session
+            index = PrefixIndex()
+            index.add_many((name, "ingredient") for (name,) in session.query(self._orm.IngredientModel.name))
+            index.add_many((name, "recipe") for (name,) in session.query(self._orm.RecipeModel.name))
+            self._suggestions = index
+        return self._suggestions.complete(prefix, limit)
 
     def add_category(self, category):
         session = self._session_cm.session
@@ -174,8 +364,13 @@ class SqlAlchemyRepository(AbstractRepository):
         self._session_cm.commit()
 
     def add_multiple_categories(self, categories: List):
-        for c in categories:
-            self.add_category(c)
+        names = [(c if isinstance(c, str) else c.name).strip() for c in categories]
+        try:
+            self._insert_missing_categories(names)
+        except Exception:
+            self._session_cm.rollback()
+            raise
+        self._session_cm.commit()
 
     def get_category_by_name(self, name: str):
         session = self._session_cm.session
@@ -200,14 +395,23 @@ class SqlAlchemyRepository(AbstractRepository):
 
     def get_user_by_username(self, username: str):
         session = self._session_cm.session
-        model = session.query(self._orm.UserModel).filter(func.lower(self._orm.UserModel.username) == username.lower()).first()
+        model = (
+            session.query(self._orm.UserModel)
+            .options(*self._orm.user_load_options())
+            .filter(func.lower(self._orm.UserModel.username) == username.lower())
+            .first()
+        )
         if not model:
             return None
         return model.to_domain()
 
     def get_all_users(self) -> List:
         session = self._session_cm.session
-        models = session.query(self._orm.UserModel).all()
+        models = (
+            session.query(self._orm.UserModel)
+            .options(*self._orm.user_load_options())
+            .all()
+        )
         return [m.to_domain() for m in models]
 
     def get_total_user_size(self):
@@ -225,7 +429,12 @@ class SqlAlchemyRepository(AbstractRepository):
 
     def get_user_by_email(self, email_clean):
         session = self._session_cm.session
-        model = session.query(self._orm.UserModel).filter(func.lower(self._orm.UserModel.email) == email_clean.lower()).first()
+        model = (
+            session.query(self._orm.UserModel)
+            .options(*self._orm.user_load_options())
+            .filter(func.lower(self._orm.UserModel.email) == email_clean.lower())
+            .first()
+        )
         if not model:
             return None
         return model.to_domain()
@@ -234,10 +443,13 @@ class SqlAlchemyRepository(AbstractRepository):
         session = self._session_cm.session
         # user can be domain User or id
         uid = user.id if hasattr(user, "id") else user
-        model = session.query(self._orm.UserModel).filter_by(id=uid).first()
-        if not model:
-            return []
-        return [sr.recipe_id for sr in model.saved_recipes]
+        rows = (
+            session.query(self._orm.UserSavedRecipe.recipe_id)
+            .filter_by(user_id=uid)
+            .order_by(self._orm.UserSavedRecipe.id)
+            .all()
+        )
+        return [recipe_id for (recipe_id,) in rows]
 
     def user_has_saved_recipe(self, recipe, user):
         # normalize recipe to id if a domain Recipe is passed
@@ -293,115 +505,62 @@ class SqlAlchemyRepository(AbstractRepository):
             except Exception:
                 pass
 
-    def get_user_recipe_ingredients_by_recipe_name(self, user, recipe_name):
+    def _user_model(self, user):
         session = self._session_cm.session
         uid = user.id if hasattr(user, "id") else user
-        model = session.query(self._orm.UserModel).filter_by(id=uid).first()
+        return session.query(self._orm.UserModel).filter_by(id=uid).first()
+
+    def get_user_recipe_ingredients_by_recipe_name(self, user, recipe_name):
+        model = self._user_model(user)
         if not model:
             return []
-        # support case-insensitive lookup
-        for k, v in (model.recipe_ingredients or {}).items():
-            if k.lower() == recipe_name.lower():
-                return v
-        return []
+        return RecipeIngredientSelections(model.recipe_ingredients).get(recipe_name)
 
     def add_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
-        session = self._session_cm.session
-        uid = user.id if hasattr(user, "id") else user
-        model = session.query(self._orm.UserModel).filter_by(id=uid).first()
+        self.add_multiple_user_recipe_ingredients(user, recipe_name, [ingredient_string])
+
+    def remove_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
+        self.remove_multiple_user_recipe_ingredients(user, recipe_name, [ingredient_string])
+
+    def add_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
+        model = self._user_model(user)
         if not model:
             raise NoResultFound("User not found")
-        ri = model.recipe_ingredients or {}
-        # find matching key case-insensitive
-        found_key = None
-        for k in ri.keys():
-            if k.lower() == recipe_name.lower():
-                found_key = k
-                break
-        if not found_key:
-            # preserve original case of passed recipe_name
-            found_key = recipe_name
-            ri[found_key] = []
-        # normalize list/tuple entries so qty is always stored as a string
-        entry = ingredient_string
-        if isinstance(ingredient_string, (list, tuple)):
-            qty = ingredient_string[0] if len(ingredient_string) > 0 else ""
-            unit = ingredient_string[1] if len(ingredient_string) > 1 else ""
-            name = ingredient_string[2] if len(ingredient_string) > 2 else (ingredient_string[-1] if len(ingredient_string) > 0 else "")
-            entry = [str(qty) if qty is not None else "", unit if unit is not None else "", name if name is not None else ""]
-        if entry not in ri[found_key]:
-            ri[found_key].append(entry)
-        model.recipe_ingredients = ri
+        entries = [_normalize_recipe_ingredient(s) for s in ingredient_strings]
+        selections = RecipeIngredientSelections(model.recipe_ingredients)
+        selections.add_many(recipe_name, entries)
+        model.recipe_ingredients = selections.as_dict()
         self._session_cm.commit()
 
-        # keep domain user in sync if a domain User object was passed (use normalized entry)
-        if hasattr(user, "add_recipe_ingredient"):
-            try:
-                user.add_recipe_ingredient(recipe_name, entry)
-            except Exception:
-                pass
+        # keep domain user in sync if a domain User object was passed (use normalized entries)
+        if hasattr(user, "add_multiple_recipe_ingredients"):
+            user.add_multiple_recipe_ingredients(recipe_name, entries)
 
-    def remove_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
-        session = self._session_cm.session
-        uid = user.id if hasattr(user, "id") else user
-        model = session.query(self._orm.UserModel).filter_by(id=uid).first()
+    def remove_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
+        model = self._user_model(user)
         if not model:
             return
-        ri = model.recipe_ingredients or {}
-        # case-insensitive removal
-        target = str(ingredient_string).lower()
-        for k in list(ri.keys()):
-            if k.lower() == recipe_name.lower():
-                def _keep(ing):
-                    if isinstance(ing, (list, tuple)) and len(ing) > 0:
-                        name = str(ing[2]) if len(ing) > 2 else str(ing[-1])
-                        return name.lower() != target
-                    else:
-                        return str(ing).lower() != target
-
-                ri[k] = [ing for ing in ri[k] if _keep(ing)]
-                if not ri[k]:
-                    del ri[k]
-                break
-        model.recipe_ingredients = ri
+        selections = RecipeIngredientSelections(model.recipe_ingredients)
+        selections.remove_many(recipe_name, ingredient_strings)
+        model.recipe_ingredients = selections.as_dict()
         self._session_cm.commit()
 
         # keep domain user in sync if provided
-        if hasattr(user, "remove_recipe_ingredient"):
-            try:
-                user.remove_recipe_ingredient(recipe_name, ingredient_string)
-            except Exception:
-                pass
-
-    def add_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
-        for s in ingredient_strings:
-            self.add_user_recipe_ingredient(user, recipe_name, s)
-
-    def remove_multiple_user_recipe_ingredients(self, user, recipe_name, ingredient_strings: List):
-        for s in ingredient_strings:
-            self.remove_user_recipe_ingredient(user, recipe_name, s)
+        if hasattr(user, "remove_multiple_recipe_ingredients"):
+            user.remove_multiple_recipe_ingredients(recipe_name, ingredient_strings)
 
     def clear_user_recipe_ingredients(self, user, recipe_name):
-        session = self._session_cm.session
-        uid = user.id if hasattr(user, "id") else user
-        model = session.query(self._orm.UserModel).filter_by(id=uid).first()
+        model = self._user_model(user)
         if not model:
             return
-        ri = model.recipe_ingredients or {}
-        # case-insensitive removal
-        for k in list(ri.keys()):
-            if k.lower() == recipe_name.lower():
-                del ri[k]
-                break
-        model.recipe_ingredients = ri
+        selections = RecipeIngredientSelections(model.recipe_ingredients)
+        selections.clear(recipe_name)
+        model.recipe_ingredients = selections.as_dict()
         self._session_cm.commit()
 
         # keep domain user in sync if provided
         if hasattr(user, "clear_recipe_ingredients_by_recipe"):
-            try:
-                user.clear_recipe_ingredients_by_recipe(recipe_name)
-            except Exception:
-                pass
+            user.clear_recipe_ingredients_by_recipe(recipe_name)
 
     def delete_user_recipe_ingredients_per_recipe(self, user, recipe_name):
         # alias to clear
@@ -417,15 +576,56 @@ class SqlAlchemyRepository(AbstractRepository):
         session = self._session_cm.session
         self._orm.recipe_from_domain(session, recipe)
         self._session_cm.commit()
+        if self._suggestions is not None:
+            self._suggestions.add(recipe.name, "recipe")
+        if self._cookable is not None:
+            self._cookable.add(recipe.id, (line.name for line in recipe.ingredients))
+        if self._similarity is not None:
+            self._similarity.add(recipe)
 
     def add_multiple_recipes(self, recipes: List):
-        for r in recipes:
-            self.add_recipe(r)
+        """
+        Bulk version of add_recipe: recipes whose id is new are inserted with
+        their ingredient rows in batches; ids already stored (or missing) go
+        through recipe_from_domain so they are rebuilt as before. One commit.
+        """
+        session = self._session_cm.session
+        recipe_table = self._orm.RecipeModel.__table__
+        try:
+            existing_ids = set(session.scalars(select(recipe_table.c.id)))
+            new_recipes = {}
+            for recipe in recipes:
+                if recipe.id is None or recipe.id in existing_ids:
+                    self._orm.recipe_from_domain(session, recipe)
+                else:
+                    # a repeated id replaces the earlier one, as add_recipe would
+                    new_recipes[recipe.id] = recipe
+
+            self._bulk_insert(recipe_table, [self._orm.recipe_row(r) for r in new_recipes.values()])
+            self._bulk_insert(
+                self._orm.RecipeIngredientModel.__table__,
+                [
+                    {"recipe_id": r.id, **row}
+                    for r in new_recipes.values()
+                    for row in self._orm.recipe_ingredient_rows(r)
+                ],
+            )
+        except Exception:
+            self._session_cm.rollback()
+            raise
+        self._session_cm.commit()
+        if self._suggestions is not None:
+            self._suggestions.add_many((r.name, "recipe") for r in recipes)
+        if self._cookable is not None:
+            self._cookable.add_many((r.id, (line.name for line in r.ingredients)) for r in recipes)
+        if self._similarity is not None:
+            self._similarity.add_many(recipes)
 
     def get_recipe_by_name(self, name: str):
         session = self._session_cm.session
         model = (
             session.query(self._orm.RecipeModel)
+            .options(*self._orm.recipe_load_options())
             .filter(func.lower(self._orm.RecipeModel.name) == name.lower())
             .first()
         )
@@ -433,36 +633,135 @@ class SqlAlchemyRepository(AbstractRepository):
             return None
         return model.to_domain()
 
+    def get_recipes_by_ids(self, recipe_ids: List[int]) -> List:
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return []
+        session = self._session_cm.session
+        models = (
+            session.query(self._orm.RecipeModel)
+            .options(*self._orm.recipe_load_options())
+            .filter(self._orm.RecipeModel.id.in_(set(recipe_ids)))
+            .all()
+        )
+        by_id = {m.id: m.to_domain() for m in models}
+        return [by_id[rid] for rid in recipe_ids if rid in by_id]
+
+    def get_cookable_recipes(self, ingredient_names: List[str], max_missing: int = 0) -> List:
+        if self._cookable is None:
+            session = self._session_cm.session
+            ri = self._orm.RecipeIngredientModel
+            index = IngredientBitsetIndex(
+                name for (name,) in session.query(self._orm.IngredientModel.name).order_by(self._orm.IngredientModel.id)
+            )
+            names_by_recipe = {}
+            for recipe_id, name in session.query(ri.recipe_id, ri.name).order_by(ri.recipe_id, ri.position):
+                names_by_recipe.setdefault(recipe_id, []).append(name)
+            index.add_many(names_by_recipe.items())
+            self._cookable = index
+        found = self._cookable.cookable(ingredient_names, max_missing)
+        recipes = {r.id: r for r in self.get_recipes_by_ids([rid for rid, _ in found])}
+        return [(recipes[rid], self._cookable.names(missing)) for rid, missing in found if rid in recipes]
+
+    def _similarity_index(self) -> RecipeSimilarityIndex:
+        if self._similarity is None:
+            index = RecipeSimilarityIndex()
+            index.add_many(self.get_all_recipes())
+            self._similarity = index
+        return self._similarity
+
+    def get_similar_recipes(self, recipe_id: int, k: int = 5) -> List:
+        return self.get_recipes_by_ids([rid for rid, _ in self._similarity_index().similar(recipe_id, k)])
+
+    def get_recommended_recipes(self, recipe_ids: List[int], k: int = 5) -> List:
+        return self.get_recipes_by_ids([rid for rid, _ in self._similarity_index().recommend(recipe_ids, k)])
+
     def get_recipes_by_category(self, category: str) -> List:
         session = self._session_cm.session
         models = (
             session.query(self._orm.RecipeModel)
+            .options(*self._orm.recipe_load_options())
             .filter(func.lower(self._orm.RecipeModel.category) == category.lower())
+            .order_by(self._orm.RecipeModel.name)
             .all()
         )
         return [m.to_domain() for m in models]
 
-    def get_all_recipes(self) -> List:
+    def get_recipes_by_cuisine(self, cuisine: str) -> List:
         session = self._session_cm.session
-        models = session.query(self._orm.RecipeModel).all()
-        return sorted([m.to_domain() for m in models], key=lambda r: r.name)
+        models = (
+            session.query(self._orm.RecipeModel)
+            .options(*self._orm.recipe_load_options())
+            .filter(func.lower(self._orm.RecipeModel.cuisine) == cuisine.lower())
+            .order_by(self._orm.RecipeModel.name)
+            .all()
+        )
+        return [m.to_domain() for m in models]
 
-    def sort_recipes_by_name(self, name: str):
+    def get_recipes_by_tag(self, tag: str) -> List:
         session = self._session_cm.session
+        tag_l = tag.lower()
+        # tags is a JSON list: narrow with a text match, then check exactly
         models = (
             session.query(self._orm.RecipeModel)
-            .filter(func.lower(self._orm.RecipeModel.name).contains(name.lower()))
+            .options(*self._orm.recipe_load_options())
+            .filter(func.lower(cast(self._orm.RecipeModel.tags, String)).contains(tag_l, autoescape=True))
             .order_by(self._orm.RecipeModel.name)
             .all()
         )
+        return [
+            m.to_domain() for m in models
+            if any(str(t).lower() == tag_l for t in (m.tags or []))
+        ]
+
+    def get_all_recipes(self) -> List:
+        session = self._session_cm.session
+        models = (
+            session.query(self._orm.RecipeModel)
+            .options(*self._orm.recipe_load_options())
+            .all()
+        )
+        return sorted([m.to_domain() for m in models], key=lambda r: r.name)
+
+    def sort_recipes_by_name(self, name: str):
+        models = self._search_by_name(
+            self._orm.RecipeModel, name, self._orm.recipe_load_options()
+        )
         return [m.to_domain() for m in models]
 
     def sort_recipes_by_category(self, category: str):
         session = self._session_cm.session
         models = (
             session.query(self._orm.RecipeModel)
-            .filter(func.lower(self._orm.RecipeModel.category).contains(category.lower()))
+            .options(*self._orm.recipe_load_options())
+            .filter(func.lower(self._orm.RecipeModel.category).contains(category.lower(), autoescape=True))
             .order_by(self._orm.RecipeModel.name)
             .all()
         )
         return [m.to_domain() for m in models]
+
+
+def _normalize_recipe_ingredient(entry):
+    # list/tuple entries are stored as [qty, unit, name] strings
+    if isinstance(entry, (list, tuple)):
+        qty = entry[0] if len(entry) > 0 else ""
+        unit = entry[1] if len(entry) > 1 else ""
+        name = entry[2] if len(entry) > 2 else (entry[-1] if len(entry) > 0 else "")
+        return [str(qty) if qty is not None else "", unit if unit is not None else "", name if name is not None else ""]
+    return entry
+
+
+def _ingredient_values(ingredient, current: dict) -> dict:
+    # the column updates add_ingredient would make, applied to ``current``
+    values = dict(current)
+    for column_name in _INGREDIENT_DEFAULTS:
+        value = getattr(ingredient, column_name, None)
+        if value is None:
+            continue
+        if column_name != "unit":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                continue
+        values[column_name] = value
+    return values
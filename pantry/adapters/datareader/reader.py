@@ -1,9 +1,10 @@
 from pathlib import Path
 import csv
 
-from pantry.domainmodel.category import Category
+from pantry.domainmodel.category import Category, intern_category
 from pantry.domainmodel.ingredient import Ingredient
 from pantry.domainmodel.recipe import Recipe
+from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 INGREDIENTS_DATA_FILE = PROJECT_ROOT / "adapters" / "data" / "ingredients.csv"
@@ -25,7 +26,7 @@ class DataReader:
             for row in ingredients_reader:
                 ingredient_name = row["ingredient"].strip()
                 categories = [
-                    Category(c.strip()) for c in row["categories"].strip().split(";")
+                    intern_category(c) for c in row["categories"].strip().split(";")
                 ]
                 unit = row["unit"].strip()
 
@@ -54,7 +55,8 @@ class DataReader:
                 recipe_name = row["name"].strip()
                 recipe_description = row["description"].strip()
                 recipe_ingredients = [
-                    tuple(ing.split(",")) for ing in row["ingredients"].split(";")
+                    RecipeIngredientLine.parse(ing.split(","))
+                    for ing in row["ingredients"].split(";")
                 ]
                 recipe_methods = [
                     method.strip() for method in row["method"].strip().split("||")
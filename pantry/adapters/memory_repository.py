@@ -1,18 +1,63 @@
 from pantry.adapters.repository import AbstractRepository, RepositoryException
-from typing import List
+from pantry.adapters.search_index import IngredientBitsetIndex, NGramIndex, PrefixIndex
+from pantry.adapters.similarity_index import RecipeSimilarityIndex
+from pantry.adapters.version_channel import CATALOG, VersionChannel, user_key
+from typing import Dict, Iterable, List, Optional, Set
 
 from pantry.domainmodel import recipe
 from pantry.domainmodel.ingredient import Ingredient
-from pantry.domainmodel.category import Category
+from pantry.domainmodel.category import Category, intern_category
 from pantry.domainmodel.user import User
 from pantry.domainmodel.recipe import Recipe
 
 
+def _key(value: str) -> str:
+    # case-folded lookup key shared by all name/email indexes
+    return value.casefold()
+
+
 class MemoryRepository(AbstractRepository):
     def __init__(self):
         self.__ingredients: List[Ingredient] = []
         self.__categories: List[Category] = []
-        self.__users: List[User] = [
+        self.__users: List[User] = []
+        self.__recipes: List[recipe] = []
+
+        # lookup indexes, kept in sync by the add_*/update_* methods.
+        # ingredient and recipe names have an exact-match index plus a
+        # case-folded one; usernames and emails match exactly, as they
+        # always have here (login and the uniqueness checks rely on it).
+        self.__ingredients_by_name: Dict[str, Ingredient] = {}
+        self.__ingredients_by_key: Dict[str, Ingredient] = {}
+        self.__categories_by_name: Dict[str, Category] = {}
+        self.__users_by_id: Dict[int, int] = {}
+        self.__users_by_username: Dict[str, User] = {}
+        self.__users_by_email: Dict[str, User] = {}
+        self.__user_keys: Dict[int, tuple] = {}
+        self.__recipes_by_name: Dict[str, recipe] = {}
+        self.__recipes_by_key: Dict[str, recipe] = {}
+        self.__recipes_by_id: Dict[int, recipe] = {}
+
+        # inverted indexes: case-folded category/cuisine/tag -> member keys.
+        # substring queries scan the (small) set of index keys, then union.
+        self.__ingredient_keys_by_category: Dict[str, Set[str]] = {}
+        self.__recipe_keys_by_category: Dict[str, Set[str]] = {}
+        self.__recipe_keys_by_cuisine: Dict[str, Set[str]] = {}
+        self.__recipe_keys_by_tag: Dict[str, Set[str]] = {}
+
+        # trigram indexes behind the name searches
+        self.__ingredient_search = NGramIndex()
+        self.__recipe_search = NGramIndex()
+        # prefix index over ingredient and recipe names for typeahead
+        self.__suggestions = PrefixIndex()
+        # recipes as ingredient bitsets for the "what can I cook" query
+        self.__cookable = IngredientBitsetIndex()
+        # TF-IDF vectors behind "more like this" and recommendations
+        self.__similarity = RecipeSimilarityIndex()
+        # catalog and per-user generation counters, for ETags
+        self.__versions = VersionChannel()
+
+        for user in [
             User(
                 user_id=1,
                 username="CNK",
@@ -24,58 +69,147 @@ class MemoryRepository(AbstractRepository):
                 username="Connor",
                 email="example@gmail.com",
                 password_hash="scrypt:32768:8:1$6JSrcBOnzaJfWwN6$652022ef1b69f25d9022d975e087090c8271623515cdda680920bb415d6ee4dd5b2a6315d86424e64da2a69c35a2d02fe9d0a3dfb58538107c416dffe4626678"
+            ),
+        ]:
+            self.add_user(user)
+
+    def __index_ingredient(self, ingredient: Ingredient):
+        # first insert wins, matching the previous first-match list scan
+        self.__ingredients_by_name.setdefault(ingredient.name, ingredient)
+        self.__ingredients_by_key.setdefault(_key(ingredient.name), ingredient)
+        if ingredient.categories:
+            # the shared registry instances, whatever the caller passed
+            ingredient.categories = [intern_category(c) for c in ingredient.categories]
+        for cat in ingredient.categories or []:
+            self.__ingredient_keys_by_category.setdefault(
+                _key(cat.name), set()
+            ).add(_key(ingredient.name))
+
+    def __index_user(self, user: User):
+        keys = (
+            (self.__users_by_username, user.username),
+            (self.__users_by_email, user.email),
+        )
+        for index, key in keys:
+            index[key] = user
+        # remember the keys so a later update can drop them even if the
+        # domain object was renamed in place
+        self.__user_keys[user.id] = keys
+
+    def __unindex_user(self, user_id: int):
+        for index, key in self.__user_keys.pop(user_id, ()):
+            if index.get(key) is not None and index[key].id == user_id:
+                del index[key]
+
+    def __index_recipe(self, rec: recipe):
+        self.__recipes_by_name.setdefault(rec.name, rec)
+        self.__recipes_by_key.setdefault(_key(rec.name), rec)
+        if self.__recipes_by_id.setdefault(rec.id, rec) is rec:
+            self.__cookable.add(rec.id, (line.name for line in rec.ingredients))
+            self.__similarity.add(rec)
+        rec_key = _key(rec.name)
+        if rec.category:
+            self.__recipe_keys_by_category.setdefault(_key(rec.category), set()).add(rec_key)
+        if rec.cuisine:
+            self.__recipe_keys_by_cuisine.setdefault(_key(rec.cuisine), set()).add(rec_key)
+        for tag in rec.tags or []:
+            if tag:
+                self.__recipe_keys_by_tag.setdefault(_key(tag), set()).add(rec_key)
+
+    @staticmethod
+    def __matching_keys(index: Dict[str, Set[str]], query: str) -> Set[str]:
+        # resolve the query against the index vocabulary, then union members
+        query_key = _key(query)
+        keys: Set[str] = set()
+        for term, members in index.items():
+            if query_key in term:
+                keys |= members
+        return keys
+
+    def __ingredients_for(self, keys: Iterable[str]) -> List[Ingredient]:
+        items = [self.__ingredients_by_key[k] for k in keys]
+        return sorted(items, key=lambda ing: ing.name)
 
-            )
-        ]
-        self.__recipes: List[recipe] = []
+    def __recipes_for(self, keys: Iterable[str]) -> List[recipe]:
+        items = [self.__recipes_by_key[k] for k in keys]
+        return sorted(items, key=lambda rec: rec.name)
+
+    def state_version(self, key: str, fresh: bool = False) -> Optional[int]:
+        # in-process counters are always fresh
+        return self.__versions.get(key)
+
+    def __touch_user(self, user: User):
+        self.__versions.bump(user_key(user.username))
+        self.user_written(user)
 
     def add_ingredient(self, ingredient: Ingredient):
         self.__ingredients.append(ingredient)
+        self.__index_ingredient(ingredient)
+        self.__ingredient_search.add(ingredient.name, ingredient)
+        self.__suggestions.add(ingredient.name, "ingredient")
+        self.__cookable.add_vocabulary([ingredient.name])
+        self.__versions.bump(CATALOG)
 
     def add_multiple_ingredients(self, ingredients: List[Ingredient]):
+        ingredients = list(ingredients)
         self.__ingredients.extend(ingredients)
+        for ing in ingredients:
+            self.__index_ingredient(ing)
+        self.__ingredient_search.add_many((ing.name, ing) for ing in ingredients)
+        self.__suggestions.add_many((ing.name, "ingredient") for ing in ingredients)
+        self.__cookable.add_vocabulary(ing.name for ing in ingredients)
+        self.__versions.bump(CATALOG)
 
     def get_ingredient_by_name(self, name: str) -> Ingredient:
-        return next((ing for ing in self.__ingredients if ing.name == name), None)
+        ing = self.__ingredients_by_name.get(name)
+        if ing is None:
+            ing = self.__ingredients_by_key.get(_key(name))
+        return ing
 
     def get_ingredients_by_category(self, category: str) -> List[Ingredient]:
-        return [ing for ing in self.__ingredients if ing.category.name == category]
+        return self.__ingredients_for(
+            self.__ingredient_keys_by_category.get(_key(category), ())
+        )
 
     def get_all_ingredients(self) -> List[Ingredient]:
         return sorted(self.__ingredients)
 
     def sort_ingredients_by_name(self, name: str):
-        items = []
-        for ing in self.__ingredients:
-            if name.lower() in ing.name.lower():
-                items.append(ing)
-        return sorted(items, key=lambda ing: ing.name)
+        return self.__ingredient_search.search(name)
 
     def sort_ingredients_by_category(self, category: str):
-        items = []
-        for ing in self.__ingredients:
-            for cat in ing.categories:
-                if category.lower() in cat.name.lower():
-                    items.append(ing)
-        return sorted(items, key=lambda ing: ing.name)
+        return self.__ingredients_for(
+            self.__matching_keys(self.__ingredient_keys_by_category, category)
+        )
+
+    def suggest_names(self, prefix: str, limit: int = 10):
+        return self.__suggestions.complete(prefix, limit)
 
     def add_category(self, category: Category):
+        category = intern_category(category)
         self.__categories.append(category)
+        self.__categories_by_name.setdefault(category.name, category)
 
     def add_multiple_categories(self, categories: List[Category]):
+        categories = [intern_category(c) for c in categories]
         self.__categories.extend(categories)
+        for cat in categories:
+            self.__categories_by_name.setdefault(cat.name, cat)
 
     def get_category_by_name(self, name: str) -> Category:
-        return next((cat for cat in self.__categories if cat.name == name), None)
+        return self.__categories_by_name.get(name)
 
     def get_all_categories(self) -> List[Category]:
         return self.__categories
 
     def add_user(self, user: User):
+        self.__users_by_id[user.id] = len(self.__users)
         self.__users.append(user)
+        self.__index_user(user)
+        self.__touch_user(user)
 
     def get_user_by_username(self, username: str) -> User:
-        return next((u for u in self.__users if u.username == username), None)
+        return self.__users_by_username.get(username)
 
     def get_all_users(self) -> List[User]:
         return self.__users
@@ -87,7 +221,7 @@ class MemoryRepository(AbstractRepository):
         return User(self.get_total_user_size() + 1, username, email, password_hash)
 
     def get_user_by_email(self, email_clean: str) -> User:
-        return next((u for u in self.__users if u.email == email_clean), None)
+        return self.__users_by_email.get(email_clean)
 
     def get_user_saved_recipes(self, user):
         return user.saved_recipes
@@ -95,6 +229,7 @@ class MemoryRepository(AbstractRepository):
     def add_saved_recipe(self, recipe, user):
         recipe_id = recipe.id if hasattr(recipe, 'id') else recipe
         user.save_recipe(recipe_id)
+        self.__touch_user(user)
 
     def user_has_saved_recipe(self, recipe, user):
         recipe_id = recipe.id if hasattr(recipe, 'id') else recipe
@@ -103,69 +238,108 @@ class MemoryRepository(AbstractRepository):
     def remove_saved_recipe(self, recipe, user):
         recipe_id = recipe.id if hasattr(recipe, 'id') else recipe
         user.remove_saved_recipe(recipe_id)
+        self.__touch_user(user)
 
     def get_user_recipe_ingredients_by_recipe_name(self, user, recipe_name):
-        return user.recipe_ingredients.get(recipe_name, [])
+        return user.get_recipe_ingredients(recipe_name)
 
     def add_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
         user.add_recipe_ingredient(recipe_name, ingredient_string)
+        self.__touch_user(user)
 
     def remove_user_recipe_ingredient(self, user, recipe_name, ingredient_string):
         user.remove_recipe_ingredient(recipe_name, ingredient_string)
+        self.__touch_user(user)
 
     def add_multiple_user_recipe_ingredients(
         self, user, recipe_name, ingredient_strings: List
     ):
         user.add_multiple_recipe_ingredients(recipe_name, ingredient_strings)
+        self.__touch_user(user)
 
     def remove_multiple_user_recipe_ingredients(
         self, user, recipe_name, ingredient_strings: List
     ):
-        user.remove_recipe_ingredients(recipe_name, ingredient_strings)
+        user.remove_multiple_recipe_ingredients(recipe_name, ingredient_strings)
+        self.__touch_user(user)
 
     def clear_user_recipe_ingredients(self, user, recipe_name):
         user.clear_recipe_ingredients_by_recipe(recipe_name)
+        self.__touch_user(user)
 
     def delete_user_recipe_ingredients_per_recipe(self, user, recipe_name):
         user.delete_recipe_ingredients_per_recipe(recipe_name)
+        self.__touch_user(user)
 
     def clear_recipe_ingredients(self, user):
         user.clear_all_recipe_ingredients()
+        self.__touch_user(user)
 
     def update_user(self, user: User):
-        for idx, existing_user in enumerate(self.__users):
-            if existing_user.id == user.id:
-                self.__users[idx] = user
-                return
-        raise RepositoryException(f"User with id {user.id} not found.")
+        idx = self.__users_by_id.get(user.id)
+        if idx is None:
+            raise RepositoryException(f"User with id {user.id} not found.")
+        # drop the previous instance's keys in case username/email changed
+        self.__unindex_user(user.id)
+        self.__users[idx] = user
+        self.__index_user(user)
+        self.__touch_user(user)
 
     def add_recipe(self, recipe: recipe):
         self.__recipes.append(recipe)
+        self.__index_recipe(recipe)
+        self.__recipe_search.add(recipe.name, recipe)
+        self.__suggestions.add(recipe.name, "recipe")
+        self.__versions.bump(CATALOG)
 
     def add_multiple_recipes(self, recipes: List[recipe]):
+        recipes = list(recipes)
         self.__recipes.extend(recipes)
+        for rec in recipes:
+            self.__index_recipe(rec)
+        self.__recipe_search.add_many((rec.name, rec) for rec in recipes)
+        self.__suggestions.add_many((rec.name, "recipe") for rec in recipes)
+        self.__versions.bump(CATALOG)
 
     def get_recipe_by_name(self, name: str) -> recipe:
-        return next(
-            (rec for rec in self.__recipes if rec.name.lower() == name.lower()), None
-        )
+        rec = self.__recipes_by_name.get(name)
+        if rec is None:
+            rec = self.__recipes_by_key.get(_key(name))
+        return rec
+
+    def get_recipes_by_ids(self, recipe_ids: List[int]) -> List[recipe]:
+        return [
+            self.__recipes_by_id[rid] for rid in recipe_ids if rid in self.__recipes_by_id
+        ]
+
+    def get_cookable_recipes(self, ingredient_names: List[str], max_missing: int = 0) -> List:
+        return [
+            (self.__recipes_by_id[rid], self.__cookable.names(missing))
+            for rid, missing in self.__cookable.cookable(ingredient_names, max_missing)
+        ]
+
+    def get_similar_recipes(self, recipe_id: int, k: int = 5) -> List:
+        return [self.__recipes_by_id[rid] for rid, _ in self.__similarity.similar(recipe_id, k)]
+
+    def get_recommended_recipes(self, recipe_ids: List[int], k: int = 5) -> List:
+        return [self.__recipes_by_id[rid] for rid, _ in self.__similarity.recommend(recipe_ids, k)]
 
     def get_recipes_by_category(self, category: str) -> List:
-        return [rec for rec in self.__recipes if rec.category == category]
+        return self.__recipes_for(self.__recipe_keys_by_category.get(_key(category), ()))
+
+    def get_recipes_by_cuisine(self, cuisine: str) -> List:
+        return self.__recipes_for(self.__recipe_keys_by_cuisine.get(_key(cuisine), ()))
+
+    def get_recipes_by_tag(self, tag: str) -> List:
+        return self.__recipes_for(self.__recipe_keys_by_tag.get(_key(tag), ()))
 
     def get_all_recipes(self) -> List[recipe]:
         return sorted(self.__recipes)
 
     def sort_recipes_by_name(self, name: str):
-        items = []
-        for rec in self.__recipes:
-            if name.lower() in rec.name.lower():
-                items.append(rec)
-        return sorted(items, key=lambda rec: rec.name)
+        return self.__recipe_search.search(name)
 
     def sort_recipes_by_category(self, category: str):
-        items = []
-        for rec in self.__recipes:
-            if category.lower() in rec.category.lower():
-                items.append(rec)
-        return sorted(items, key=lambda rec: rec.name)
+        return self.__recipes_for(
+            self.__matching_keys(self.__recipe_keys_by_category, category)
+        )
@@ -1,3 +1,4 @@
+import copy
 from typing import List, Dict
 from sqlalchemy import (
     Column,
@@ -8,13 +9,17 @@ from sqlalchemy import (
     Table,
     JSON,
     create_engine,
+    inspect,
+    select,
+    text,
 )
-from sqlalchemy.orm import relationship, declarative_base, Session
+from sqlalchemy.orm import relationship, declarative_base, Session, selectinload, joinedload
 from sqlalchemy.orm import sessionmaker
 from pantry.domainmodel.ingredient import Ingredient
 from pantry.domainmodel.recipe import Recipe
+from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine
 from pantry.domainmodel.user import User
-from pantry.domainmodel.category import Category
+from pantry.domainmodel.category import Category, intern_category
 
 Base = declarative_base()
 
@@ -33,7 +38,7 @@ class CategoryModel(Base):
     name = Column(String, unique=True, nullable=False)
 
     def to_domain(self) -> Category:
-        return Category(self.name)
+        return intern_category(self.name)
 
 
 class IngredientModel(Base):
@@ -52,7 +57,7 @@ class IngredientModel(Base):
     )
 
     def to_domain(self, quantity: float = 0, unit: str = None) -> Ingredient:
-        cats = [c.name for c in self.categories] if self.categories else []
+        cats = [intern_category(c.name) for c in self.categories] if self.categories else []
         # defensive defaults in case columns are missing or None
         rmin = getattr(self, "range_min", None) or 1
         rmax = getattr(self, "range_max", None) or 100
@@ -69,6 +74,8 @@ class RecipeIngredientModel(Base):
     recipe_id = Column(Integer, ForeignKey("recipes.id"))
     name = Column(String, nullable=False)
     quantity = Column(Float, nullable=True)
+    # upper end of a range such as "900-1000"; quantity is the lower end
+    quantity_max = Column(Float, nullable=True)
     unit = Column(String, nullable=True)
     position = Column(Integer, nullable=True)
 
@@ -97,26 +104,11 @@ class RecipeModel(Base):
     )
 
     def to_domain(self) -> Recipe:
-        ingredients = []
-        # convert each recipe ingredient to the domain triple (name, qty, unit)
-        for ri in sorted(self.recipe_ingredients, key=lambda a: (a.position or 0)):
-            # preserve missing quantities as empty string (do not coerce None -> 0)
-            if ri.quantity is None:
-                qty_str = ""
-            else:
-                # format numeric values: prefer integer representation when possible
-                try:
-                    qf = float(ri.quantity)
-                    if qf.is_integer():
-                        qty_str = str(int(qf))
-                    else:
-                        qty_str = str(qf)
-                except Exception:
-                    qty_str = str(ri.quantity)
-
-            unit = ri.unit or ""
-            # return (qty, unit, name) to match datareader/template expectations
-            ingredients.append((qty_str, unit, ri.name))
+        # numeric columns map straight onto parsed lines; no string parsing
+        ingredients = tuple(
+            RecipeIngredientLine.from_amount(ri.quantity, ri.unit or "", ri.name, ri.quantity_max)
+            for ri in sorted(self.recipe_ingredients, key=lambda a: (a.position or 0))
+        )
         return Recipe(
             id=self.id,
             name=self.name,
@@ -185,6 +177,133 @@ class UserModel(Base):
         return u
 
 
+# Loader options: every read path that calls to_domain() pulls the
+# relationships it touches up front, so a query costs a fixed number of
+# round trips instead of one extra SELECT per row.
+
+def ingredient_load_options():
+    return (selectinload(IngredientModel.categories),)
+
+
+def recipe_load_options():
+    return (selectinload(RecipeModel.recipe_ingredients),)
+
+
+def user_load_options():
+    return (
+        selectinload(UserModel.grocery_assocs)
+        .joinedload(UserGroceryAssoc.ingredient)
+        .selectinload(IngredientModel.categories),
+        selectinload(UserModel.saved_recipes),
+    )
+
+
+def upgrade_schema(engine) -> None:
+    """
+    Add columns introduced since a database was created. create_all only
+    makes missing tables. Safe to call on every start-up. Recipes stored
+    before recipe_ingredients.quantity_max existed read as single amounts
+    until the database is repopulated.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("recipe_ingredients")}
+    if "quantity_max" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE recipe_ingredients ADD COLUMN quantity_max FLOAT"))
+
+
+# Substring search indexes for name lookups
+
+# tables whose ``name`` column gets a trigram index
+SEARCH_INDEXED_TABLES = ("ingredients", "recipes")
+
+
+def search_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def install_search_indexes(engine) -> None:
+    """
+    Create trigram indexes so ``lower(name) LIKE '%x%'`` searches don't scan.
+
+    PostgreSQL gets GIN ``pg_trgm`` indexes on ``lower(name)``, which the
+    planner uses for the existing LIKE queries. SQLite gets an external-content
+    FTS5 table with the trigram tokenizer per indexed table, kept in sync by
+    triggers. Safe to call on every start-up.
+    """
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        _install_pg_trgm_indexes(engine)
+    elif dialect == "sqlite":
+        _install_sqlite_fts_indexes(engine)
+
+
+def _install_pg_trgm_indexes(engine) -> None:
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for table in SEARCH_INDEXED_TABLES:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table}_name_trgm "
+                        f"ON {table} USING gin (lower(name) gin_trgm_ops)"
+                    )
+                )
+    except Exception as e:
+        # searches still work without the index, just with a sequential scan
+        print(f"Could not create pg_trgm indexes: {e}")
+
+
+def _install_sqlite_fts_indexes(engine) -> None:
+    existing = set(inspect(engine).get_table_names())
+    try:
+        with engine.begin() as conn:
+            for table in SEARCH_INDEXED_TABLES:
+                fts = search_table_name(table)
+                if fts in existing:
+                    continue
+                conn.execute(
+                    text(
+                        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+                        f"name, content='{table}', content_rowid='id', "
+                        f"tokenize='trigram')"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                        f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                        f"INSERT INTO {fts}({fts}, rowid, name) "
+                        f"VALUES ('delete', old.id, old.name); END"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF name ON {table} BEGIN "
+                        f"INSERT INTO {fts}({fts}, rowid, name) "
+                        f"VALUES ('delete', old.id, old.name); "
+                        f"INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name); END"
+                    )
+                )
+                # index rows that existed before the FTS table
+                conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    except Exception as e:
+        # older SQLite builds lack FTS5 or the trigram tokenizer (< 3.34)
+        print(f"Could not create FTS5 trigram indexes: {e}")
+
+
+def sqlite_search_tables(engine) -> set:
+    # names of the tables that have a usable FTS5 trigram index
+    if engine.dialect.name != "sqlite":
+        return set()
+    existing = set(inspect(engine).get_table_names())
+    return {t for t in SEARCH_INDEXED_TABLES if search_table_name(t) in existing}
+
+
 # Helper convenience functions
 
 def ensure_category(session: Session, name: str) -> CategoryModel:
@@ -209,106 +328,92 @@ def ensure_ingredient(session: Session, name: str) -> IngredientModel:
     return obj
 
 
+def ingredient_ids_by_name(session: Session, names) -> Dict[str, int]:
+    """
+    Resolve ingredient names to ids with one batched lookup, creating the
+    names that don't exist yet (the bulk counterpart of ensure_ingredient).
+    """
+    names = list(dict.fromkeys(n.strip() for n in names))
+    if not names:
+        return {}
+    ids = {}
+    for start in range(0, len(names), 500):
+        batch = names[start : start + 500]
+        ids.update(
+            session.execute(
+                select(IngredientModel.name, IngredientModel.id).where(IngredientModel.name.in_(batch))
+            ).all()
+        )
+    created = [IngredientModel(name=n) for n in names if n not in ids]
+    if created:
+        session.add_all(created)
+        session.flush()
+        ids.update((m.name, m.id) for m in created)
+    return ids
+
+
+def recipe_row(domain: Recipe) -> Dict:
+    # column values for the recipes table
+    return {
+        "id": domain.id,
+        "name": domain.name,
+        "description": domain.description,
+        "methods": domain.methods,
+        "prep_time_mins": domain.prep_time_mins,
+        "cook_time_mins": domain.cook_time_mins,
+        "total_time_mins": domain.total_time_mins,
+        "difficulty": domain.difficulty,
+        "category": domain.category,
+        "cuisine": domain.cuisine,
+        "tags": domain.tags,
+        "notes": domain.notes,
+        "image_url": domain.image_url,
+    }
+
+
+def recipe_ingredient_rows(domain: Recipe) -> List[Dict]:
+    """
+    The recipe_ingredients column values (name, quantity, quantity_max,
+    unit, position) for a domain recipe's parsed ingredient lines, without
+    recipe_id.
+    """
+    return [
+        {"name": line.name, "quantity": line.quantity, "quantity_max": line.quantity_max, "unit": line.unit,
+         "position": pos}
+        for pos, line in enumerate(domain.ingredients)
+        if line.name
+    ]
+
+
 def recipe_from_domain(session: Session, domain: Recipe) -> RecipeModel:
     rm = session.query(RecipeModel).filter_by(id=domain.id).first()
     if not rm:
         rm = RecipeModel(id=domain.id)
         session.add(rm)
-    rm.name = domain.name
-    rm.description = domain.description
-    rm.methods = domain.methods
-    rm.prep_time_mins = domain.prep_time_mins
-    rm.cook_time_mins = domain.cook_time_mins
-    rm.total_time_mins = domain.total_time_mins
-    rm.difficulty = domain.difficulty
-    rm.category = domain.category
-    rm.cuisine = domain.cuisine
-    rm.tags = domain.tags
-    rm.notes = domain.notes
-    rm.image_url = domain.image_url
+    for column_name, value in recipe_row(domain).items():
+        setattr(rm, column_name, value)
 
     # rebuild recipe-specific ingredient rows (do NOT touch global inventory ingredients)
     rm.recipe_ingredients.clear()
-
-    def _extract_number_token(s: str):
-        import re
-        if s is None:
-            return None
-        s = str(s)
-        # match an integer or decimal (first occurrence), also handle ranges like 900-1000 by grabbing first number
-        m = re.search(r"\d+(?:\.\d+)?", s)
-        if not m:
-            return None
-        try:
-            return float(m.group(0))
-        except Exception:
-            return None
-
-    for pos, entry in enumerate(domain.ingredients):
-        name = ""
-        qty = None
-        unit = ""
-
-        if isinstance(entry, (tuple, list)):
-            # normalize parts, keep empty strings as placeholders
-            parts = [p.strip() for p in entry if p is not None]
-            parts = [p for p in parts if p != ""]
-
-            # try qty in first part
-            if len(parts) >= 1 and _extract_number_token(parts[0]) is not None:
-                qty = _extract_number_token(parts[0])
-                unit = parts[1] if len(parts) > 1 else ""
-                name = " ".join(parts[2:]) if len(parts) > 2 else ""
-            # try qty in second part (name, qty, unit)
-            elif len(parts) >= 2 and _extract_number_token(parts[1]) is not None:
-                name = parts[0]
-                qty = _extract_number_token(parts[1])
-                unit = parts[2] if len(parts) > 2 else ""
-                if len(parts) > 3:
-                    # append any trailing tokens to name
-                    name = name + " " + " ".join(parts[3:])
-            else:
-                # fallback: no numeric quantity found
-                if len(parts) == 1:
-                    name = parts[0]
-                elif len(parts) == 2:
-                    name = parts[1]
-                    unit = parts[0]
-                else:
-                    name = " ".join(parts[2:]) if len(parts) > 2 else parts[-1]
-                    unit = parts[1] if len(parts) > 1 else ""
-        elif isinstance(entry, Ingredient):
-            name, qty, unit = entry.name, entry.quantity, entry.unit
-        else:
-            # unexpected type; skip
-            continue
-
-        name = (name or "").strip()
-        unit = (unit or "").strip()
-
-        # if name is empty but parts had something, try to salvage last token
-        if not name and isinstance(entry, (tuple, list)) and len(entry) > 0:
-            name = str(entry[-1]).strip()
-
-        # ensure numeric qty or None
-        if isinstance(qty, str):
-            qty = _extract_number_token(qty)
-
-        qty_val = float(qty) if (qty is not None) else None
-
-        # skip associations without a sensible ingredient name
-        if not name:
-            continue
-
+    for row in recipe_ingredient_rows(domain):
         # create a recipe-specific ingredient row (decoupled from inventory IngredientModel)
-        rim = RecipeIngredientModel(name=name, quantity=qty_val, unit=unit or "", position=pos)
-        rm.recipe_ingredients.append(rim)
+        rm.recipe_ingredients.append(RecipeIngredientModel(**row))
     session.flush()
     return rm
 
 
 def user_from_domain(session: Session, domain: User) -> UserModel:
-    um = session.query(UserModel).filter_by(id=domain.id).first()
+    """
+    Write a domain User back, touching only the rows that changed: grocery
+    associations and saved recipes are diffed against what is stored, and
+    the recipe_ingredients JSON is only reassigned when it differs.
+    """
+    um = (
+        session.query(UserModel)
+        .options(selectinload(UserModel.grocery_assocs), selectinload(UserModel.saved_recipes))
+        .filter_by(id=domain.id)
+        .first()
+    )
     if not um:
         um = UserModel(id=domain.id)
         session.add(um)
@@ -316,15 +421,42 @@ def user_from_domain(session: Session, domain: User) -> UserModel:
     um.email = domain.email
     um.password_hash = domain.password_hash
     # recipe_ingredients stored as a dict mapping recipe_name -> list[str]
-    um.recipe_ingredients = domain.recipe_ingredients if isinstance(domain.recipe_ingredients, dict) else {}
-    # rebuild grocery associations
-    um.grocery_assocs.clear()
+    recipe_ingredients = domain.recipe_ingredients if isinstance(domain.recipe_ingredients, dict) else {}
+    if um.recipe_ingredients != recipe_ingredients:
+        um.recipe_ingredients = copy.deepcopy(recipe_ingredients)
+
+    # grocery associations: wanted quantity per ingredient id
+    quantities: Dict[str, float] = {}
     for ing in domain.grocery_list:
-        ingr_model = ensure_ingredient(session, ing.name)
-        assoc = UserGroceryAssoc(ingredient=ingr_model, quantity=ing.quantity or 0)
-        um.grocery_assocs.append(assoc)
+        name = ing.name.strip()
+        quantities[name] = quantities.get(name, 0) + (ing.quantity or 0)
+    ingredient_ids = ingredient_ids_by_name(session, quantities)
+    wanted = {}
+    for name, quantity in quantities.items():
+        ingredient_id = ingredient_ids[name]
+        wanted[ingredient_id] = wanted.get(ingredient_id, 0) + quantity
+
+    for assoc in list(um.grocery_assocs):
+        if assoc.ingredient_id not in wanted:
+            um.grocery_assocs.remove(assoc)
+            continue
+        quantity = wanted.pop(assoc.ingredient_id)
+        if assoc.quantity != quantity:
+            assoc.quantity = quantity
+    for ingredient_id, quantity in wanted.items():
+        um.grocery_assocs.append(UserGroceryAssoc(ingredient_id=ingredient_id, quantity=quantity))
+
     # saved recipes
-    um.saved_recipes.clear()
-    for rid in domain.saved_recipes:
-        um.saved_recipes.append(UserSavedRecipe(recipe_id=rid))
+    saved = list(dict.fromkeys(domain.saved_recipes))
+    wanted_ids = set(saved)
+    stored = set()
+    for sr in list(um.saved_recipes):
+        if sr.recipe_id not in wanted_ids or sr.recipe_id in stored:
+            um.saved_recipes.remove(sr)
+        else:
+            stored.add(sr.recipe_id)
+    for rid in saved:
+        if rid not in stored:
+            um.saved_recipes.append(UserSavedRecipe(recipe_id=rid))
     session.flush()
+    return um
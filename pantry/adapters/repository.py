@@ -1,8 +1,12 @@
 import abc
-from typing import List
+from typing import List, Optional
 
 repo_instance = None
 
+# called with the user after every write to a user's data, e.g. to drop a
+# copy of the user the caller is holding on to (see create_app)
+user_write_hook = None
+
 
 class RepositoryException(Exception):
     def __init__(self, message=None):
@@ -10,6 +14,34 @@ class RepositoryException(Exception):
 
 
 class AbstractRepository(abc.ABC):
+    def begin_unit_of_work(self):
+        # Defers commits until end_unit_of_work (a no-op unless the repository
+        # has transactions).
+        pass
+
+    def end_unit_of_work(self, exception=None):
+        # Commits the writes made since begin_unit_of_work, or rolls them back
+        # if an exception is given. A no-op when no unit of work is open.
+        pass
+
+    def invalidate_catalog_indexes(self):
+        # Drops in-memory indexes derived from the catalog so they are rebuilt
+        # on next use, after another process changed it.
+        pass
+
+    def user_written(self, user):
+        # Called by implementations after each write to ``user``'s data; runs
+        # user_write_hook.
+        if user_write_hook is not None:
+            user_write_hook(user)
+
+    def state_version(self, key: str, fresh: bool = False) -> Optional[int]:
+        # Generation counter for version_channel.CATALOG or user_key(username)
+        # that changes whenever the data behind it does, read without a query;
+        # None if the repository doesn't keep one. ``fresh`` includes bumps
+        # other processes made since the last poll.
+        return None
+
     @abc.abstractmethod
     def add_ingredient(self, ingredient):
         # Adds an Ingredient to the repository.
@@ -43,6 +75,12 @@ class AbstractRepository(abc.ABC):
     def sort_ingredients_by_category(self, category: str):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def suggest_names(self, prefix: str, limit: int = 10) -> List:
+        # Returns up to `limit` (name, kind) completions of `prefix`, where
+        # kind is "ingredient" or "recipe".
+        raise NotImplementedError
+
     @abc.abstractmethod
     def add_category(self, category):
         # Adds a Category to the repository.
@@ -160,10 +198,43 @@ class AbstractRepository(abc.ABC):
     def get_recipe_by_name(self, name: str):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_recipes_by_ids(self, recipe_ids: List[int]) -> List:
+        # Retrieves the Recipes with the given ids, in the order given;
+        # unknown ids are skipped.
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_cookable_recipes(self, ingredient_names: List[str], max_missing: int = 0) -> List:
+        # Returns (Recipe, [missing ingredient names]) for every recipe that
+        # needs at most `max_missing` ingredients beyond `ingredient_names`,
+        # fewest missing first.
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_similar_recipes(self, recipe_id: int, k: int = 5) -> List:
+        # Returns up to `k` Recipes most like the given one (TF-IDF cosine
+        # over ingredients, tags, cuisine and category), best first.
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recommended_recipes(self, recipe_ids: List[int], k: int = 5) -> List:
+        # Returns up to `k` Recipes most like the given ones taken together
+        # (e.g. a user's saved recipes), leaving those out, best first.
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_recipes_by_category(self, category: str) -> List:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_recipes_by_cuisine(self, cuisine: str) -> List:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes_by_tag(self, tag: str) -> List:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_all_recipes(self) -> List:
         raise NotImplementedError
@@ -0,0 +1,231 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+def _key(value: str) -> str:
+    return value.casefold()
+
+
+class NGramIndex:
+    """
+    Case-insensitive substring index over named values.
+
+    Every name is split into overlapping n-grams (trigrams by default) and each
+    n-gram keeps a posting set of the names containing it. A contains-query is
+    answered by intersecting the posting sets of the query's n-grams (smallest
+    first) and confirming the survivors, so the cost depends on the number of
+    candidates rather than on the number of indexed names. Results come back
+    in name order.
+    """
+
+    def __init__(self, n: int = 3):
+        self.__n = n
+        self.__postings: Dict[str, Set[str]] = {}
+        self.__values: Dict[str, Any] = {}
+        self.__names: Dict[str, str] = {}
+        # (name, key) pairs kept sorted so large result sets can be emitted
+        # in name order without sorting them
+        self.__ordered: List[Tuple[str, str]] = []
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __grams(self, key: str) -> Set[str]:
+        n = self.__n
+        if len(key) < n:
+            return set()
+        return {key[i : i + n] for i in range(len(key) - n + 1)}
+
+    def __index(self, name: str, value: Any) -> bool:
+        key = _key(name)
+        if key in self.__values:
+            # first insert wins, like the repository lookups
+            return False
+        self.__values[key] = value
+        self.__names[key] = name
+        for gram in self.__grams(key):
+            self.__postings.setdefault(gram, set()).add(key)
+        return True
+
+    def add(self, name: str, value: Any) -> None:
+        if self.__index(name, value):
+            insort(self.__ordered, (name, _key(name)))
+
+    def add_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        added = [(name, _key(name)) for name, value in items if self.__index(name, value)]
+        if added:
+            self.__ordered.extend(added)
+            self.__ordered.sort()
+
+    def __candidates(self, query: str) -> Set[str]:
+        grams = self.__grams(query)
+        if grams:
+            postings = sorted(
+                (self.__postings.get(g, set()) for g in grams), key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            return candidates
+        # query shorter than n: union the postings of every n-gram that
+        # contains it (the n-gram vocabulary is much smaller than the names)
+        candidates: Set[str] = set()
+        for gram, posting in self.__postings.items():
+            if query in gram:
+                candidates |= posting
+        # names shorter than n have no n-grams at all
+        candidates.update(k for k in self.__values if len(k) < self.__n)
+        return candidates
+
+    def search(self, query: str) -> List[Any]:
+        query = _key(query)
+        if not query:
+            return [self.__values[k] for _, k in self.__ordered]
+
+        # trigram containment is necessary but not sufficient, so confirm
+        matches = {k for k in self.__candidates(query) if query in k}
+        if not matches:
+            return []
+        if len(matches) * 8 > len(self.__values):
+            return [self.__values[k] for _, k in self.__ordered if k in matches]
+        ordered = sorted(matches, key=lambda k: (self.__names[k], k))
+        return [self.__values[k] for k in ordered]
+
+
+class PrefixIndex:
+    """
+    Sorted-array typeahead index: (case-folded name, kind) pairs kept in order
+    so every completion of a prefix sits in one contiguous run found with
+    bisect. ``complete`` costs O(log n + k) for the top-k completions.
+    """
+
+    def __init__(self):
+        self.__keys: List[Tuple[str, str]] = []
+        self.__names: Dict[Tuple[str, str], str] = {}
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def add(self, name: str, kind: str) -> None:
+        entry = (_key(name), kind)
+        if entry in self.__names:
+            return
+        self.__names[entry] = name
+        insort(self.__keys, entry)
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        added = False
+        for name, kind in items:
+            entry = (_key(name), kind)
+            if entry not in self.__names:
+                self.__names[entry] = name
+                self.__keys.append(entry)
+                added = True
+        if added:
+            self.__keys.sort()
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        prefix = _key(prefix)
+        if not prefix or limit <= 0:
+            return []
+        results = []
+        for i in range(bisect_left(self.__keys, (prefix, "")), len(self.__keys)):
+            entry = self.__keys[i]
+            if not entry[0].startswith(prefix):
+                break
+            results.append((self.__names[entry], entry[1]))
+            if len(results) == limit:
+                break
+        return results
+
+
+class IngredientBitsetIndex:
+    """
+    Recipes as bitsets over an ingredient vocabulary, for "what can I cook"
+    queries.
+
+    Every case-folded ingredient name gets a bit (the catalog's ingredients
+    first, then any recipe-only names as they appear) and every recipe an
+    int with the bits of its ingredients set. A pantry is turned into a mask
+    once; a recipe's missing ingredients are then ``recipe & ~pantry`` and
+    their number one ``int.bit_count``, so a query is a single pass of
+    integer operations over the recipes.
+    """
+
+    def __init__(self, vocabulary: Iterable[str] = ()):
+        self.__bits: Dict[str, int] = {}
+        self.__names: List[str] = []
+        self.__ids: List[Any] = []
+        self.__masks: List[int] = []
+        self.__positions: Dict[Any, int] = {}
+        for name in vocabulary:
+            self.__bit(name)
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __bit(self, name: str) -> int:
+        key = _key(name.strip())
+        bit = self.__bits.get(key)
+        if bit is None:
+            bit = self.__bits[key] = len(self.__names)
+            self.__names.append(name.strip())
+        return bit
+
+    def add_vocabulary(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.__bit(name)
+
+    def add(self, recipe_id: Any, ingredient_names: Iterable[str]) -> None:
+        mask = 0
+        for name in ingredient_names:
+            if name and name.strip():
+                mask |= 1 << self.__bit(name)
+        position = self.__positions.get(recipe_id)
+        if position is None:
+            self.__positions[recipe_id] = len(self.__ids)
+            self.__ids.append(recipe_id)
+            self.__masks.append(mask)
+        else:
+            self.__masks[position] = mask
+
+    def add_many(self, items: Iterable[Tuple[Any, Iterable[str]]]) -> None:
+        for recipe_id, ingredient_names in items:
+            self.add(recipe_id, ingredient_names)
+
+    def mask(self, ingredient_names: Iterable[str]) -> int:
+        # names outside the vocabulary can't be in any recipe, so they're
+        # dropped rather than given bits
+        mask = 0
+        for name in ingredient_names:
+            bit = self.__bits.get(_key(name.strip()))
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.__names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+    def cookable(self, ingredient_names: Iterable[str], max_missing: int = 0) -> List[Tuple[Any, int]]:
+        """
+        Returns (recipe id, missing mask) for every recipe missing at most
+        ``max_missing`` of its ingredients from the pantry, fewest missing
+        first and otherwise in insertion order.
+        """
+        absent = ~self.mask(ingredient_names)
+        if max_missing <= 0:
+            return [(rid, 0) for rid, m in zip(self.__ids, self.__masks) if not m & absent]
+        found = []
+        for rid, m in zip(self.__ids, self.__masks):
+            missing = m & absent
+            if missing.bit_count() <= max_missing:
+                found.append((rid, missing))
+        found.sort(key=lambda item: item[1].bit_count())
+        return found
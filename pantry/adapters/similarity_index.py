@@ -0,0 +1,176 @@
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def recipe_features(recipe) -> List[str]:
+    # binary features: every ingredient, tag, the cuisine and the category
+    features = {f"ingredient:{line.name.casefold()}" for line in recipe.ingredients if line.name}
+    features.update(f"tag:{tag.casefold()}" for tag in recipe.tags or () if tag)
+    if recipe.cuisine:
+        features.add(f"cuisine:{recipe.cuisine.casefold()}")
+    if recipe.category:
+        features.add(f"category:{recipe.category.casefold()}")
+    return sorted(features)
+
+
+class RecipeSimilarityIndex:
+    """
+    TF-IDF vectors over recipe features, for "more like this" and
+    recommendations.
+
+    Each recipe is a sparse, L2-normalized vector of idf weights over its
+    ingredients, tags, cuisine and category, and every feature keeps a
+    posting list of the recipes that have it. A query runs in two steps:
+
+    1. candidates: walk the posting lists of the query's features, rarest
+       (heaviest) first, adding up partial scores; lists that would take the
+       walk past ``posting_budget`` entries are skipped. Those are the most
+       common features, which carry the least idf weight.
+    2. rerank: the ``rerank`` best candidates get their exact cosine
+       similarity from their stored vectors and the top k are returned.
+
+    So a query touches a bounded number of postings however large the
+    catalog is. ``add`` weights new recipes with the current idf and appends
+    them to the posting lists. Once the additions since the last build
+    exceed ``rebuild_ratio`` of the recipes, the next query re-weights
+    everything. Query results are memoized until the index changes.
+    """
+
+    def __init__(
+        self,
+        posting_budget: int = 8_000,
+        rerank: int = 128,
+        rebuild_ratio: float = 0.1,
+        cache_size: int = 1024,
+    ):
+        self.__posting_budget = posting_budget
+        self.__rerank = rerank
+        self.__rebuild_ratio = rebuild_ratio
+        self.__cache_size = cache_size
+
+        self.__features: Dict[Any, List[str]] = {}
+        self.__df: Dict[str, int] = {}
+        self.__vectors: Dict[Any, Dict[str, float]] = {}
+        self.__postings: Dict[str, List[Tuple[Any, float]]] = {}
+        self.__built_size = 0
+        self.__added_since_build = 0
+        self.__cache: "OrderedDict[tuple, List[Tuple[Any, float]]]" = OrderedDict()
+        self.__cache_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__features)
+
+    def __contains__(self, recipe_id) -> bool:
+        return recipe_id in self.__features
+
+    def __idf(self, feature: str) -> float:
+        return math.log((1 + len(self.__features)) / (1 + self.__df.get(feature, 0))) + 1
+
+    def __vector(self, features: Iterable[str]) -> Dict[str, float]:
+        weights = {f: self.__idf(f) for f in features}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {f: w / norm for f, w in weights.items()}
+
+    def __build(self):
+        self.__vectors = {rid: self.__vector(features) for rid, features in self.__features.items()}
+        postings: Dict[str, List[Tuple[Any, float]]] = {}
+        for rid, vector in self.__vectors.items():
+            for feature, weight in vector.items():
+                postings.setdefault(feature, []).append((rid, weight))
+        self.__postings = postings
+        self.__built_size = len(self.__features)
+        self.__added_since_build = 0
+        self.__cache.clear()
+
+    def __ensure_built(self):
+        pending = self.__added_since_build
+        if pending and pending > self.__rebuild_ratio * max(self.__built_size, 1):
+            self.__build()
+
+    def add(self, recipe) -> None:
+        self.add_many([recipe])
+
+    def add_many(self, recipes: Iterable) -> None:
+        for recipe in recipes:
+            if recipe.id in self.__features:
+                continue
+            features = recipe_features(recipe)
+            self.__features[recipe.id] = features
+            for feature in features:
+                self.__df[feature] = self.__df.get(feature, 0) + 1
+            self.__added_since_build += 1
+            if not self.__built_size:
+                # nothing to keep up to date yet; the first query builds
+                continue
+            vector = self.__vector(features)
+            self.__vectors[recipe.id] = vector
+            for feature, weight in vector.items():
+                self.__postings.setdefault(feature, []).append((recipe.id, weight))
+        self.__cache.clear()
+
+    def __top(self, query: Dict[str, float], exclude, k: int) -> List[Tuple[Any, float]]:
+        partial: Dict[Any, float] = {}
+        budget = self.__posting_budget
+        for feature, q_weight in sorted(query.items(), key=lambda item: item[1], reverse=True):
+            postings = self.__postings.get(feature, ())
+            if len(postings) > budget:
+                continue
+            budget -= len(postings)
+            for rid, weight in postings:
+                partial[rid] = partial.get(rid, 0.0) + weight * q_weight
+        for rid in exclude:
+            partial.pop(rid, None)
+
+        vectors = self.__vectors
+        exact = []
+        for rid in heapq.nlargest(self.__rerank, partial, key=partial.__getitem__):
+            score = sum(weight * query.get(feature, 0.0) for feature, weight in vectors[rid].items())
+            exact.append((rid, score))
+        top = heapq.nlargest(k, exact, key=lambda item: item[1])
+        return [(rid, round(score, 6)) for rid, score in top]
+
+    def __memoized(self, key, compute):
+        with self.__cache_lock:
+            found = self.__cache.get(key)
+            if found is not None:
+                self.__cache.move_to_end(key)
+                return found
+        found = compute()
+        with self.__cache_lock:
+            self.__cache[key] = found
+            if len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+        return found
+
+    def similar(self, recipe_id, k: int = 5) -> List[Tuple[Any, float]]:
+        """(recipe id, cosine similarity) of the ``k`` recipes most like one recipe."""
+        if recipe_id not in self.__features or k <= 0:
+            return []
+        self.__ensure_built()
+        return self.__memoized(
+            ("similar", recipe_id, k),
+            lambda: self.__top(self.__vectors[recipe_id], (recipe_id,), k),
+        )
+
+    def recommend(self, recipe_ids: Iterable, k: int = 5) -> List[Tuple[Any, float]]:
+        """
+        (recipe id, score) of the ``k`` recipes closest to the centroid of
+        ``recipe_ids`` (e.g. a user's saved recipes), leaving those out.
+        """
+        seeds = tuple(sorted({rid for rid in recipe_ids if rid in self.__features}, key=repr))
+        if not seeds or k <= 0:
+            return []
+        self.__ensure_built()
+
+        def compute():
+            profile: Dict[str, float] = {}
+            for rid in seeds:
+                for feature, weight in self.__vectors[rid].items():
+                    profile[feature] = profile.get(feature, 0.0) + weight
+            norm = math.sqrt(sum(w * w for w in profile.values())) or 1.0
+            return self.__top({f: w / norm for f, w in profile.items()}, seeds, k)
+
+        return self.__memoized(("recommend", seeds, k), compute)
@@ -0,0 +1,129 @@
+import hashlib
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+# key bumped whenever recipes or ingredients change
+CATALOG = "catalog"
+# random value set when the counters are created; it changes whenever they
+# restart from 0 (a new channel file, or a new process without one)
+EPOCH = "epoch"
+
+
+def user_key(username: str) -> str:
+    # key bumped whenever one user's own data (grocery list, saved recipes,
+    # recipe selections) changes
+    return f"user:{username}"
+
+
+def default_channel_path(database_uri: str) -> str:
+    # one channel per database, shared by every worker on the host
+    digest = hashlib.sha1(database_uri.encode("utf-8")).hexdigest()[:12]
+    return str(Path(tempfile.gettempdir()) / f"pantry-versions-{digest}.sqlite")
+
+
+class VersionChannel:
+    """
+    Generation counters shared by the worker processes on one host.
+
+    Each key (e.g. ``"catalog"``) has an integer version stored in a small
+    SQLite file. A worker that changes the data behind a key calls ``bump``;
+    caches remember the version they were built from and rebuild lazily when
+    ``get`` returns something else. ``get`` re-reads the file at most once
+    per ``poll_interval`` seconds, so a write in one worker is visible to the
+    others within that delay, and a process always sees its own bumps at
+    once.
+
+    With ``path=None`` the counters live in this process only.
+
+    The counters start again from 0 when the file is lost (a wiped temp dir,
+    a new container), while the data behind them doesn't. Anything that must
+    not mistake a restarted counter for an old one (ETags) includes
+    ``get(EPOCH)``.
+    """
+
+    def __init__(self, path: Optional[str] = None, poll_interval: float = 1.0):
+        self.__path = str(path) if path is not None else None
+        self.__poll_interval = poll_interval
+        self.__versions: Dict[str, int] = {EPOCH: secrets.randbits(62)}
+        self.__checked_at = float("-inf")
+        self.__lock = threading.Lock()
+        if self.__path is not None:
+            with self.__connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS versions "
+                    "(key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+                # the first worker to open the file sets it
+                conn.execute(
+                    "INSERT OR IGNORE INTO versions (key, value) VALUES (?, ?)",
+                    (EPOCH, self.__versions[EPOCH]),
+                )
+
+    @property
+    def path(self) -> Optional[str]:
+        return self.__path
+
+    @property
+    def poll_interval(self) -> float:
+        return self.__poll_interval
+
+    def __connect(self):
+        # autocommit connection; closing it discards an unfinished BEGIN
+        return closing(sqlite3.connect(self.__path, timeout=5, isolation_level=None))
+
+    def get(self, key: str) -> int:
+        if self.__path is not None and time.monotonic() - self.__checked_at >= self.__poll_interval:
+            self.refresh()
+        return self.__versions.get(key, 0)
+
+    def refresh(self) -> None:
+        # re-read every counter now, regardless of the poll interval
+        if self.__path is None:
+            return
+        with self.__connect() as conn:
+            versions = dict(conn.execute("SELECT key, value FROM versions").fetchall())
+        with self.__lock:
+            self.__versions = versions
+            self.__checked_at = time.monotonic()
+
+    def read(self, key: str) -> int:
+        # re-read one counter now, regardless of the poll interval
+        if self.__path is None:
+            return self.__versions.get(key, 0)
+        with self.__connect() as conn:
+            row = conn.execute("SELECT value FROM versions WHERE key = ?", (key,)).fetchone()
+        value = row[0] if row is not None else 0
+        with self.__lock:
+            versions = dict(self.__versions)
+            versions[key] = value
+            self.__versions = versions
+        return value
+
+    def bump(self, key: str) -> int:
+        with self.__lock:
+            if self.__path is None:
+                value = self.__versions.get(key, 0) + 1
+            else:
+                with self.__connect() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(
+                        "INSERT INTO versions (key, value) VALUES (?, 1) "
+                        "ON CONFLICT(key) DO UPDATE SET value = value + 1",
+                        (key,),
+                    )
+                    (value,) = conn.execute(
+                        "SELECT value FROM versions WHERE key = ?", (key,)
+                    ).fetchone()
+                    conn.execute("COMMIT")
+            versions = dict(self.__versions)
+            versions[key] = value
+            self.__versions = versions
+        return value
+
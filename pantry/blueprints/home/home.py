@@ -3,11 +3,13 @@ from flask import render_template, Blueprint
 from pantry.blueprints.authentication.authentication import login_required
 
 from pantry.blueprints.services import _repo
+from pantry.utilities.etags import etag
 
 home_bp = Blueprint("home_bp", __name__)
 
 
 @home_bp.route("/")
+@etag()
 def home():
     repo = _repo()
 
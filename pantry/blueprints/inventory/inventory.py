@@ -3,11 +3,14 @@ from flask import render_template, Blueprint, request, session
 from pantry.blueprints.authentication.authentication import login_required
 
 from pantry.blueprints.services import _repo
+from pantry.utilities.auth import get_current_user
+from pantry.utilities.etags import etag
 
 inventory_bp = Blueprint("inventory_bp", __name__)
 
 
 @inventory_bp.route("/inventory", methods=["GET", "POST"])
+@etag()
 @login_required
 def inventory():
     repo = _repo()
@@ -38,6 +41,7 @@ def inventory():
 
 
 @inventory_bp.route("/inventory/api/<string:name>")
+@etag()
 @login_required
 def inventory_api(name: str):
     from flask import jsonify
@@ -114,7 +118,7 @@ def update_inventory(name: str):
                 {"success": False, "message": "Quantity cannot be negative"}
             ), 400
 
-        user = repo.get_user_by_username(username)
+        user = get_current_user()
         if not user:
             return jsonify({"success": False, "message": "User not found"}), 404
 
@@ -4,11 +4,17 @@ from pantry.blueprints.authentication.authentication import login_required
 from pantry.blueprints.recipes.services import _handle_recipe_ingredients_form
 
 from pantry.blueprints.services import _repo
+from pantry.utilities.auth import get_current_user
+from pantry.utilities.etags import etag
 
 recipes_bp = Blueprint("recipes_bp", __name__)
 
+MAX_MISSING_LIMIT = 5
+SIMILAR_RECIPES = 4
+
 
 @recipes_bp.route("/recipes")
+@etag()
 @login_required
 def recipes():
     """
@@ -37,12 +43,12 @@ def recipe_detail(recipe_name):
         - ingredients: List of ingredients for the recipe.
         - selected_ingredients: List of ingredients selected by the user.
         - saved: Boolean indicating if the recipe is saved by the user.
+        - similar_recipes: Recipes most like this one, for the "More Like This" panel.
     404 Not Found if the recipe does not exist.
     """
     selected_ingredients = []
-    username = session.get("username")
     repo = _repo()
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
     selected = request.form.getlist("ingredients[]")
 
     handled_recipe = " ".join(recipe_name.split("-"))
@@ -56,10 +62,7 @@ def recipe_detail(recipe_name):
     if not recipe:
         return render_template("pages/errors/404.html"), 404
 
-    try:
-        user_ingredients = user.recipe_ingredients[handled_recipe]
-    except KeyError:
-        user_ingredients = []
+    user_ingredients = user.get_recipe_ingredients(handled_recipe)
 
     if not selected_ingredients and user_ingredients:
         selected_ingredients = [ingredient[2] for ingredient in user_ingredients]
@@ -72,6 +75,7 @@ def recipe_detail(recipe_name):
         ingredients=recipe.ingredients,
         selected_ingredients=selected_ingredients,
         saved=saved_flag,
+        similar_recipes=repo.get_similar_recipes(recipe.id, SIMILAR_RECIPES),
     )
 
 
@@ -91,9 +95,8 @@ def toggle_save_recipe(recipe_name):
         "recipe_name": <str>  # The recipe name matched to the URL format (lowercase, hyphen-separated)
     200 OK on success, 404 Not Found if the recipe does not exist.
     """
-    username = session.get("username")
     repo = _repo()
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
     recipe = repo.get_recipe_by_name(" ".join(recipe_name.split("-")))
 
     if not recipe:
@@ -113,3 +116,46 @@ def toggle_save_recipe(recipe_name):
         "saved": saved,
         "recipe_name": "-".join(recipe.name.lower().split(" ")),
     }, 200
+
+
+@recipes_bp.route("/recipes/api/cookable")
+@login_required
+def cookable_recipes_api():
+    """
+    Recipes the user can cook from what they have.
+    :query ingredients: comma-separated names of the ingredients on hand
+        (may also be given as repeated ``ingredient`` parameters); required,
+        since the grocery list is what the user still has to buy
+    :query missing: how many of a recipe's ingredients may be missing
+        (default 0, capped at 5)
+    :return:
+    JSON response with the matching recipes, fewest missing first, or a
+    400 when no ingredients are given.
+    {
+        ingredients: [str],
+        max_missing: int,
+        recipes: [{id: int, name: str, missing: [str]}]
+    }
+    """
+    names = [n.strip() for value in request.args.getlist("ingredients") for n in value.split(",")]
+    names += [n.strip() for n in request.args.getlist("ingredient")]
+    names = [n for n in names if n]
+    if not names:
+        return {"success": False, "message": "ingredients is required"}, 400
+    try:
+        max_missing = int(request.args.get("missing", 0))
+    except ValueError:
+        max_missing = 0
+    max_missing = max(0, min(max_missing, MAX_MISSING_LIMIT))
+
+    repo = _repo()
+    found = repo.get_cookable_recipes(names, max_missing)
+
+    return {
+        "ingredients": names,
+        "max_missing": max_missing,
+        "recipes": [
+            {"id": recipe.id, "name": recipe.name, "missing": missing}
+            for recipe, missing in found
+        ],
+    }, 200
@@ -0,0 +1,44 @@
+from flask import Blueprint, request, jsonify
+
+from pantry.blueprints.authentication.authentication import login_required
+
+from pantry.blueprints.services import _repo
+
+search_bp = Blueprint("search_bp", __name__, url_prefix="/search")
+
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 25
+
+
+@search_bp.route("/api/suggest")
+@login_required
+def suggest_api():
+    """
+    Typeahead completions for ingredient and recipe names.
+    :query q: prefix typed so far
+    :query k: maximum number of suggestions (default 8, capped at 25)
+    :return:
+    JSON response with the matching names in alphabetical order.
+    {
+        query: str,
+        suggestions: [{name: str, type: "ingredient" | "recipe"}]
+    }
+    """
+    query = request.args.get("q", "").strip()
+    try:
+        limit = int(request.args.get("k", DEFAULT_SUGGESTIONS))
+    except ValueError:
+        limit = DEFAULT_SUGGESTIONS
+    limit = max(0, min(limit, MAX_SUGGESTIONS))
+
+    repo = _repo()
+    suggestions = repo.suggest_names(query, limit) if query else []
+
+    return jsonify(
+        {
+            "query": query,
+            "suggestions": [
+                {"name": name, "type": kind} for name, kind in suggestions
+            ],
+        }
+    ), 200
@@ -0,0 +1,59 @@
+from typing import Iterator, List
+
+from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine
+from pantry.domainmodel.recipe_selections import entry_name
+from pantry.domainmodel.shopping_list import PlannedPurchase, ShoppingItem, consolidate, plan_purchases
+
+
+def _selected_recipe_lines(user, recipes) -> Iterator[RecipeIngredientLine]:
+    # the user's selections are stored as display strings; match them back to
+    # the recipe's parsed lines and only parse entries the recipe doesn't have
+    for recipe in recipes:
+        selected = user.get_recipe_ingredients(recipe.name)
+        if not selected:
+            continue
+        lines = {line.name.casefold(): line for line in recipe.ingredients}
+        for entry in selected:
+            name = entry_name(entry)
+            line = lines.get(name.strip().casefold())
+            if line is None:
+                line = RecipeIngredientLine.parse(entry) or RecipeIngredientLine.create("", "", name.strip())
+            yield line
+
+
+def _consolidated_list(user, repo) -> List[ShoppingItem]:
+    """
+    The user's general grocery list plus the ingredients they selected from
+    their saved recipes, added up per ingredient in canonical units.
+    """
+    recipes = repo.get_recipes_by_ids(user.saved_recipes)
+    lines = list(user.grocery_list)
+    lines.extend(_selected_recipe_lines(user, recipes))
+    return consolidate(lines)
+
+
+def _on_hand_lines(on_hand, repo) -> List[RecipeIngredientLine]:
+    """
+    Parses the ``on_hand`` object of a plan request: ingredient name to
+    either a number, in the unit the ingredient is sold in, or
+    {"quantity": number, "unit": str}. Raises ValueError when malformed.
+    """
+    if not isinstance(on_hand, dict):
+        raise ValueError("on_hand must be an object of ingredient name to quantity")
+    lines = []
+    for name, value in on_hand.items():
+        if isinstance(value, dict):
+            quantity, unit = value.get("quantity"), value.get("unit")
+        else:
+            quantity, unit = value, None
+        if isinstance(quantity, bool) or not isinstance(quantity, (int, float)) or quantity < 0:
+            raise ValueError(f"on_hand quantity for '{name}' must be a non-negative number")
+        if unit is None:
+            ingredient = repo.get_ingredient_by_name(name)
+            unit = ingredient.unit if ingredient is not None else ""
+        lines.append(RecipeIngredientLine.from_amount(float(quantity), str(unit), str(name)))
+    return lines
+
+
+def _purchase_plan(user, repo, on_hand) -> List[PlannedPurchase]:
+    return plan_purchases(_consolidated_list(user, repo), _on_hand_lines(on_hand, repo), repo.get_ingredient_by_name)
@@ -6,6 +6,9 @@ from flask import render_template, Blueprint, session
 from pantry.blueprints.authentication.authentication import login_required
 
 from pantry.blueprints.services import _repo
+from pantry.blueprints.shopping.services import _consolidated_list, _purchase_plan
+from pantry.utilities.auth import get_current_user
+from pantry.utilities.etags import etag
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -15,6 +18,7 @@ shopping_bp = Blueprint("shopping", __name__)
 
 
 @shopping_bp.route("/shopping")
+@etag(per_user=True)
 @login_required
 def shopping():
     """
@@ -23,14 +27,11 @@ def shopping():
     Rendered shopping list template with grocery items and saved recipes.
     """
     repo = _repo()
-    username = session.get("username")
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
 
     grocery_list = user.grocery_list if user else []
 
-    all_recipes = repo.get_all_recipes()
-    recipe_map = {r.id: r for r in all_recipes}
-    saved_recipes = [recipe_map[rid] for rid in (user.saved_recipes or []) if rid in recipe_map]
+    saved_recipes = repo.get_recipes_by_ids(user.saved_recipes or [])
 
     ri = {}
     for k, v in (user.recipe_ingredients or {}).items():
@@ -63,20 +64,9 @@ def remove_from_shopping_api(name: str):
     from flask import jsonify
 
     repo = _repo()
-    username = session.get("username")
-    user = repo.get_user_by_username(username)
-
-    found = None
-    for ing in list(user.grocery_list):
-        try:
-            if ing.name.lower() == name.lower():
-                found = ing
-                break
-        except Exception:
-            continue
-
-    if found:
-        user.grocery_list.remove(found)
+    user = get_current_user()
+
+    if user.remove_grocery(name):
         repo.update_user(user)
         return jsonify(
             {
@@ -101,41 +91,69 @@ def download_shopping_list_api():
 
     """Generates and returns the user's shopping list as a downloadable text file.
 
-    Returns JSON containing the shopping list text.
+    The general grocery list and the ingredients selected from saved recipes
+    are consolidated, so an ingredient needed by several recipes appears
+    once, in canonical units.
+
+    Returns JSON containing the shopping list text and the consolidated items.
     """
 
     from flask import jsonify
 
     repo = _repo()
-    username = session.get("username")
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
 
-    grocery_list = user.grocery_list if user else []
+    items = _consolidated_list(user, repo)
+
+    shopping_list_text = "Grocery List:\n\n"
+    for item in items:
+        amount = item.display()
+        shopping_list_text += f"    - {item.name}: {amount}\n" if amount else f"    - {item.name}\n"
+
+    return jsonify(
+        {
+            "shopping_list": shopping_list_text,
+            "items": [
+                {"name": i.name, "quantity": i.quantity, "quantity_max": i.quantity_max, "unit": i.unit}
+                for i in items
+            ],
+        }
+    ), 200
+
+
+@shopping_bp.route("/shopping/api/plan", methods=["GET", "POST"])
+@login_required
+def shopping_plan_api():
 
-    shopping_list_text = "General Grocery List:\n\n"
-    for item in grocery_list:
-        shopping_list_text += f"    - {item.name}: {item.quantity} {item.unit}\n"
+    """
+    Works out what to buy: the consolidated shopping list less what the user
+    already has, rounded up to each ingredient's purchasable step.
+
+    POST body (optional):
+    {
+        on_hand: {ingredient_name: quantity | {quantity: float, unit: str}}
+    }
+    A bare quantity is in the unit the ingredient is sold in.
+    :return:
+    JSON response with the items still to buy.
+    {
+        success: bool,
+        items: [{name, needed, on_hand, shortfall, unit, purchase, purchase_unit}]
+    }
+    """
 
-    user_saved_recipes = user.saved_recipes
-    user_recipe_ingredients = user.recipe_ingredients
+    from flask import jsonify, request
 
-    all_recipes = repo.get_all_recipes()
-    recipe_map = {r.id: r for r in all_recipes}
+    repo = _repo()
+    user = get_current_user()
 
-    for recipe_id in user_saved_recipes:
-        recipe_obj = recipe_map.get(recipe_id)
-        if not recipe_obj:
-            continue
-        shopping_list_text += f"\n\n{recipe_obj.name}:\n\n"
-        ri_list = []
-        for k, v in (user_recipe_ingredients or {}).items():
-            if k.lower() == recipe_obj.name.lower():
-                ri_list = v
-                break
-        for ingr in ri_list:
-            shopping_list_text += f"    - {ingr[2]} {ingr[0]} {ingr[1]}\n"
+    body = request.get_json(silent=True) or {}
+    try:
+        plan = _purchase_plan(user, repo, body.get("on_hand", {}) if isinstance(body, dict) else None)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
-    return jsonify({"shopping_list": shopping_list_text}), 200
+    return jsonify({"success": True, "items": [p._asdict() for p in plan]}), 200
 
 
 @shopping_bp.route("/shopping/api/delete_recipe/<string:recipe_name>", methods=["GET", "POST"])
@@ -157,8 +175,7 @@ def delete_recipe_from_shopping_api(recipe_name: str):
     from flask import jsonify
 
     repo = _repo()
-    username = session.get("username")
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
 
     recipe_obj = repo.get_recipe_by_name(recipe_name)
     if not recipe_obj:
@@ -170,17 +187,9 @@ def delete_recipe_from_shopping_api(recipe_name: str):
         user.remove_saved_recipe(recipe_id)
 
         for ingredient in recipe_obj.ingredients:
-            ing_name = ingredient[0] if isinstance(ingredient, (list, tuple)) and len(ingredient) > 0 else str(ingredient)
-            for g in list(user.grocery_list):
-                try:
-                    if g.name.lower() == str(ing_name).lower():
-                        user.grocery_list.remove(g)
-                except Exception:
-                    continue
-
-        keys_to_delete = [k for k in (user.recipe_ingredients or {}).keys() if k.lower() == recipe_name.lower()]
-        for k in keys_to_delete:
-            del user.recipe_ingredients[k]
+            user.remove_grocery(ingredient.name)
+
+        user.clear_recipe_ingredients_by_recipe(recipe_name)
 
         repo.update_user(user)
         return jsonify(
@@ -221,17 +230,11 @@ def remove_saved_recipe_ingredient_api(recipe_name: str, ingredient_name: str):
     from flask import jsonify
 
     repo = _repo()
-    username = session.get("username")
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
 
     try:
         user.remove_recipe_ingredient(recipe_name, ingredient_name)
-        for g in list(user.grocery_list):
-            try:
-                if g.name.lower() == ingredient_name.lower():
-                    user.grocery_list.remove(g)
-            except Exception:
-                continue
+        user.remove_grocery(ingredient_name)
     except Exception as e:
         return jsonify(
             {
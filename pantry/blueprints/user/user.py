@@ -1,11 +1,15 @@
 from flask import Blueprint, session
 
-from pantry.utilities.auth import _repo
+from pantry.utilities.auth import _repo, get_current_user
 from pantry.blueprints.authentication.authentication import login_required
+from pantry.utilities.etags import etag
 
 user_bp = Blueprint("user", __name__)
 
+RECOMMENDED_RECIPES = 6
+
 @user_bp.route("/user/<string:username>")
+@etag(per_user=True)
 @login_required
 def user_profile(username: str):
     """
@@ -20,18 +24,18 @@ def user_profile(username: str):
         return render_template("errors/403.html"), 403
 
     repo = _repo()
-    user = repo.get_user_by_username(username)
+    user = get_current_user()
 
     if not user:
         return render_template("errors/404.html"), 404
 
-    all_recipes = repo.get_all_recipes()
-    recipe_map = {r.id: r for r in all_recipes}
-    saved_recipes = [recipe_map[rid] for rid in user.saved_recipes if rid in recipe_map]
+    saved_recipes = repo.get_recipes_by_ids(user.saved_recipes)
+    recommended_recipes = repo.get_recommended_recipes(user.saved_recipes, RECOMMENDED_RECIPES)
 
     return render_template(
         "pages/user/user.html",
         user=user,
         saved_recipes=saved_recipes,
+        recommended_recipes=recommended_recipes,
         username_shorthand=user.username[0].upper(),
     )
\ No newline at end of file
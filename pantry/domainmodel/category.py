@@ -1,11 +1,21 @@
+from typing import Dict, Union
+
+from pantry.domainmodel.interning import intern_str
+
+
 class Category:
+    __slots__ = ("__name",)
+
     def __init__(self, name: str):
-        self.__name = name
+        self.__name = intern_str(name)
 
     def __repr__(self):
         return f"{self.name}"
 
     def __eq__(self, other):
+        if self is other:
+            # registry-interned categories compare by identity
+            return True
         if isinstance(other, Category):
             return self.name == other.name
         return False
@@ -16,3 +26,21 @@ class Category:
     @property
     def name(self):
         return self.__name
+
+
+# one shared Category per name, handed out by intern_category
+_registry: Dict[str, Category] = {}
+
+
+def intern_category(category: Union[Category, str]) -> Category:
+    """
+    Returns the registry's Category for a name (or for an existing Category's
+    name), creating it on first use. DataReader, the ORM conversions and the
+    repositories all go through here, so both backends hand out the same
+    instances.
+    """
+    name = category.name if isinstance(category, Category) else str(category).strip()
+    found = _registry.get(name)
+    if found is None:
+        found = _registry.setdefault(name, category if isinstance(category, Category) else Category(name))
+    return found
@@ -1,4 +1,17 @@
+from pantry.domainmodel.interning import intern_str
+
+
 class Ingredient:
+    __slots__ = (
+        "__name",
+        "__quantity",
+        "__unit",
+        "__categories",
+        "__range_min",
+        "__range_max",
+        "__step",
+    )
+
     def __init__(
         self,
         name: str,
@@ -11,7 +24,7 @@ class Ingredient:
     ):
         self.__name = name
         self.__quantity = quantity
-        self.__unit = unit
+        self.__unit = intern_str(unit)
         self.__categories = categories
         self.__range_min = range_min
         self.__range_max = range_max
@@ -58,7 +71,7 @@ class Ingredient:
 
     @unit.setter
     def unit(self, unit: str):
-        self.__unit = unit
+        self.__unit = intern_str(unit)
 
     @property
     def categories(self):
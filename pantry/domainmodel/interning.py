@@ -0,0 +1,9 @@
+import sys
+
+
+def intern_str(value):
+    # one shared object per distinct value for the small vocabularies that
+    # repeat across the catalog (units, categories, cuisines, tags); anything
+    # that isn't a str is returned unchanged
+    return sys.intern(value) if type(value) is str else value
+
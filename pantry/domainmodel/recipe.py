@@ -2,9 +2,28 @@ import string
 from typing import List, Tuple
 
 from pantry.domainmodel.ingredient import Ingredient
+from pantry.domainmodel.interning import intern_str
+from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine
 
 
 class Recipe:
+    __slots__ = (
+        "__id",
+        "__name",
+        "__description",
+        "__ingredients",
+        "__methods",
+        "__prep_time_mins",
+        "__cook_time_mins",
+        "__total_time_mins",
+        "__difficulty",
+        "__category",
+        "__cuisine",
+        "__tags",
+        "__notes",
+        "__image_url",
+    )
+
     def __init__(
         self,
         id: int,
@@ -25,15 +44,17 @@ class Recipe:
         self.__id = id
         self.__name = name
         self.__description = description
-        self.__ingredients = ingredients
-        self.__methods = methods
+        # parsed once here; the catalog is read-only, so the sequences are
+        # stored as (compact) tuples
+        self.__ingredients = _parse_lines(ingredients)
+        self.__methods = tuple(methods)
         self.__prep_time_mins = prep_time_mins
         self.__cook_time_mins = cook_time_mins
         self.__total_time_mins = total_time_mins
-        self.__difficulty = difficulty
-        self.__category = category
-        self.__cuisine = cuisine
-        self.__tags = tags
+        self.__difficulty = intern_str(difficulty)
+        self.__category = intern_str(category)
+        self.__cuisine = intern_str(cuisine)
+        self.__tags = tuple(intern_str(tag) for tag in tags)
         self.__notes = notes
         self.__image_url = image_url
 
@@ -66,11 +87,11 @@ class Recipe:
         return self.__description
 
     @property
-    def ingredients(self) -> List[Ingredient]:
+    def ingredients(self) -> Tuple[RecipeIngredientLine, ...]:
         return self.__ingredients
 
     @property
-    def methods(self) -> List[str]:
+    def methods(self) -> Tuple[str, ...]:
         return self.__methods
 
     @property
@@ -98,7 +119,7 @@ class Recipe:
         return self.__cuisine
 
     @property
-    def tags(self) -> List[str]:
+    def tags(self) -> Tuple[str, ...]:
         return self.__tags
 
     @property
@@ -108,3 +129,10 @@ class Recipe:
     @property
     def image_url(self) -> str:
         return self.__image_url
+
+
+def _parse_lines(entries) -> Tuple[RecipeIngredientLine, ...]:
+    if type(entries) is tuple and all(type(e) is RecipeIngredientLine for e in entries):
+        return entries
+    lines = (RecipeIngredientLine.parse(entry) for entry in entries)
+    return tuple(line for line in lines if line is not None)
@@ -0,0 +1,151 @@
+import re
+from typing import NamedTuple, Optional, Tuple
+
+from pantry.domainmodel.interning import intern_str
+
+# "1", "0.5", "1/2", "1 1/2", "½", "1½", optionally followed by a range end
+_NUMBER = r"(?:\d+(?:\.\d+)?(?:\s+\d+/\d+|\s*[½⅓⅔¼¾⅛])?|\d+/\d+|[½⅓⅔¼¾⅛])"
+_QUANTITY = re.compile(rf"^\s*({_NUMBER})\s*(?:(?:-|–|to)\s*({_NUMBER}))?\s*$")
+
+_VULGAR_FRACTIONS = {"½": 0.5, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 0.25, "¾": 0.75, "⅛": 0.125}
+
+# spelling variants seen in recipe data -> the unit shown and used for maths
+UNIT_ALIASES = {
+    "teaspoon": "tsp", "teaspoons": "tsp", "teaspoon(s)": "tsp", "tsp": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tablespoon(s)": "tbsp", "tbsp": "tbsp",
+    "cup": "cup", "cups": "cup", "cup(s)": "cup",
+    "g": "g", "gram": "g", "grams": "g", "gram(s)": "g",
+    "kg": "kg", "kilogram": "kg", "kilograms": "kg", "kilogram(s)": "kg",
+    "ml": "ml", "millilitre": "ml", "milliliter": "ml", "millilitres": "ml", "milliliters": "ml",
+    "l": "l", "litre": "l", "liter": "l", "litres": "l", "liters": "l",
+    "clove": "clove", "cloves": "clove", "clove(s)": "clove",
+    "stalk": "stalk", "stalks": "stalk", "stalk(s)": "stalk",
+    "sprig": "sprig", "sprigs": "sprig", "sprig(s)": "sprig",
+    "leaf": "leaf", "leaves": "leaf",
+    "rasher": "rasher", "rashers": "rasher",
+    "packet": "packet", "packets": "packet",
+    "bottle": "bottle", "bottles": "bottle",
+    "piece": "pieces", "pieces": "pieces",
+    "bunch": "bunches", "bunches": "bunches",
+}
+
+
+def normalize_unit(unit: str) -> str:
+    unit = (unit or "").strip()
+    return UNIT_ALIASES.get(unit.lower(), unit.lower())
+
+
+def _number(text: str) -> float:
+    text = text.strip()
+    if text in _VULGAR_FRACTIONS:
+        return _VULGAR_FRACTIONS[text]
+    if text[-1] in _VULGAR_FRACTIONS:
+        return float(text[:-1].strip()) + _VULGAR_FRACTIONS[text[-1]]
+    if "/" in text:
+        whole, _, fraction = text.rpartition(" ")
+        numerator, denominator = fraction.split("/")
+        value = int(numerator) / int(denominator)
+        return value + (float(whole) if whole else 0)
+    return float(text)
+
+
+def parse_quantity(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Returns (quantity, quantity_max) for a quantity string. Ranges such as
+    "900-1000" give both ends; a single amount gives (amount, None); text
+    that isn't a number (e.g. "Handful" or "") gives (None, None).
+    """
+    if not text:
+        return None, None
+    match = _QUANTITY.match(str(text))
+    if not match:
+        return None, None
+    low = _number(match.group(1))
+    high = _number(match.group(2)) if match.group(2) else None
+    return low, high
+
+
+def format_quantity(value: Optional[float]) -> str:
+    if value is None:
+        return ""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+class RecipeIngredientLine(NamedTuple):
+    """
+    One parsed line of a recipe's ingredient list.
+
+    Indexes 0-2 are (quantity_text, unit, name), as in the old string
+    triples. ``quantity`` is the numeric amount (the lower end of a range)
+    and ``quantity_max`` the upper end, or None.
+    """
+
+    quantity_text: str
+    unit: str
+    name: str
+    quantity: Optional[float] = None
+    quantity_max: Optional[float] = None
+
+    @classmethod
+    def create(cls, quantity_text, unit, name, quantity=None, quantity_max=None):
+        return cls(
+            intern_str(quantity_text), intern_str(normalize_unit(unit)), intern_str(name),
+            quantity, quantity_max,
+        )
+
+    @classmethod
+    def from_amount(cls, quantity: Optional[float], unit: str, name: str,
+                    quantity_max: Optional[float] = None) -> "RecipeIngredientLine":
+        # from stored numeric columns, no string parsing
+        quantity_text = format_quantity(quantity)
+        if quantity is not None and quantity_max is not None:
+            quantity_text += "-" + format_quantity(quantity_max)
+        return cls.create(quantity_text, unit, name, quantity, quantity_max)
+
+    @classmethod
+    def parse(cls, entry) -> Optional["RecipeIngredientLine"]:
+        """
+        Parses a (qty, unit, name) sequence, as read from recipes.csv, into a
+        line. Also accepts (name, qty, unit) sequences, lines (returned as
+        they are) and objects with name/quantity/unit attributes. Returns
+        None when there is nothing to parse.
+        """
+        if isinstance(entry, cls):
+            return entry
+        if not isinstance(entry, (tuple, list)):
+            if hasattr(entry, "name"):
+                quantity = getattr(entry, "quantity", None)
+                return cls.from_amount(
+                    float(quantity) if quantity not in (None, "") else None,
+                    getattr(entry, "unit", "") or "",
+                    entry.name.strip(),
+                )
+            return None
+
+        parts = [str(p).strip() for p in entry if p is not None]
+        if not any(parts):
+            return None
+        first = parts[0] if parts else ""
+        second = parts[1] if len(parts) > 1 else ""
+        quantity, quantity_max = parse_quantity(first)
+        if quantity is None and len(parts) > 1 and parse_quantity(second)[0] is not None:
+            # (name, qty, unit)
+            quantity, quantity_max = parse_quantity(second)
+            name, quantity_text = first, second
+            unit = parts[2] if len(parts) > 2 else ""
+            name = ", ".join([name] + [p for p in parts[3:] if p])
+        elif len(parts) == 1:
+            quantity_text, unit, name = "", "", first
+        elif len(parts) == 2:
+            # (qty, name) or (unit, name)
+            if quantity is not None:
+                quantity_text, unit, name = first, "", second
+            else:
+                quantity_text, unit, name = "", first, second
+        else:
+            quantity_text, unit = first, second
+            # names containing commas were split by the CSV reader
+            name = ", ".join(p for p in parts[2:] if p)
+        if not name:
+            name = parts[-1]
+        return cls.create(quantity_text, unit, name, quantity, quantity_max)
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def entry_name(entry) -> str:
+    # display name of a stored entry: [qty, unit, name] lists use the name,
+    # plain strings are their own name
+    if isinstance(entry, (list, tuple)) and len(entry) > 0:
+        return str(entry[2]) if len(entry) > 2 else str(entry[-1])
+    return str(entry)
+
+
+class RecipeIngredientSelections:
+    """
+    The ingredients a user has picked per recipe.
+
+    Keyed by case-folded recipe name; each recipe holds its entries in an
+    ordered dict keyed by case-folded ingredient name, so membership, add
+    and remove are O(1) and a batch costs O(batch). The first spelling of a
+    recipe name is kept for display. ``as_dict`` gives the plain
+    ``{recipe_name: [entry, ...]}`` view used by templates and JSON columns.
+    """
+
+    __slots__ = ("__recipes",)
+
+    def __init__(self, selections: Dict[str, Iterable[Any]] = None):
+        self.__recipes: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for recipe_name, entries in (selections or {}).items():
+            self.add_many(recipe_name, entries)
+
+    def __len__(self):
+        return len(self.__recipes)
+
+    def __contains__(self, recipe_name: str) -> bool:
+        return recipe_name.casefold() in self.__recipes
+
+    def __eq__(self, other):
+        if isinstance(other, RecipeIngredientSelections):
+            return self.as_dict() == other.as_dict()
+        return False
+
+    def recipe_names(self) -> List[str]:
+        return [name for name, _ in self.__recipes.values()]
+
+    def get(self, recipe_name: str) -> List[Any]:
+        found = self.__recipes.get(recipe_name.casefold())
+        return list(found[1].values()) if found else []
+
+    def add(self, recipe_name: str, entry) -> bool:
+        key = recipe_name.casefold()
+        if key not in self.__recipes:
+            self.__recipes[key] = (recipe_name, {})
+        entries = self.__recipes[key][1]
+        name_key = entry_name(entry).casefold()
+        if name_key in entries:
+            return False
+        entries[name_key] = entry
+        return True
+
+    def add_many(self, recipe_name: str, entries: Iterable[Any]) -> None:
+        for entry in entries:
+            self.add(recipe_name, entry)
+
+    def remove(self, recipe_name: str, ingredient) -> bool:
+        # ``ingredient`` is a name or a stored entry
+        key = recipe_name.casefold()
+        found = self.__recipes.get(key)
+        if not found:
+            return False
+        removed = found[1].pop(entry_name(ingredient).casefold(), None) is not None
+        if not found[1]:
+            del self.__recipes[key]
+        return removed
+
+    def remove_many(self, recipe_name: str, ingredients: Iterable[Any]) -> None:
+        key = recipe_name.casefold()
+        found = self.__recipes.get(key)
+        if not found:
+            return
+        for ingredient in ingredients:
+            found[1].pop(entry_name(ingredient).casefold(), None)
+        if not found[1]:
+            del self.__recipes[key]
+
+    def clear(self, recipe_name: str) -> None:
+        self.__recipes.pop(recipe_name.casefold(), None)
+
+    def clear_all(self) -> None:
+        self.__recipes = {}
+
+    def as_dict(self) -> Dict[str, List[Any]]:
+        return {name: list(entries.values()) for name, entries in self.__recipes.values()}
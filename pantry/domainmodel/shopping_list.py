@@ -0,0 +1,134 @@
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pantry.domainmodel.recipe_ingredient_line import normalize_unit
+from pantry.domainmodel.units import canonical_unit, display_amount
+
+
+class ShoppingItem(NamedTuple):
+    """
+    One consolidated shopping list entry, in canonical units (grams,
+    millilitres or a count). ``quantity`` is None when none of the
+    contributing lines gave an amount ("a handful"); ``quantity_max`` is the
+    upper total when a range contributed, else None.
+    """
+
+    name: str
+    quantity: Optional[float]
+    unit: str
+    quantity_max: Optional[float] = None
+
+    def display(self) -> str:
+        quantity, unit = display_amount(self.quantity, self.unit)
+        if self.quantity_max is not None and self.quantity_max != self.quantity:
+            high, high_unit = display_amount(self.quantity_max, self.unit)
+            if high_unit == unit:
+                quantity = f"{quantity}-{high}"
+            else:
+                quantity, unit = f"{quantity} {unit} - {high}", high_unit
+        if unit == "each":
+            unit = ""
+        return " ".join(part for part in (quantity, unit) if part)
+
+
+def consolidate(lines: Iterable) -> List[ShoppingItem]:
+    """
+    Adds up lines (RecipeIngredientLines, grocery Ingredients or anything
+    with name, quantity and unit attributes, plus an optional quantity_max)
+    into one ShoppingItem per ingredient and canonical unit, in a single
+    pass. Names are matched case-insensitively and the first spelling is
+    kept. Lines whose units can't be converted into each other (e.g.
+    "2 clove" and "1 each" garlic) stay separate items.
+    """
+    # key -> [name, low, high, has_amount, has_range]
+    totals: Dict[Tuple[str, str], list] = {}
+    conversions: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    for line in lines:
+        name, quantity, unit = line.name, line.quantity, line.unit or ""
+        name_key = name.casefold()
+        conversion = conversions.get((unit, name_key))
+        if conversion is None:
+            conversion = conversions[(unit, name_key)] = canonical_unit(unit, name)
+        canonical, factor = conversion
+
+        total = totals.get((name_key, canonical))
+        if total is None:
+            total = totals[(name_key, canonical)] = [name, 0.0, 0.0, False, False]
+        if quantity is None:
+            continue
+        high = getattr(line, "quantity_max", None)
+        total[1] += quantity * factor
+        total[2] += (high if high is not None else quantity) * factor
+        total[3] = True
+        total[4] = total[4] or high is not None
+
+    return [
+        ShoppingItem(name, low if has_amount else None, unit, high if has_range else None)
+        for (_, unit), (name, low, high, has_amount, has_range) in totals.items()
+    ]
+
+
+class PlannedPurchase(NamedTuple):
+    """
+    What to buy for one ShoppingItem once on-hand stock is taken off.
+
+    ``needed``, ``on_hand`` and ``shortfall`` are in the item's canonical
+    ``unit``; ``purchase``/``purchase_unit`` is the shortfall in the unit the
+    ingredient is sold in, rounded up to its ``step``. ``purchase`` is None
+    when the recipes didn't give an amount.
+    """
+
+    name: str
+    needed: Optional[float]
+    on_hand: float
+    shortfall: Optional[float]
+    unit: str
+    purchase: Optional[float]
+    purchase_unit: str
+
+
+def _round_up(quantity: float, step: float) -> float:
+    # a small tolerance keeps float noise (e.g. 3.0000000001 kg) from
+    # buying a whole extra step
+    steps = math.ceil(quantity / step - 1e-9)
+    return steps * step
+
+
+def plan_purchases(demand: Iterable[ShoppingItem], on_hand: Iterable, catalog) -> List[PlannedPurchase]:
+    """
+    Takes what is on hand off each demanded item and rounds the rest up to
+    what can be bought.
+
+    ``demand`` is consolidated ShoppingItems (ranges count at their upper
+    end), ``on_hand`` lines in any unit (consolidated the same way), and
+    ``catalog`` a callable returning the catalog Ingredient for a name, or
+    None. Shortfalls are converted to the catalog ingredient's unit and
+    rounded up to its step; ingredients the catalog doesn't know, or sells
+    in a unit the shortfall can't be converted to, are bought in the
+    canonical unit as they are. Items fully covered by stock are left out.
+    """
+    stock: Dict[Tuple[str, str], float] = {
+        (item.name.casefold(), item.unit): item.quantity or 0.0 for item in consolidate(on_hand)
+    }
+    plan = []
+    for item in demand:
+        have = stock.get((item.name.casefold(), item.unit), 0.0)
+        if item.quantity is None:
+            if not have:
+                plan.append(PlannedPurchase(item.name, None, 0.0, None, item.unit, None, item.unit))
+            continue
+        needed = item.quantity_max if item.quantity_max is not None else item.quantity
+        shortfall = needed - have
+        if shortfall <= 1e-9:
+            continue
+
+        purchase, purchase_unit = round(shortfall, 2), item.unit
+        ingredient = catalog(item.name)
+        if ingredient is not None:
+            canonical, factor = canonical_unit(ingredient.unit, item.name)
+            if canonical == item.unit:
+                purchase_unit = normalize_unit(ingredient.unit)
+                purchase = _round_up(shortfall / factor, ingredient.step or 1)
+        plan.append(PlannedPurchase(item.name, needed, have, shortfall, item.unit, purchase, purchase_unit))
+    return plan
@@ -0,0 +1,86 @@
+from typing import Dict, Optional, Tuple
+
+from pantry.domainmodel.recipe_ingredient_line import format_quantity, normalize_unit
+
+GRAM = "g"
+MILLILITRE = "ml"
+EACH = "each"
+
+# unit -> (canonical unit, factor to it). Volumes are metric (1 cup = 250 ml),
+# as in the recipe data.
+UNITS: Dict[str, Tuple[str, float]] = {
+    "mg": (GRAM, 0.001),
+    "g": (GRAM, 1.0),
+    "kg": (GRAM, 1000.0),
+    "oz": (GRAM, 28.349523125),
+    "lb": (GRAM, 453.59237),
+    "ml": (MILLILITRE, 1.0),
+    "l": (MILLILITRE, 1000.0),
+    "tsp": (MILLILITRE, 5.0),
+    "tbsp": (MILLILITRE, 15.0),
+    "cup": (MILLILITRE, 250.0),
+    # plain counts; other count units (clove, bottle, ...) are their own
+    # canonical unit and only add up with themselves
+    "": (EACH, 1.0),
+    "each": (EACH, 1.0),
+    "whole": (EACH, 1.0),
+    "medium": (EACH, 1.0),
+    "pieces": (EACH, 1.0),
+    "unit": (EACH, 1.0),
+}
+
+# grams per millilitre, by case-folded ingredient name; volumes of these are
+# converted to mass so they add up with amounts bought by weight
+DENSITIES: Dict[str, float] = {
+    "water": 1.0,
+    "milk": 1.03,
+    "cream": 1.01,
+    "yogurt": 1.03,
+    "butter": 0.91,
+    "flour": 0.53,
+    "plain flour": 0.53,
+    "self-raising flour": 0.53,
+    "sugar": 0.85,
+    "brown sugar": 0.83,
+    "icing sugar": 0.56,
+    "rice": 0.85,
+    "honey": 1.42,
+    "olive oil": 0.91,
+    "vegetable oil": 0.92,
+    "salt": 1.2,
+    "rolled oats": 0.41,
+    "cocoa powder": 0.42,
+}
+
+# canonical unit -> (larger unit, its size) used for display
+_DISPLAY_UNITS = {GRAM: ("kg", 1000.0), MILLILITRE: ("l", 1000.0)}
+
+
+def canonical_unit(unit: str, name: str = "") -> Tuple[str, float]:
+    """
+    Returns (canonical unit, factor) for ``unit``: mass in grams, volume in
+    millilitres (or grams when ``name`` has a density override) and counts
+    in "each". Units not in the table are their own canonical unit.
+    """
+    unit = normalize_unit(unit)
+    canonical, factor = UNITS.get(unit, (unit, 1.0))
+    if canonical == MILLILITRE:
+        density = DENSITIES.get(name.casefold())
+        if density is not None:
+            return GRAM, factor * density
+    return canonical, factor
+
+
+def to_canonical(quantity: Optional[float], unit: str, name: str = "") -> Tuple[Optional[float], str]:
+    canonical, factor = canonical_unit(unit, name)
+    return (quantity * factor if quantity is not None else None), canonical
+
+
+def display_amount(quantity: Optional[float], unit: str) -> Tuple[str, str]:
+    # (quantity text, unit) for a canonical amount, e.g. 1500 g -> ("1.5", "kg")
+    if quantity is None:
+        return "", unit
+    larger = _DISPLAY_UNITS.get(unit)
+    if larger is not None and quantity >= larger[1]:
+        quantity, unit = quantity / larger[1], larger[0]
+    return format_quantity(round(quantity, 2)), unit
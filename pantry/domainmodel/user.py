@@ -1,11 +1,23 @@
-from typing import List, Tuple, Dict, Any
+import copy
+from typing import List, Tuple, Dict, Any, Optional, Union
 
 from wtforms.validators import none_of
 
 from pantry.domainmodel.ingredient import Ingredient
+from pantry.domainmodel.recipe_selections import RecipeIngredientSelections
 
 
 class User:
+    __slots__ = (
+        "__user_id",
+        "__username",
+        "__email",
+        "__password_hash",
+        "__groceries",
+        "__recipe_ingredients",
+        "__saved_recipes",
+    )
+
     def __init__(
         self, user_id: int, username: str, email: str, password_hash: str = None
     ):
@@ -13,8 +25,9 @@ class User:
         self.__username = username
         self.__email = email
         self.__password_hash = password_hash
-        self.__grocery_list: List[Ingredient] = []
-        self.__recipe_ingredients: Dict[str, List[str]] = {}
+        # case-folded ingredient name -> Ingredient, in the order added
+        self.__groceries: Dict[str, Ingredient] = {}
+        self.__recipe_ingredients = RecipeIngredientSelections()
         self.__saved_recipes: List[int] = []
 
     def __repr__(self):
@@ -37,8 +50,9 @@ class User:
         return self.__password_hash
 
     @property
-    def grocery_list(self):
-        return self.__grocery_list
+    def grocery_list(self) -> List[Ingredient]:
+        # a snapshot; change the list through add_grocery/remove_grocery
+        return list(self.__groceries.values())
 
     @username.setter
     def username(self, username: str):
@@ -49,100 +63,57 @@ class User:
         self.__email = email
 
     def add_grocery(self, item: Ingredient, quantity: int) -> None:
-        ing = item
+        key = item.name.casefold()
+        existing_ing = self.__groceries.get(key)
+        if existing_ing is not None:
+            existing_ing.quantity += quantity
+            return
+        # keep our own copy: the caller's ingredient is often the catalog's
+        ing = copy.copy(item)
         ing.quantity = quantity
+        self.__groceries[key] = ing
 
-        for existing_ing in self.__grocery_list:
-            if existing_ing == ing:
-                existing_ing.quantity += quantity
-                return
+    def get_grocery(self, name: str) -> Optional[Ingredient]:
+        return self.__groceries.get(name.casefold())
 
-        self.__grocery_list.append(ing)
-
-    def remove_grocery(self, item: Ingredient) -> None:
-        self.__grocery_list = [ing for ing in self.__grocery_list if ing != item]
+    def remove_grocery(self, item: Union[Ingredient, str]) -> Optional[Ingredient]:
+        # accepts the ingredient or its name; returns what was removed
+        name = item.name if isinstance(item, Ingredient) else str(item)
+        return self.__groceries.pop(name.casefold(), None)
 
     @property
     def recipe_ingredients(self) -> Dict[str, List[str]]:
-        return self.__recipe_ingredients
+        # a {recipe_name: [entry, ...]} snapshot for templates and storage;
+        # change it through the methods below
+        return self.__recipe_ingredients.as_dict()
+
+    def get_recipe_ingredients(self, recipe_name) -> List:
+        return self.__recipe_ingredients.get(recipe_name)
 
     def add_recipe_ingredient(self, recipe_name, ingredient_string: str) -> None:
-        found_key = None
-        for k in self.__recipe_ingredients.keys():
-            if k.lower() == recipe_name.lower():
-                found_key = k
-                break
-        if not found_key:
-            found_key = recipe_name
-            self.__recipe_ingredients[found_key] = []
-
-        if isinstance(ingredient_string, (list, tuple)) and len(ingredient_string) > 0:
-            disp = str(ingredient_string[2]) if len(ingredient_string) > 2 else str(ingredient_string[-1])
-        else:
-            disp = str(ingredient_string)
-        disp_l = disp.lower()
-
-        for existing in self.__recipe_ingredients[found_key]:
-            if isinstance(existing, (list, tuple)):
-                name = existing[2] if len(existing) > 2 else str(existing[-1])
-            else:
-                name = str(existing)
-            if name.lower() == disp_l:
-                return
-
-        self.__recipe_ingredients[found_key].append(ingredient_string)
+        self.__recipe_ingredients.add(recipe_name, ingredient_string)
 
     def remove_recipe_ingredient(self, recipe_name, ingredient_string: str) -> None:
-        found_key = None
-        for k in list(self.__recipe_ingredients.keys()):
-            if k.lower() == recipe_name.lower():
-                found_key = k
-                break
-        if not found_key:
-            return
-
-        target_l = str(ingredient_string).lower()
-        def _keep(ing):
-            if isinstance(ing, (list, tuple)) and len(ing) > 0:
-                name = existing_name = (ing[2] if len(ing) > 2 else str(ing[-1]))
-                return name.lower() != target_l
-            else:
-                return str(ing).lower() != target_l
-
-        self.__recipe_ingredients[found_key] = [ing for ing in self.__recipe_ingredients[found_key] if _keep(ing)]
-        if not self.__recipe_ingredients[found_key]:
-            del self.__recipe_ingredients[found_key]
+        self.__recipe_ingredients.remove(recipe_name, ingredient_string)
 
     def add_multiple_recipe_ingredients(
         self, recipe_name, ingredient_strings: List[str]
     ) -> None:
-        for string in ingredient_strings:
-            self.add_recipe_ingredient(recipe_name, string)
+        self.__recipe_ingredients.add_many(recipe_name, ingredient_strings)
 
     def remove_multiple_recipe_ingredients(
         self, recipe, ingredient_strings: List[str]
     ) -> None:
-        found_key = None
-        for k in list(self.__recipe_ingredients.keys()):
-            if k.lower() == recipe.lower():
-                found_key = k
-                break
-        if not found_key:
-            return
-        for s in ingredient_strings:
-            self.remove_recipe_ingredient(recipe, s)
+        self.__recipe_ingredients.remove_many(recipe, ingredient_strings)
 
     def clear_recipe_ingredients_by_recipe(self, recipe_name) -> None:
-        for k in list(self.__recipe_ingredients.keys()):
-            if k.lower() == recipe_name.lower():
-                del self.__recipe_ingredients[k]
-                break
+        self.__recipe_ingredients.clear(recipe_name)
 
     def delete_recipe_ingredients_per_recipe(self, recipe_name):
         self.clear_recipe_ingredients_by_recipe(recipe_name)
 
     def clear_all_recipe_ingredients(self) -> None:
-        self.__recipe_ingredients = {}
+        self.__recipe_ingredients.clear_all()
 
     @property
     def saved_recipes(self):
@@ -0,0 +1,12 @@
+document.addEventListener('DOMContentLoaded',function(){const carousel=document.querySelector('.carousel-slide');if(!carousel)return;carousel.addEventListener('click',()=>{window.location='/recipes';});const inner=carousel.querySelector('.carousel-inner');const items=Array.from(inner.querySelectorAll('.carousel-item'));if(items.length===0)return;let currentIndex=0;let isTransitioning=false;let autoPlayInterval;const firstClone=items[0].cloneNode(true);const lastClone=items[items.length - 1].cloneNode(true);firstClone.classList.remove('active');lastClone.classList.remove('active');inner.appendChild(firstClone);inner.insertBefore(lastClone,items[0]);const allItems=Array.from(inner.querySelectorAll('.carousel-item'));const totalSlides=allItems.length;currentIndex=1;inner.style.transform=`translateX(-${currentIndex * 100}%)`;function goToSlide(index,withTransition=true){if(isTransitioning&&withTransition)return;if(withTransition){isTransitioning=true;inner.style.transition='transform 0.5s ease-in-out';}else{inner.style.transition='none';}
+inner.style.transform=`translateX(-${index * 100}%)`;currentIndex=index;allItems.forEach(item=>item.classList.remove('active'));allItems[currentIndex].classList.add('active');if(!withTransition){setTimeout(()=>{inner.style.transition='transform 0.5s ease-in-out';},50);}}
+function handleTransitionEnd(){if(currentIndex===totalSlides - 1){currentIndex=1;goToSlide(currentIndex,false);}
+else if(currentIndex===0){currentIndex=totalSlides - 2;goToSlide(currentIndex,false);}
+isTransitioning=false;}
+inner.addEventListener('transitionend',handleTransitionEnd);function nextSlide(){if(isTransitioning)return;goToSlide(currentIndex + 1);}
+function prevSlide(){if(isTransitioning)return;goToSlide(currentIndex - 1);}
+function startAutoPlay(){autoPlayInterval=setInterval(nextSlide,4000);}
+function stopAutoPlay(){if(autoPlayInterval){clearInterval(autoPlayInterval);}}
+function resetAutoPlay(){stopAutoPlay();startAutoPlay();}
+startAutoPlay();let resizeTimer;window.addEventListener('resize',()=>{clearTimeout(resizeTimer);resizeTimer=setTimeout(()=>{inner.style.transition='none';inner.style.transform=`translateX(-${currentIndex * 100}%)`;setTimeout(()=>{inner.style.transition='transform 0.5s ease-in-out';},50);},250);});});;
+document.addEventListener("DOMContentLoaded",()=>{const titleButton=document.querySelector(".hero-section");titleButton.addEventListener("click",()=>{window.location.href="/recipes";});const viewRecipesButton=document.querySelector(".view-recipes-button");viewRecipesButton.addEventListener("click",()=>{window.location.href="/recipes";});const shoppingNavButton=document.querySelector(".shopping-nav-button");const ingredientsGrid=document.querySelector(".ingredients-grid");const isTouchScreen='ontouchstart' in document.documentElement;if(!isTouchScreen){ingredientsGrid.addEventListener('mouseenter',()=>{shoppingNavButton.classList.add("visible");});ingredientsGrid.addEventListener('mouseleave',()=>{shoppingNavButton.classList.remove("visible");});shoppingNavButton.addEventListener("click",()=>{window.location.href="/inventory";});shoppingNavButton.addEventListener('mouseenter',()=>{shoppingNavButton.classList.add("visible");});}else{shoppingNavButton.classList.add("visible");shoppingNavButton.addEventListener("click",()=>{window.location.href="/inventory";});}});
@@ -0,0 +1,48 @@
+document.addEventListener('DOMContentLoaded',function(){const resetButton=document.querySelector('.reset-button');const searchInput=document.querySelector('.search-input');const searchFilter=document.querySelector('.search-filter');const searchButton=document.querySelector('.search-button');const suggestionList=document.querySelector('.search-suggestions');if(resetButton&&searchInput){resetButton.addEventListener('click',function(e){e.preventDefault();searchInput.value='';if(searchFilter){searchFilter.value='name';}
+searchButton.click();});}
+if(!searchInput||!suggestionList||!searchInput.dataset.suggestUrl){return;}
+const debounceMs=120;let debounceTimer=null;let latestQuery='';let activeIndex=-1;function hideSuggestions(){suggestionList.classList.add('hidden');suggestionList.innerHTML='';activeIndex=-1;}
+function recipeUrl(name){return `/recipes/${encodeURIComponent(name.toLowerCase().split(' ').join('-'))}`;}
+function chooseSuggestion(suggestion){if(suggestion.type==='recipe'){window.location.href=recipeUrl(suggestion.name);return;}
+searchInput.value=suggestion.name;if(searchFilter){searchFilter.value='name';}
+hideSuggestions();searchButton.click();}
+function renderSuggestions(suggestions){suggestionList.innerHTML='';activeIndex=-1;if(!suggestions.length){suggestionList.classList.add('hidden');return;}
+suggestions.forEach(suggestion=>{const item=document.createElement('li');item.className='search-suggestion';item.setAttribute('role','option');const name=document.createElement('span');name.className='search-suggestion-name';name.textContent=suggestion.name;const kind=document.createElement('span');kind.className='search-suggestion-type';kind.textContent=suggestion.type;item.append(name,kind);item.addEventListener('mousedown',function(e){e.preventDefault();chooseSuggestion(suggestion);});item.suggestion=suggestion;suggestionList.appendChild(item);});suggestionList.classList.remove('hidden');}
+function fetchSuggestions(query){latestQuery=query;fetch(`${searchInput.dataset.suggestUrl}?q=${encodeURIComponent(query)}`,{headers:{'Accept':'application/json'},credentials:'same-origin'})
+.then(res=>{if(!res.ok)throw new Error('Network response was not ok');return res.json();})
+.then(data=>{if(data.query===latestQuery){renderSuggestions(data.suggestions||[]);}})
+.catch(error=>{console.error('Error fetching suggestions:',error);hideSuggestions();});}
+searchInput.addEventListener('input',function(){const query=searchInput.value.trim();clearTimeout(debounceTimer);if(!query){latestQuery='';hideSuggestions();return;}
+debounceTimer=setTimeout(()=>fetchSuggestions(query),debounceMs);});searchInput.addEventListener('keydown',function(e){const items=suggestionList.querySelectorAll('.search-suggestion');if(!items.length)return;if(e.key==='ArrowDown'||e.key==='ArrowUp'){e.preventDefault();const step=e.key==='ArrowDown'?1:-1;activeIndex=(activeIndex + step + items.length)% items.length;items.forEach((item,i)=>item.classList.toggle('active',i===activeIndex));}else if(e.key==='Enter'&&activeIndex>=0){e.preventDefault();chooseSuggestion(items[activeIndex].suggestion);}else if(e.key==='Escape'){hideSuggestions();}});searchInput.addEventListener('blur',hideSuggestions);});;
+document.addEventListener('DOMContentLoaded',function(){const inventoryCards=document.querySelectorAll('.inventory-card');const ingredientPage=document.querySelector('.ingredient-page-container');const ingredientCloseButton=document.querySelector('.close-ingredient-page-button');function attachInnerHTML(data){if(ingredientPage){ingredientPage.innerHTML=`
+                <div class="ingredient-page-backdrop"></div>
+                <div class="ingredient-page-content">
+                    <button class="close-ingredient-page-button" aria-label="Close ingredient details">
+                        <svg width="24" height="24" viewBox="0 0 24 24" 
+                             stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                            <line x1="18" y1="6" x2="6" y2="18"/>
+                            <line x1="6" y1="6" x2="18" y2="18"/>
+                        </svg>
+                    </button>
+                    <div class="ingredient-page-inner-content">
+                        <h2 class="ingredient-page-name">${data.name}</h2>
+                        <p class="ingredient-page-category">Categories: <span>${data.categories||'N/A'}</span></p>
+                        <form class="ingredient-page-quantity-form" method="POST" action="/inventory/update/${data.name}">
+                            <label for="quantity"></label>
+                            <input type="range" id="quantity" name="quantity" value="${data.quantity||0}" min="${data.range_min}" max="${data.range_max}" step="${data.step}" required />
+                            <span id="quantity-value">${data.quantity||0} ${data.unit||''}</span>
+                            <button type="submit" class="update-quantity-button">Add To List</button>
+                        </form>
+                    </div>
+                </div>`;ingredientPage.classList.remove('hidden');document.body.classList.add('modal-open');const newCloseButton=ingredientPage.querySelector('.close-ingredient-page-button');const backdrop=ingredientPage.querySelector('.ingredient-page-backdrop');const quantityInput=ingredientPage.querySelector('#quantity');const quantityValue=ingredientPage.querySelector('#quantity-value');if(quantityInput&&quantityValue){const getPercent=(val)=>{const min=parseFloat(quantityInput.min)||0;const max=parseFloat(quantityInput.max)||100;const value=parseFloat(val)||0;if(max===min)return 0;return((value - min)/(max - min))* 100;};const updateTrack=(val)=>{const pct=getPercent(val);quantityInput.style.setProperty('--pct',pct + '%');};const updateDisplay=(val)=>{updateTrack(val);quantityValue.textContent=`${val} ${data.unit||''}`;};updateDisplay(quantityInput.value);quantityInput.addEventListener('input',(e)=>updateDisplay(e.target.value));quantityInput.addEventListener('change',(e)=>updateDisplay(e.target.value));}
+const quantityForm=ingredientPage.querySelector('.ingredient-page-quantity-form');if(quantityForm){quantityForm.addEventListener('submit',(e)=>{e.preventDefault();const quantity=quantityInput.value;const itemName=data.name;const payload={quantity:quantity,unit:data.unit};console.log('Sending payload:',payload);fetch(`/inventory/update/${itemName}`,{method:'POST',headers:{'Content-Type':'application/json','Accept':'application/json'},body:JSON.stringify(payload)})
+.then(res=>{console.log('Response status:',res.status);return res.json();})
+.then(response=>{console.log('Server response:',response);if(response.success){closeModal();addSuccessToast(`Successfully added ${quantity} ${data.unit||''} of ${itemName} to your grocery list.`);}else{alert(`Error: ${response.message||'Failed to update quantity'}`);}})
+.catch(error=>{console.error('Error updating quantity:',error);alert('Error updating quantity. Please try again.');});});}
+const addSuccessToast=(message)=>{const existingToast=document.querySelector('.toast');if(existingToast)existingToast.remove();const toast=document.createElement('div');toast.className='toast success-toast';toast.textContent=message;document.body.appendChild(toast);const removeToast=()=>{if(toast&&toast.parentNode){toast.remove();}};const fadeDuration=300;setTimeout(()=>{toast.classList.add('fade-out');toast.addEventListener('transitionend',removeToast,{once:true});setTimeout(removeToast,fadeDuration + 200);},3000);};const closeModal=()=>{ingredientPage.classList.add('hidden');document.body.classList.remove('modal-open');};if(newCloseButton)newCloseButton.addEventListener('click',closeModal);if(backdrop)backdrop.addEventListener('click',closeModal);}}
+inventoryCards.forEach(card=>{card.addEventListener('click',function(){const itemName=this.id;console.log('Clicked item:',itemName);fetch(`/inventory/api/${itemName}`)
+.then(res=>res.json())
+.then(data=>{console.log('Item data:',data);attachInnerHTML(data);})
+.catch(error=>{console.error('Error fetching item data:',error);});});});if(ingredientCloseButton&&ingredientPage){console.log("Close button pressed")
+ingredientCloseButton.addEventListener('click',function(){if(!ingredientPage.className.includes("hidden")){ingredientPage.classList.add("hidden");}});}
+document.addEventListener('keydown',(e)=>{if(e.key==='Escape'&&ingredientPage&&!ingredientPage.className.includes("hidden")){ingredientPage.classList.add("hidden");}})});
@@ -0,0 +1,33 @@
+document.addEventListener("DOMContentLoaded",function(){const recipeSidebar=document.querySelector(".recipe-sidebar")
+const windowWidth=window.innerWidth;const windowHeight=window.innerHeight;let currentScroll=window.scrollY;let maxScroll=document.documentElement.scrollHeight - windowHeight;const breakpoint=850;function attachSidebarButton(button){button.innerHTML=`
+        <svg width="24" height="24" viewBox="0 0 24 24" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+            <line x1="3" y1="12" x2="21" y2="12"/>
+            <line x1="3" y1="6" x2="21" y2="6"/>
+            <line x1="3" y1="18" x2="21" y2="18"/>
+        </svg>`;recipeSidebar.innerHTML +=`
+        <button class="close-sidebar-button" aria-label="Close Sidebar">
+            <svg width="24" height="24" viewBox="0 0 24 24" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                <line x1="18" y1="6" x2="6" y2="18"/>
+                <line x1="6" y1="6" x2="18" y2="18"/>
+            </svg>
+        </button>`;}
+if(windowWidth<=breakpoint&&recipeSidebar){const sidebarToggleButton=document.querySelector(".sidebar-toggle-button.hidden");sidebarToggleButton.classList.toggle("hidden")
+attachSidebarButton(sidebarToggleButton)
+const closeSidebarButton=document.querySelector(".close-sidebar-button");closeSidebarButton.addEventListener("click",function(){sidebarToggleButton.click();});let _savedScrollY=0;sidebarToggleButton.addEventListener("click",function(){const recipeDetail=document.querySelector(".recipe-detail-container");const isNowBlurred=recipeDetail.classList.toggle("blurred");recipeSidebar.classList.toggle("hidden");if(isNowBlurred){_savedScrollY=window.scrollY||window.pageYOffset||0;document.body.style.top=`-${_savedScrollY}px`;document.body.classList.add('scroll-locked');}else{document.body.classList.remove('scroll-locked');document.body.style.top='';window.scrollTo(0,_savedScrollY);}});recipeSidebar.classList.toggle("hidden");}
+if(windowWidth>breakpoint&&recipeSidebar){window.addEventListener("scroll",function(){currentScroll=window.scrollY - 1;maxScroll=document.documentElement.scrollHeight - window.innerHeight;if(recipeSidebar){let scrollProgress=(currentScroll /(maxScroll + 1))*(document.body.scrollHeight - recipeSidebar.scrollHeight - 140);recipeSidebar.style.transform=`translateY(${Math.trunc(scrollProgress)}px)`;}});}
+const ingredientSubmitButton=document.querySelector(".btn.btn-primary");if(ingredientSubmitButton){ingredientSubmitButton.addEventListener("click",function(e){e.preventDefault();const checkedBoxes=Array.from(document.querySelectorAll(".ingredient-check:checked"));if(checkedBoxes.length===0){return;}
+const ingredients=checkedBoxes.map(cb=>{const li=cb.closest("li");const nameEl=li.querySelector(".ingredient-name");const name=nameEl?nameEl.textContent.trim():"";const qtyEl=li.querySelector(".ingredient-qty");const qty=qtyEl?qtyEl.textContent.trim():"";const unitEl=li.querySelector(".ingredient-unit");const unit=unitEl?unitEl.textContent.trim():"";return `${qty};;${unit};;${name}`;});const formAction=ingredientSubmitButton.datasetAction||window.location.href;const fd=new FormData();ingredients.forEach(value=>fd.append('ingredients[]',value));fd.append('ajax','1');ingredientSubmitButton.disabled=true;const originalText=ingredientSubmitButton.textContent;ingredientSubmitButton.textContent='Adding...';const headers={'Accept':'application/json','X-Requested-With':'XMLHttpRequest'};const csrfMeta=document.querySelector('meta[name="csrf-token"]');if(csrfMeta)headers['X-CSRF-Token']=csrfMeta.getAttribute('content')||'';fetch(formAction,{method:'POST',headers:headers,body:fd,credentials:'same-origin'})
+.then(res=>{if(!res.ok)throw res;const ct=res.headers.get('content-type')||'';if(ct.includes('application/json'))return res.json();return Promise.resolve({ok:true});})
+.then(data=>{const count=ingredients.length;const msg=(data&&data.message)?data.message:`${count} ingredient${count===1?'':'s'} added to shopping list`;if(typeof addSuccessToast==='function')addSuccessToast(msg);checkedBoxes.forEach(cb=>cb.checked=false);ingredientSubmitButton.disabled=false;ingredientSubmitButton.textContent=originalText;})
+.catch(err=>{if(err&&typeof err.text==='function'){err.text().then(t=>{console.error('Error adding ingredients:',t);alert('Error adding ingredients: ' +(t||'server error'));}).catch(()=>alert('Error adding ingredients'));}else{console.error('Error adding ingredients:',err);alert('Error adding ingredients. Please try again.');}
+ingredientSubmitButton.disabled=false;ingredientSubmitButton.textContent=originalText;});});}
+const ingredientClearButton=document.getElementById('clear-all-ingredients');if(ingredientClearButton){ingredientClearButton.addEventListener("click",function(e){e.preventDefault();const checkedBoxes=document.querySelectorAll(".ingredient-check:checked");if(checkedBoxes.length===0){return;}
+checkedBoxes.forEach(cb=>cb.checked=false);const form=document.createElement('form');form.method='POST';const parentForm=document.getElementById('ingredients-form');form.action=ingredientClearButton.datasetAction||(parentForm?parentForm.action:window.location.href);document.body.appendChild(form);form.submit();});}
+const backButton=document.querySelector(".back-button");if(backButton){backButton.addEventListener("click",function(){window.location.href='/recipes';});}
+const saveButton=document.querySelector(".save-recipe-button");if(saveButton){saveButton.addEventListener("click",function(){const rawName=saveButton.dataset?saveButton.dataset.recipeName:saveButton.getAttribute('data-recipe-name');if(!rawName){console.error('Save button missing data-recipe-name');return;}
+const recipeName=encodeURIComponent(rawName);const headers={'Content-Type':'application/json'};const csrfMeta=document.querySelector('meta[name="csrf-token"]');if(csrfMeta){headers['X-CSRF-Token']=csrfMeta.getAttribute('content')||'';}
+fetch(`/recipes/toggle_save/${recipeName}`,{method:'POST',headers:headers,})
+.then(response=>response.json())
+.then(data=>{if(data.saved){saveButton.classList.add("saved");saveButton.innerText="Unsave Recipe";saveButton.setAttribute('aria-pressed','true');if(typeof addSuccessToast==='function')addSuccessToast('Recipe saved');}else{saveButton.classList.remove("saved");saveButton.innerText="Save Recipe";saveButton.setAttribute('aria-pressed','false');if(typeof addSuccessToast==='function')addSuccessToast('Recipe removed from saved recipes');if(data.recipe_name){window.location.href=`/recipes/${data.recipe_name}`;}}})
+.catch(error=>{console.error('Error:',error);if(typeof addSuccessToast==='function')addSuccessToast('Error saving recipe');});});}
+const addSuccessToast=(message)=>{const existingToast=document.querySelector('.toast');if(existingToast)existingToast.remove();const toast=document.createElement('div');toast.className='toast success-toast';toast.textContent=message;document.body.appendChild(toast);const removeToast=()=>{if(toast&&toast.parentNode){toast.remove();}};const fadeDuration=300;setTimeout(()=>{toast.classList.add('fade-out');toast.addEventListener('transitionend',removeToast,{once:true});setTimeout(removeToast,fadeDuration + 200);},3000);};});
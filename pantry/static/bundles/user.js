@@ -0,0 +1 @@
+document.addEventListener("DOMContentLoaded",function(){const defaultPfpContainer=document.querySelector(".default-pfp-container");defaultPfpContainer.style.backgroundColor="hsl(" + Math.floor(Math.random()* 360)+ ", 100%, 75%)";const recipeCards=document.querySelectorAll(".saved-recipe-item");recipeCards.forEach(card=>{const recipeId=card.getAttribute("id");card.addEventListener("click",function(){window.location.href=`/recipes/${recipeId}`;});});const groceryListCard=document.querySelector(".shopping-list-preview-card");groceryListCard.addEventListener("click",function(){window.location.href="/shopping";});});
@@ -3,6 +3,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const searchInput = document.querySelector('.search-input');
     const searchFilter = document.querySelector('.search-filter');
     const searchButton = document.querySelector('.search-button');
+    const suggestionList = document.querySelector('.search-suggestions');
 
     if (resetButton && searchInput) {
         resetButton.addEventListener('click', function(e) {
@@ -14,5 +15,120 @@ document.addEventListener('DOMContentLoaded', function() {
             searchButton.click();
         });
     }
-});
 
+    // Typeahead suggestions (ingredient and recipe names)
+    if (!searchInput || !suggestionList || !searchInput.dataset.suggestUrl) {
+        return;
+    }
+
+    const debounceMs = 120;
+    let debounceTimer = null;
+    let latestQuery = '';
+    let activeIndex = -1;
+
+    function hideSuggestions() {
+        suggestionList.classList.add('hidden');
+        suggestionList.innerHTML = '';
+        activeIndex = -1;
+    }
+
+    function recipeUrl(name) {
+        return `/recipes/${encodeURIComponent(name.toLowerCase().split(' ').join('-'))}`;
+    }
+
+    function chooseSuggestion(suggestion) {
+        if (suggestion.type === 'recipe') {
+            window.location.href = recipeUrl(suggestion.name);
+            return;
+        }
+        searchInput.value = suggestion.name;
+        if (searchFilter) {
+            searchFilter.value = 'name';
+        }
+        hideSuggestions();
+        searchButton.click();
+    }
+
+    function renderSuggestions(suggestions) {
+        suggestionList.innerHTML = '';
+        activeIndex = -1;
+        if (!suggestions.length) {
+            suggestionList.classList.add('hidden');
+            return;
+        }
+        suggestions.forEach(suggestion => {
+            const item = document.createElement('li');
+            item.className = 'search-suggestion';
+            item.setAttribute('role', 'option');
+
+            const name = document.createElement('span');
+            name.className = 'search-suggestion-name';
+            name.textContent = suggestion.name;
+            const kind = document.createElement('span');
+            kind.className = 'search-suggestion-type';
+            kind.textContent = suggestion.type;
+            item.append(name, kind);
+
+            // mousedown fires before the input loses focus
+            item.addEventListener('mousedown', function(e) {
+                e.preventDefault();
+                chooseSuggestion(suggestion);
+            });
+            item.suggestion = suggestion;
+            suggestionList.appendChild(item);
+        });
+        suggestionList.classList.remove('hidden');
+    }
+
+    function fetchSuggestions(query) {
+        latestQuery = query;
+        fetch(`${searchInput.dataset.suggestUrl}?q=${encodeURIComponent(query)}`, {
+            headers: { 'Accept': 'application/json' },
+            credentials: 'same-origin'
+        })
+        .then(res => {
+            if (!res.ok) throw new Error('Network response was not ok');
+            return res.json();
+        })
+        .then(data => {
+            // ignore responses for queries the user has already typed past
+            if (data.query === latestQuery) {
+                renderSuggestions(data.suggestions || []);
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching suggestions:', error);
+            hideSuggestions();
+        });
+    }
+
+    searchInput.addEventListener('input', function() {
+        const query = searchInput.value.trim();
+        clearTimeout(debounceTimer);
+        if (!query) {
+            latestQuery = '';
+            hideSuggestions();
+            return;
+        }
+        debounceTimer = setTimeout(() => fetchSuggestions(query), debounceMs);
+    });
+
+    searchInput.addEventListener('keydown', function(e) {
+        const items = suggestionList.querySelectorAll('.search-suggestion');
+        if (!items.length) return;
+
+        if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+            e.preventDefault();
+            const step = e.key === 'ArrowDown' ? 1 : -1;
+            activeIndex = (activeIndex + step + items.length) % items.length;
+            items.forEach((item, i) => item.classList.toggle('active', i === activeIndex));
+        } else if (e.key === 'Enter' && activeIndex >= 0) {
+            e.preventDefault();
+            chooseSuggestion(items[activeIndex].suggestion);
+        } else if (e.key === 'Escape') {
+            hideSuggestions();
+        }
+    });
+
+    searchInput.addEventListener('blur', hideSuggestions);
+});
@@ -0,0 +1,286 @@
+"""
+Content-hashed static URLs.
+
+Every file under static/ gets a fingerprinted name with the first
+HASH_LENGTH hex digits of its SHA-1 before the extension
+(css/globals.css -> css/globals.1a2b3c4d5e.css). url_for('static', ...)
+returns the fingerprinted name, from templates and Python alike, and the
+static route serves it with ``Cache-Control: public, max-age=31536000,
+immutable``: a changed file gets a new URL, so a cached copy never needs
+revalidating. Plain (unhashed) static URLs keep working with the default
+caching.
+
+The manifest is built when the app starts. With ``watch`` (debug mode) a
+file edited afterwards is re-hashed the next time its URL is built.
+
+Text assets (CSS, JS, SVG, ...) also get precompressed .br and .gz
+siblings, written by
+
+    flask --app wsgi compress-static [--force]
+
+and the static route sends the best one the client accepts, so nothing is
+compressed per request. precompressed.json records the content hash each
+sibling was made from; a sibling whose source has changed since is ignored.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # .br siblings are optional; gzip is always built
+    brotli = None
+
+HASH_LENGTH = 10
+IMMUTABLE_MAX_AGE = 31536000
+# precompressed siblings are negotiated by the static route, not linked
+SKIP_SUFFIXES = (".gz", ".br")
+PRECOMPRESSED_MANIFEST = "precompressed.json"
+
+COMPRESSIBLE_SUFFIXES = (".css", ".js", ".svg", ".json", ".txt", ".html", ".xml", ".map")
+# smaller files fit in a packet either way
+MIN_COMPRESS_SIZE = 256
+# (Content-Encoding, sibling suffix), preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def is_compressible(filename: str) -> bool:
+    return filename.endswith(COMPRESSIBLE_SUFFIXES) and not filename.endswith(PRECOMPRESSED_MANIFEST)
+
+
+def _compress(data: bytes, encoding: str) -> Optional[bytes]:
+    if encoding == "br":
+        return brotli.compress(data, quality=11) if brotli is not None else None
+    # mtime=0 keeps the output identical between builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    directory, _, name = filename.rpartition("/")
+    stem, dot, suffix = name.rpartition(".")
+    name = f"{stem}.{digest}.{suffix}" if dot and stem else f"{name}.{digest}"
+    return f"{directory}/{name}" if directory else name
+
+
+class AssetManifest:
+    """
+    filename -> fingerprinted filename for every file under ``static_root``,
+    and the reverse lookup the static route uses.
+    """
+
+    def __init__(self, static_root, watch: bool = False):
+        self.__static_root = Path(static_root)
+        self.__watch = watch
+        self.__hashed: Dict[str, str] = {}
+        self.__originals: Dict[str, str] = {}
+        self.__stats: Dict[str, Tuple[int, int]] = {}
+        self.__encodings: Dict[str, Tuple[str, ...]] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__hashed)
+
+    def fingerprint(self) -> str:
+        """A hash of every file's fingerprint: changes whenever any static file does."""
+        with self.__lock:
+            names = sorted(self.__hashed.values())
+        return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+    def build(self) -> Dict[str, str]:
+        for directory, _, files in os.walk(self.__static_root):
+            for name in files:
+                if name.endswith(SKIP_SUFFIXES) or name == PRECOMPRESSED_MANIFEST:
+                    continue
+                path = Path(directory) / name
+                self.__add(path.relative_to(self.__static_root).as_posix(), path)
+
+        # only siblings made from the file's current content are served
+        for filename, entry in _load_precompressed(self.__static_root).items():
+            if self.__hashed.get(filename) == hashed_name(filename, entry["hash"]):
+                self.__encodings[filename] = tuple(
+                    encoding for encoding, suffix in ENCODINGS
+                    if encoding in entry["encodings"] and (self.__static_root / (filename + suffix)).is_file()
+                )
+        return dict(self.__hashed)
+
+    def __add(self, filename: str, path: Path) -> str:
+        stat = path.stat()
+        digest = _file_hash(path)
+        hashed = hashed_name(filename, digest)
+        with self.__lock:
+            if self.__hashed.get(filename, hashed) != hashed:
+                self.__encodings.pop(filename, None)
+            self.__hashed[filename] = hashed
+            self.__originals[hashed] = filename
+            self.__stats[filename] = (stat.st_mtime_ns, stat.st_size)
+        return hashed
+
+    def hashed(self, filename: str) -> str:
+        """The fingerprinted name for ``filename``, or ``filename`` itself if it isn't a static file."""
+        hashed = self.__hashed.get(filename)
+        if hashed is not None and not self.__watch:
+            return hashed
+        path = self.__static_root / filename
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError, OSError):
+            return filename
+        if hashed is not None and self.__stats.get(filename) == (stat.st_mtime_ns, stat.st_size):
+            return hashed
+        if not path.is_file() or filename.endswith(SKIP_SUFFIXES):
+            return filename
+        return self.__add(filename, path)
+
+    def original(self, filename: str) -> Optional[str]:
+        """The file behind a fingerprinted name, or None if ``filename`` isn't one."""
+        return self.__originals.get(filename)
+
+    def encodings(self, filename: str) -> Tuple[str, ...]:
+        """The Content-Encodings ``filename`` has an up-to-date precompressed sibling for, preferred first."""
+        if self.__watch:
+            self.hashed(filename)
+        return self.__encodings.get(filename, ())
+
+
+def _load_precompressed(static_root: Path) -> Dict[str, dict]:
+    try:
+        with open(Path(static_root) / PRECOMPRESSED_MANIFEST, encoding="utf-8") as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+
+
+def compress_static(static_root, force: bool = False) -> Dict[str, int]:
+    """
+    Writes .br (when brotli is installed) and .gz siblings of the
+    compressible files under ``static_root`` and records them in
+    precompressed.json. Files unchanged since the last run are skipped
+    unless ``force``; a sibling that isn't smaller than its source is
+    dropped, and siblings of deleted files are removed.
+    Returns {"compressed": n, "skipped": n, "removed": n}.
+    """
+    static_root = Path(static_root)
+    previous = _load_precompressed(static_root)
+    entries: Dict[str, dict] = {}
+    stats = {"compressed": 0, "skipped": 0, "removed": 0}
+
+    for directory, _, files in os.walk(static_root):
+        for name in sorted(files):
+            path = Path(directory) / name
+            filename = path.relative_to(static_root).as_posix()
+            if name.endswith(SKIP_SUFFIXES):
+                source = Path(directory) / name.rsplit(".", 1)[0]
+                if not source.is_file():
+                    path.unlink()
+                    stats["removed"] += 1
+                continue
+            if not is_compressible(filename) or path.stat().st_size < MIN_COMPRESS_SIZE:
+                continue
+
+            digest = _file_hash(path)
+            entry = previous.get(filename)
+            wanted = [encoding for encoding, _ in ENCODINGS if encoding != "br" or brotli is not None]
+            if (
+                not force and entry and entry["hash"] == digest and entry["tried"] == wanted
+                and all(path.with_name(name + suffix).is_file()
+                        for encoding, suffix in ENCODINGS if encoding in entry["encodings"])
+            ):
+                entries[filename] = entry
+                stats["skipped"] += 1
+                continue
+
+            data = path.read_bytes()
+            written = []
+            for encoding, suffix in ENCODINGS:
+                sibling = path.with_name(name + suffix)
+                compressed = _compress(data, encoding)
+                if compressed is not None and len(compressed) < len(data):
+                    sibling.write_bytes(compressed)
+                    written.append(encoding)
+                elif sibling.exists():
+                    sibling.unlink()
+            entries[filename] = {"hash": digest, "encodings": written, "tried": wanted}
+            stats["compressed"] += 1
+
+    with open(static_root / PRECOMPRESSED_MANIFEST, "w", encoding="utf-8") as manifest:
+        json.dump(entries, manifest, indent=2, sort_keys=True)
+        manifest.write("\n")
+    return stats
+
+
+def _send_static(app, manifest: AssetManifest, filename: str):
+    from flask import request, send_from_directory
+
+    if not is_compressible(filename):
+        return app.send_static_file(filename)
+
+    accepted = request.accept_encodings
+    encoding = next((e for e in manifest.encodings(filename) if accepted[e]), None)
+    if encoding is None:
+        response = app.send_static_file(filename)
+    else:
+        suffix = dict(ENCODINGS)[encoding]
+        response = send_from_directory(
+            app.static_folder, filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=app.get_send_file_max_age(filename),
+        )
+        response.content_encoding = encoding
+    # the body depends on Accept-Encoding even when it is sent uncompressed
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def init_app(app) -> None:
+    """
+    Fingerprints url_for('static', ...), serves fingerprinted URLs as
+    immutable and precompressed siblings by Accept-Encoding, and registers
+    the ``compress-static`` command.
+    """
+    import click
+
+    manifest = AssetManifest(app.static_folder, watch=app.debug)
+    manifest.build()
+    app.extensions["asset_manifest"] = manifest
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = manifest.hashed(values["filename"])
+
+    def static(filename):
+        original = manifest.original(filename)
+        if original is None:
+            return _send_static(app, manifest, filename)
+        response = _send_static(app, manifest, original)
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = static
+
+    @app.cli.command("compress-static")
+    @click.option("--force", is_flag=True, help="Recompress files that haven't changed.")
+    def compress_static_command(force):
+        """Write precompressed .br/.gz siblings of the static text assets."""
+        stats = compress_static(app.static_folder, force=force)
+        click.echo(
+            f"compressed {stats['compressed']}, skipped {stats['skipped']} unchanged, "
+            f"removed {stats['removed']} stale"
+            + ("" if brotli is not None else " (brotli not installed: .gz only)")
+        )
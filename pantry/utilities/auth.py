@@ -1,30 +1,35 @@
-from flask import session
+from flask import session, g, has_app_context
 
 from pantry.blueprints.services import _repo
 
 
 def get_current_user():
-    username = session.get("username")
-    if not username:
-        return None
-    repo = _repo()
-    if repo is None:
-        return None
-    user = repo.get_user_by_username(username)
-    return user
-
+    """
+    Returns the logged-in user, loading it at most once per request.
 
-def is_logged_in():
+    The first call stores the domain User on ``flask.g`` (a per-request
+    identity map), so login_required, the view and the context processor
+    all share one instance instead of each querying the repository.
+    """
     username = session.get("username")
-
     if not username:
-        return False
+        return None
+    identity_map = g.setdefault("_user_identity_map", {})
+    if username not in identity_map:
+        identity_map[username] = _repo().get_user_by_username(username)
+    return identity_map[username]
 
-    repo = _repo()
 
-    if repo is None:
-        return False
+def invalidate_current_user(user=None):
+    # the repository's user_write_hook: later reads in the request reload the
+    # written user (or every user, if none is given)
+    if not has_app_context():
+        return
+    if user is None:
+        g.pop("_user_identity_map", None)
+    else:
+        g.get("_user_identity_map", {}).pop(user.username, None)
 
-    user = repo.get_user_by_username(username)
 
-    return user is not None
+def is_logged_in():
+    return get_current_user() is not None
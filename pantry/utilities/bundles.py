@@ -0,0 +1,256 @@
+"""
+CSS and JS bundles, one per page layout and one per page.
+
+Each bundle in BUNDLES concatenates its sources (paths relative to
+static/), strips comments and collapses whitespace, and is written to
+static/bundles/. Templates link the bundles through url_for('static', ...),
+so they are fingerprinted and precompressed like any other static file.
+After editing a source, rebuild them (and their .br/.gz siblings):
+
+    flask --app wsgi build-bundles
+    flask --app wsgi compress-static
+
+In debug mode stale bundles are rebuilt before each request.
+
+The minifiers are deliberately conservative: strings, template literals
+and regular expression literals are copied as they are and JS keeps its
+line breaks wherever automatic semicolon insertion could depend on them.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+STATIC_ROOT = Path(__file__).parent.parent / "static"
+BUNDLE_DIR = "bundles"
+
+# bundle name -> (CSS sources, JS sources), in load order
+BUNDLES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    # layouts: pages/base.html, pages/authenticated.html, layouts/auth.html
+    "base": (("css/globals.css",), ()),
+    "authenticated": (("css/globals.css", "css/nav/nav.css", "css/footer/footer.css"), ("js/nav/nav.js",)),
+    "auth": (("css/globals.css", "css/auth/auth.css"), ()),
+    # pages, on top of their layout's bundle
+    "home": (("css/home/home.css", "css/carousel/carousel.css"), ("js/carousel/carousel.js", "js/home/home.js")),
+    "inventory": (("css/inventory/inventory.css", "css/search/search.css"),
+                  # search.js ran inline from components/search.html, ahead of inventory.js
+                  ("js/search/search.js", "js/inventory/inventory.js")),
+    "recipes": (("css/recipes/recipes.css",), ("js/recipes/recipes.js",)),
+    "recipe-detail": (("css/recipes/recipe-detail.css",), ("js/recipes/recipe-detail.js",)),
+    "shopping": (("css/shopping/shopping.css",), ("js/shopping/shopping.js",)),
+    "user": (("css/user/user.css",), ("js/user/user.js",)),
+}
+
+_CSS_TIGHT = "{};,>"
+_JS_TIGHT = "{}()[];,:=<>!&|?"
+# after these a newline can't end a statement, so it can go
+_JS_NO_NEWLINE_AFTER = "{;,(["
+_JS_NO_NEWLINE_BEFORE = "})]"
+# a / after one of these starts a regular expression, not a division
+_JS_REGEX_AFTER = "(,=:[!&|?{};+-*%<>~^"
+_JS_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await", "delete",
+                      "throw", "new"}
+_WORD = re.compile(r"[A-Za-z_$][\w$]*$")
+
+
+def _skip_string(source: str, i: int) -> int:
+    quote = source[i]
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == "\\" else 1
+    return i + 1
+
+
+def _starts_regex(out: List[str]) -> bool:
+    before = "".join(out[-8:]).rstrip()
+    if not before or before[-1] in _JS_REGEX_AFTER:
+        return True
+    word = _WORD.search(before)
+    return word is not None and word.group() in _JS_REGEX_KEYWORDS
+
+
+def minify_css(source: str) -> str:
+    out: List[str] = []
+    space = False
+    i, n = 0, len(source)
+    while i < n:
+        char = source[i]
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            space = True
+            continue
+        if char.isspace():
+            space = True
+            i += 1
+            continue
+        if space and out and out[-1][-1] not in _CSS_TIGHT + ":" and char not in _CSS_TIGHT:
+            out.append(" ")
+        space = False
+        if char in "\"'":
+            end = _skip_string(source, i)
+            out.append(source[i:end])
+            i = end
+            continue
+        if char == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def minify_js(source: str) -> str:
+    out: List[str] = []
+    pending = ""  # "", " " or "\n": whitespace seen since the last token
+    templates: List[int] = []  # brace depth of each ${ ... } we are inside
+    i, n = 0, len(source)
+
+    def last() -> str:
+        return out[-1][-1] if out else ""
+
+    def flush(char: str) -> None:
+        nonlocal pending
+        if pending == "\n" and out and last() not in _JS_NO_NEWLINE_AFTER and char not in _JS_NO_NEWLINE_BEFORE:
+            out.append("\n")
+        elif pending and out and last() not in _JS_TIGHT and char not in _JS_TIGHT:
+            out.append(" ")
+        pending = ""
+
+    def whitespace(text: str) -> None:
+        nonlocal pending
+        if "\n" in text:
+            pending = "\n"
+        elif not pending:
+            pending = " "
+
+    def template(i: int) -> int:
+        # copies template text from i up to and including the closing
+        # backtick, or up to a "${", whose expression is then read as code
+        while i < n:
+            if source[i] == "\\":
+                i += 2
+            elif source[i] == "`":
+                return i + 1
+            elif source.startswith("${", i):
+                templates.append(0)
+                return i + 2
+            else:
+                i += 1
+        return i
+
+    while i < n:
+        char = source[i]
+        if char.isspace():
+            start = i
+            while i < n and source[i].isspace():
+                i += 1
+            whitespace(source[start:i])
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            whitespace(" \n"["\n" in source[i:end]])
+            i = end
+            continue
+
+        regex = char == "/" and _starts_regex(out)
+        flush(char)
+        if char in "\"'":
+            end = _skip_string(source, i)
+        elif char == "`" or (char == "}" and templates and templates[-1] == 0):
+            if char == "}":
+                templates.pop()
+            end = template(i + 1)
+        elif regex:
+            end, in_class = i + 1, False
+            while end < n and (in_class or source[end] != "/"):
+                if source[end] == "\\":
+                    end += 1
+                elif source[end] == "[":
+                    in_class = True
+                elif source[end] == "]":
+                    in_class = False
+                end += 1
+            end += 1
+            while end < n and source[end].isalpha():
+                end += 1
+        else:
+            if templates and char == "{":
+                templates[-1] += 1
+            elif templates and char == "}":
+                templates[-1] -= 1
+            end = i + 1
+        out.append(source[i:end])
+        i = end
+    return "".join(out)
+
+
+def render_bundle(name: str, static_root: Path = STATIC_ROOT) -> Tuple[str, str]:
+    """The minified (CSS, JS) text of bundle ``name``."""
+    css_sources, js_sources = BUNDLES[name]
+    static_root = Path(static_root)
+    css = "\n".join(minify_css((static_root / path).read_text(encoding="utf-8")) for path in css_sources)
+    # each script is wrapped in DOMContentLoaded; the ; guards a missing one
+    js = ";\n".join(minify_js((static_root / path).read_text(encoding="utf-8")) for path in js_sources)
+    return css, js
+
+
+def bundle_paths(name: str) -> Tuple[str, str]:
+    return f"{BUNDLE_DIR}/{name}.css", f"{BUNDLE_DIR}/{name}.js"
+
+
+def build_bundles(static_root: Path = STATIC_ROOT, stale_only: bool = False) -> List[str]:
+    """
+    Writes every bundle's .css and .js (when it has sources of that kind)
+    and returns the paths whose content changed. With ``stale_only`` only
+    bundles with a source newer than their output are rendered.
+    """
+    static_root = Path(static_root)
+    (static_root / BUNDLE_DIR).mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, (css_sources, js_sources) in BUNDLES.items():
+        kinds = [
+            (path, sources) for path, sources in zip(bundle_paths(name), (css_sources, js_sources)) if sources
+        ]
+        if stale_only and not any(_is_stale(static_root, path, sources) for path, sources in kinds):
+            continue
+        css, js = render_bundle(name, static_root)
+        for path, text in zip(bundle_paths(name), (css, js)):
+            if path not in dict(kinds):
+                continue
+            target = static_root / path
+            content = text + "\n"
+            if not target.exists() or target.read_text(encoding="utf-8") != content:
+                target.write_text(content, encoding="utf-8")
+                written.append(path)
+    return written
+
+
+def _is_stale(static_root: Path, path: str, sources) -> bool:
+    try:
+        built = (static_root / path).stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+    return any((static_root / source).stat().st_mtime_ns > built for source in sources)
+
+
+def init_app(app) -> None:
+    """Registers the ``build-bundles`` command, and rebuilds stale bundles per request in debug mode."""
+    import click
+
+    static_root = Path(app.static_folder)
+
+    @app.cli.command("build-bundles")
+    def build_bundles_command():
+        """Build the minified per-layout and per-page CSS/JS bundles."""
+        written = build_bundles(static_root)
+        click.echo(f"wrote {len(written)} bundle files" + "".join(f"\n  {path}" for path in written))
+
+    if app.debug:
+        @app.before_request
+        def rebuild_stale_bundles():
+            build_bundles(static_root, stale_only=True)
@@ -0,0 +1,107 @@
+"""
+Conditional GETs for pages rendered from the catalog.
+
+``@etag()`` goes above ``@login_required`` on a GET view. The ETag hashes
+the app build (code and templates, plus the static asset fingerprints the
+pages link to), the request path and query string, the username in the
+session, the version channel's epoch and the catalog version; with
+``per_user=True`` also that user's state version. The epoch stops a tag
+issued before the counters restarted (a lost channel file) from matching.
+None of these need a query: the versions are counters the repository
+keeps (see AbstractRepository.state_version). A request whose
+If-None-Match matches gets an empty 304 before the login check, any
+repository read or the template render.
+
+Responses are ``private, no-cache``: browsers revalidate every time and
+shared caches don't keep them. The user's state version is read from the
+version channel on every request, so a user always sees their own writes,
+whichever worker made them. The catalog version is polled (at most every
+VERSION_POLL_INTERVAL), so a catalog change can take that long to reach
+the other workers' ETags, as it does their catalog caches. ETags are off
+in debug mode, where templates and bundles change under a running app.
+"""
+
+import hashlib
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+from flask import current_app, make_response, request, session
+
+from pantry.adapters.version_channel import CATALOG, EPOCH, user_key
+from pantry.blueprints.services import _repo
+
+PACKAGE_ROOT = Path(__file__).parent.parent
+BUILD_SUFFIXES = (".py", ".html")
+
+
+def build_fingerprint(package_root: Path = PACKAGE_ROOT, assets: str = "") -> str:
+    # the code and templates that render a page, and the asset URLs it links
+    digest = hashlib.sha1(assets.encode("utf-8"))
+    for path in sorted(Path(package_root).rglob("*")):
+        relative = path.relative_to(package_root)
+        if path.suffix in BUILD_SUFFIXES and relative.parts[0] != "static" and path.is_file():
+            digest.update(relative.as_posix().encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _current_etag(per_user: bool) -> Optional[str]:
+    build = current_app.extensions.get("etag_build")
+    repo = _repo()
+    if build is None or current_app.debug or repo is None:
+        return None
+    username = session.get("username") or ""
+    user_version = None
+    if per_user:
+        # read through the poll interval: a user's own write, made on any
+        # worker, must change the tag on their next request
+        user_version = repo.state_version(user_key(username), fresh=True) if username else None
+        if user_version is None:
+            return None
+    epoch = repo.state_version(EPOCH)
+    catalog = repo.state_version(CATALOG)
+    if epoch is None or catalog is None:
+        return None
+    parts = [build, request.full_path, username, epoch, catalog]
+    if per_user:
+        parts.append(user_version)
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def etag(per_user: bool = False):
+    """
+    Answers GET/HEAD requests whose If-None-Match matches the page's current
+    ETag with a 304, and tags the view's 200 responses with it.
+    ``per_user`` is for pages that show the user's own data.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped_view(**kwargs):
+            tag = _current_etag(per_user) if request.method in ("GET", "HEAD") else None
+            if tag is None:
+                return view(**kwargs)
+            if request.if_none_match.contains(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(tag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add("Cookie")
+            return response
+
+        return wrapped_view
+
+    return decorator
+
+
+def init_app(app) -> None:
+    """Fingerprints the build the ETags are computed from; call after assets.init_app."""
+    manifest = app.extensions.get("asset_manifest")
+    app.extensions["etag_build"] = build_fingerprint(
+        assets=manifest.fingerprint() if manifest is not None else ""
+    )
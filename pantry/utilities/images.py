@@ -0,0 +1,350 @@
+"""
+Responsive image derivatives.
+
+Every source image under SOURCE_DIRS gets resized copies at each width in
+WIDTHS (never wider than the source) in AVIF, WebP and JPEG, written to
+static/images/derived/. manifest.json there records, per source, the
+content hash it was built from and the files produced, so a rebuild skips
+images that haven't changed. Every worker may build in the background, so
+manifest updates are merged into the file under a lock file next to it.
+
+    flask --app wsgi build-images [--force]
+
+Templates call ``responsive_image(path, alt, sizes=...)``, which renders a
+<picture> from the manifest. A source with no derivatives yet (a new recipe
+image, say), or one replaced since they were built, is served as it is
+while its derivatives are built in the background, when Pillow is
+installed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from markupsafe import Markup, escape
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, where only this process's builds are serialised
+    fcntl = None
+
+try:
+    from PIL import Image, features
+except ImportError:  # derivatives are optional; without Pillow the originals are served
+    Image = None
+    features = None
+
+STATIC_ROOT = Path(__file__).parent.parent / "static"
+SOURCE_DIRS = ("images/recipes", "images/hero_carousel/small")
+DERIVED_DIR = "images/derived"
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+WIDTHS = (320, 640, 960, 1280)
+# (format, Pillow format, file suffix, save options), best first
+FORMATS = (
+    ("avif", "AVIF", ".avif", {"quality": 50, "speed": 6}),
+    ("webp", "WEBP", ".webp", {"quality": 75, "method": 6}),
+    ("jpeg", "JPEG", ".jpg", {"quality": 78, "optimize": True, "progressive": True}),
+)
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+# changes to the settings above rebuild everything
+SETTINGS_KEY = hashlib.sha1(repr((WIDTHS, FORMATS)).encode("utf-8")).hexdigest()[:12]
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def _available_formats():
+    return [f for f in FORMATS if f[0] == "jpeg" or features.check(f[0])]
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _within(static_root: Path, source: str) -> bool:
+    # sources come from templates (e.g. a recipe's image_url); keep "../" out
+    root = static_root.resolve()
+    return (root / source).resolve().is_relative_to(root)
+
+
+def _sources(static_root: Path, source_dirs: Iterable[str]) -> List[str]:
+    found = []
+    for directory in source_dirs:
+        for path in sorted((static_root / directory).glob("*")):
+            if path.suffix.lower() in SOURCE_SUFFIXES:
+                found.append(path.relative_to(static_root).as_posix())
+    return found
+
+
+class ImageManifest:
+    """
+    The derivatives manifest: source path (relative to static/) ->
+    {"hash", "settings", "width", "height", "variants": {format: [[width, path], ...]}}.
+    Loaded lazily and re-read when the file changes on disk.
+    """
+
+    def __init__(self, static_root: Path = STATIC_ROOT):
+        self.__static_root = Path(static_root)
+        self.__path = self.__static_root / DERIVED_DIR / MANIFEST_NAME
+        self.__entries: Dict[str, dict] = {}
+        self.__mtime = None
+        self.__lock = threading.Lock()
+        self.__pending = set()
+        self.__pending_lock = threading.Lock()
+        # source -> ((mtime, size), content hash), so pages don't re-hash images
+        self.__source_hashes: Dict[str, tuple] = {}
+
+    @property
+    def static_root(self) -> Path:
+        return self.__static_root
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def entries(self, reload: bool = False) -> Dict[str, dict]:
+        try:
+            mtime = self.__path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self.__entries
+        if reload or mtime != self.__mtime:
+            with open(self.__path, encoding="utf-8") as manifest:
+                self.__entries = json.load(manifest)
+            self.__mtime = mtime
+        return self.__entries
+
+    def get(self, source: str) -> Optional[dict]:
+        return self.entries().get(source)
+
+    def save(self, entries: Dict[str, dict]) -> None:
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.__path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as manifest:
+            json.dump(entries, manifest, indent=2, sort_keys=True)
+            manifest.write("\n")
+        os.replace(tmp, self.__path)
+        self.__entries = entries
+        self.__mtime = self.__path.stat().st_mtime_ns
+
+    @contextmanager
+    def __file_lock(self):
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.__path.with_name(LOCK_NAME), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def merge(self, updates: Dict[str, dict]) -> None:
+        """Saves ``updates`` over the manifest as it is on disk now, keeping other workers' entries."""
+        with self.__file_lock():
+            entries = dict(self.entries(reload=True))
+            entries.update(updates)
+            self.save(entries)
+
+    def is_current(self, source: str, source_hash: str) -> bool:
+        entry = self.entries().get(source)
+        if not entry or entry.get("hash") != source_hash or entry.get("settings") != SETTINGS_KEY:
+            return False
+        return all(
+            (self.__static_root / path).exists()
+            for variants in entry["variants"].values()
+            for _, path in variants
+        )
+
+    def source_hash(self, source: str) -> Optional[str]:
+        """The content hash of ``source``, re-computed only when its mtime or size change."""
+        if not _within(self.__static_root, source):
+            return None
+        try:
+            stat = (self.__static_root / source).stat()
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self.__source_hashes.get(source)
+        if cached is None or cached[0] != key:
+            cached = (key, _file_hash(self.__static_root / source))
+            self.__source_hashes[source] = cached
+        return cached[1]
+
+    def current(self, source: str) -> Optional[dict]:
+        """The manifest entry for ``source`` if it was built from the file as it is now, else None."""
+        entry = self.get(source)
+        if entry is None or entry.get("settings") != SETTINGS_KEY:
+            return None
+        return entry if entry.get("hash") == self.source_hash(source) else None
+
+    def build(self, sources: Iterable[str], force: bool = False) -> Dict[str, int]:
+        """
+        Builds derivatives for ``sources`` (paths relative to static/),
+        skipping those whose content hash matches the manifest unless
+        ``force``. Returns {"built": n, "skipped": n}. Raises ValueError for
+        a source outside static/.
+        """
+        if not pillow_available():
+            raise RuntimeError("Pillow is required to build image derivatives (pip install Pillow)")
+        sources = list(sources)
+        for source in sources:
+            if not _within(self.__static_root, source):
+                raise ValueError(f"{source} is outside {self.__static_root}")
+        stats = {"built": 0, "skipped": 0}
+        with self.__lock:
+            for source in sources:
+                source_hash = _file_hash(self.__static_root / source)
+                if not force and self.is_current(source, source_hash):
+                    stats["skipped"] += 1
+                    continue
+                # merged per image, so an interrupted build keeps its progress
+                self.merge({source: self.__build_one(source, source_hash)})
+                stats["built"] += 1
+        return stats
+
+    def __build_one(self, source: str, source_hash: str) -> dict:
+        stem = Path(source).with_suffix("").as_posix().replace("images/", "", 1).replace("/", "-")
+        out_dir = self.__static_root / DERIVED_DIR
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with Image.open(self.__static_root / source) as original:
+            original = original.convert("RGB")
+            width, height = original.size
+            widths = [w for w in WIDTHS if w < width] + [min(width, WIDTHS[-1])]
+            variants: Dict[str, List] = {}
+            for name, pil_format, suffix, options in _available_formats():
+                variants[name] = []
+                for w in widths:
+                    resized = original if w == width else original.resize(
+                        (w, round(height * w / width)), Image.LANCZOS
+                    )
+                    path = f"{DERIVED_DIR}/{stem}-{source_hash[:8]}-{w}{suffix}"
+                    resized.save(self.__static_root / path, pil_format, **options)
+                    variants[name].append([w, path])
+        return {
+            "hash": source_hash,
+            "settings": SETTINGS_KEY,
+            "width": width,
+            "height": height,
+            "variants": variants,
+        }
+
+    def build_in_background(self, source: str) -> None:
+        # runtime fallback for sources the offline build hasn't seen
+        if (
+            not pillow_available() or not _within(self.__static_root, source)
+            or not (self.__static_root / source).is_file()
+        ):
+            return
+        with self.__pending_lock:
+            if source in self.__pending:
+                return
+            self.__pending.add(source)
+
+        def run():
+            try:
+                self.build([source])
+            finally:
+                with self.__pending_lock:
+                    self.__pending.discard(source)
+
+        threading.Thread(target=run, name=f"derive-{source}", daemon=True).start()
+
+
+def build_images(static_root: Path = STATIC_ROOT, force: bool = False) -> Dict[str, int]:
+    manifest = ImageManifest(static_root)
+    return manifest.build(_sources(Path(static_root), SOURCE_DIRS), force=force)
+
+
+def prune_images(static_root: Path = STATIC_ROOT) -> int:
+    # removes derivatives the manifest no longer lists (e.g. after a source changed)
+    manifest = ImageManifest(static_root)
+    listed = {
+        path for entry in manifest.entries().values()
+        for variants in entry["variants"].values() for _, path in variants
+    }
+    removed = 0
+    for path in (Path(static_root) / DERIVED_DIR).glob("*"):
+        relative = path.relative_to(static_root).as_posix()
+        if path.name not in (MANIFEST_NAME, LOCK_NAME) and relative not in listed:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def render_responsive_image(manifest: ImageManifest, url_for, source: str, alt: str, sizes: str = "100vw",
+                            class_: str = "", loading: str = "lazy", on_demand: bool = True) -> Markup:
+    """
+    A <picture> with AVIF/WebP <source> srcsets and a JPEG <img> fallback, or
+    a plain <img> of the original when ``source`` has no derivatives yet or
+    has changed since they were built.
+    """
+    attributes = f' alt="{escape(alt)}" loading="{escape(loading)}" decoding="async"'
+    if class_:
+        attributes += f' class="{escape(class_)}"'
+    if loading == "eager":
+        attributes += ' fetchpriority="high"'
+
+    entry = manifest.current(source)
+    if entry is None:
+        if on_demand:
+            manifest.build_in_background(source)
+        return Markup(f'<img src="{escape(url_for("static", filename=source))}"{attributes}>')
+
+    def srcset(variants):
+        return ", ".join(f'{escape(url_for("static", filename=path))} {w}w' for w, path in variants)
+
+    variants = entry["variants"]
+    parts = ['<picture class="responsive-image">']
+    for name in ("avif", "webp"):
+        if variants.get(name):
+            parts.append(
+                f'<source type="{MIME_TYPES[name]}" srcset="{srcset(variants[name])}" sizes="{escape(sizes)}">'
+            )
+    fallback = variants["jpeg"]
+    parts.append(
+        f'<img src="{escape(url_for("static", filename=fallback[-1][1]))}" '
+        f'srcset="{srcset(fallback)}" sizes="{escape(sizes)}" '
+        f'width="{entry["width"]}" height="{entry["height"]}"{attributes}>'
+    )
+    parts.append("</picture>")
+    return Markup("".join(parts))
+
+
+def init_app(app) -> None:
+    """Registers the ``responsive_image`` template helper and the ``build-images`` command."""
+    import click
+    from flask import url_for
+
+    manifest = ImageManifest(Path(app.static_folder))
+    app.extensions["image_manifest"] = manifest
+
+    def responsive_image(source: str, alt: str = "", sizes: str = "100vw", class_: str = "", loading: str = "lazy"):
+        return render_responsive_image(
+            manifest, url_for, source, alt, sizes=sizes, class_=class_, loading=loading,
+            on_demand=app.config.get("IMAGE_DERIVATIVES_ON_DEMAND", True),
+        )
+
+    app.jinja_env.globals["responsive_image"] = responsive_image
+
+    @app.cli.command("build-images")
+    @click.option("--force", is_flag=True, help="Rebuild derivatives even for unchanged images.")
+    @click.option("--prune", is_flag=True, help="Delete derivatives the manifest no longer lists.")
+    def build_images_command(force, prune):
+        """Build responsive AVIF/WebP/JPEG derivatives of the static images."""
+        stats = build_images(Path(app.static_folder), force=force)
+        click.echo(f"built {stats['built']}, skipped {stats['skipped']} unchanged")
+        if prune:
+            click.echo(f"pruned {prune_images(Path(app.static_folder))} stale files")
@@ -15,6 +15,8 @@ def app():
     # test config adjustments
     app.config["WTF_CSRF_ENABLED"] = False
     app.config["SECRET_KEY"] = "test-secret"
+    # don't write derivatives into the tree from page renders
+    app.config["IMAGE_DERIVATIVES_ON_DEMAND"] = False
     app.testing = True
 
     yield app
@@ -65,3 +67,33 @@ def sample_recipe(sample_ingredient):
         notes="",
         image_url="",
     )
+
+
+@pytest.fixture
+def database_engine(tmp_path):
+    from sqlalchemy import create_engine, NullPool
+    from pantry.adapters import orm
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pantry-test.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    orm.Base.metadata.create_all(engine)
+    orm.install_search_indexes(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def database_repo(database_engine):
+    # a SqlAlchemyRepository over a throwaway SQLite file, populated from CSV
+    from sqlalchemy.orm import sessionmaker
+    from pantry.adapters.database_repository import SqlAlchemyRepository
+    from pantry.adapters.populate_repository import populate
+
+    session_factory = sessionmaker(autocommit=False, autoflush=True, bind=database_engine)
+    repo = SqlAlchemyRepository(session_factory, str(database_engine.url))
+    populate(repo, database_mode=True)
+    yield repo
+    repo._session_cm.close_current_session()
@@ -21,3 +21,31 @@ def test_register_and_login_flow(client, memory_repo):
     resp4 = client.get("/shopping", follow_redirects=True)
     assert resp4.status_code == 200
     assert b"Login" in resp4.data or b"Please log in to access this page." in resp4.data
+
+
+def test_pages_link_fingerprinted_static_assets(client):
+    page = client.get("/auth/login").get_data(as_text=True)
+    assert 'href="/static/bundles/auth.css"' not in page
+    hashed = page.split('href="/static/bundles/auth.', 1)[1].split('"', 1)[0]
+    response = client.get(f"/static/bundles/auth.{hashed}")
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+def test_static_css_is_served_precompressed(app, client):
+    from pantry.utilities.assets import compress_static
+
+    # the siblings are build output, made at deploy time
+    compress_static(app.static_folder)
+    app.extensions["asset_manifest"].build()
+    page = client.get("/auth/login").get_data(as_text=True)
+    url = "/static/bundles/auth." + page.split('href="/static/bundles/auth.', 1)[1].split('"', 1)[0]
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.content_encoding == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_login_page_loads_one_stylesheet(client):
+    page = client.get("/auth/login").get_data(as_text=True)
+    assert page.count('rel="stylesheet"') == 1
+    assert 'href="/static/bundles/auth.' in page
@@ -1,3 +1,6 @@
+from tests.utils import make_user, login_user
+
+
 def test_recipes_list_and_detail(client, memory_repo):
     from tests.utils import make_user, login_user
 
@@ -38,3 +41,80 @@ def test_recipes_list_and_detail(client, memory_repo):
     resp2 = client.get(f"/recipes/{r.name.replace(' ', '-')}", follow_redirects=True)
     assert resp2.status_code == 200
     assert b"Test Recipe" in resp2.data or b"Test-Recipe" in resp2.data
+
+
+def test_cookable_recipes_api(client, memory_repo):
+    recipe = memory_repo.get_all_recipes()[0]
+    names = [line.name for line in recipe.ingredients]
+    make_user(memory_repo, username="cook", email="cook@example.com", password="Password1")
+    login_user(client, "cook", "Password1")
+
+    resp = client.get("/recipes/api/cookable", query_string={"ingredients": ",".join(names)})
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert {"id": recipe.id, "name": recipe.name, "missing": []} in data["recipes"]
+
+    resp = client.get("/recipes/api/cookable", query_string={"ingredients": ",".join(names[1:]), "missing": 1})
+    assert {"id": recipe.id, "name": recipe.name, "missing": [names[0]]} in resp.get_json()["recipes"]
+
+    # the grocery list is what the user still needs, so it is never the pantry
+    user = memory_repo.get_user_by_username("cook")
+    user.add_grocery(memory_repo.get_ingredient_by_name("Carrot"), 1)
+    memory_repo.update_user(user)
+    assert client.get("/recipes/api/cookable").status_code == 400
+    assert client.get("/recipes/api/cookable", query_string={"ingredients": " , "}).status_code == 400
+
+
+def test_recipe_detail_and_profile_show_similar_recipes(client, memory_repo):
+    recipe = memory_repo.get_all_recipes()[0]
+    similar = memory_repo.get_similar_recipes(recipe.id, 4)
+    assert similar and recipe not in similar
+
+    user = make_user(memory_repo, username="sam", email="sam@example.com", password="Password1")
+    login_user(client, "sam", "Password1")
+    page = client.get("/recipes/" + recipe.name.lower().replace(" ", "-")).get_data(as_text=True)
+    assert "More Like This" in page
+    assert similar[0].name in page
+
+    user.save_recipe(recipe.id)
+    memory_repo.update_user(user)
+    recommended = memory_repo.get_recommended_recipes(user.saved_recipes, 6)
+    profile = client.get("/user/sam").get_data(as_text=True)
+    assert "recommended-recipes-card" in profile
+    assert recommended[0].name in profile
+
+
+def test_recipe_images_are_responsive(app, client, memory_repo, monkeypatch):
+    # derivatives are build output (flask build-images); stand one in for every image
+    entry = {"width": 800, "height": 600, "variants": {
+        name: [[320, f"images/derived/x-320.{name}"]] for name in ("avif", "webp", "jpeg")
+    }}
+    monkeypatch.setattr(app.extensions["image_manifest"], "current", lambda source: entry)
+    make_user(memory_repo, username="pia", email="pia@example.com", password="Password1")
+    login_user(client, "pia", "Password1")
+    page = client.get("/recipes").get_data(as_text=True)
+    assert "cdn.jsdelivr.net" not in page
+    assert page.count("<picture") == len(memory_repo.get_all_recipes())
+    assert 'type="image/avif"' in page and 'loading="lazy"' in page
+
+
+def test_recipes_page_answers_304_without_touching_the_repository(client, memory_repo, sample_recipe, monkeypatch):
+    make_user(memory_repo, username="otto", email="otto@example.com", password="Password1")
+    login_user(client, "otto", "Password1")
+    first = client.get("/recipes")
+    tag = first.headers["ETag"]
+    assert first.cache_control.private and first.cache_control.no_cache
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("repository read on a 304")
+
+    monkeypatch.setattr(memory_repo, "get_all_recipes", unexpected)
+    monkeypatch.setattr(memory_repo, "get_user_by_username", unexpected)
+    cached = client.get("/recipes", headers={"If-None-Match": tag})
+    assert cached.status_code == 304 and cached.data == b""
+    assert cached.headers["ETag"] == tag
+    monkeypatch.undo()
+
+    memory_repo.add_recipe(sample_recipe)
+    changed = client.get("/recipes", headers={"If-None-Match": tag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != tag
@@ -0,0 +1,322 @@
+def test_database_name_search_uses_trigram_index(database_repo):
+    assert "ingredients" in database_repo._search_tables
+
+    results = database_repo.sort_ingredients_by_name("ARROT")
+    assert [ing.name for ing in results] == ["Carrot"]
+
+    # short queries fall back to LIKE but give the same ordering
+    names = [ing.name for ing in database_repo.sort_ingredients_by_name("ca")]
+    assert "Carrot" in names
+    assert names == sorted(names)
+
+    recipes = database_repo.sort_recipes_by_name("chicken")
+    assert recipes and all("chicken" in r.name.lower() for r in recipes)
+
+
+def test_database_name_search_sees_new_rows(database_repo):
+    from pantry.domainmodel.ingredient import Ingredient
+
+    database_repo.add_ingredient(Ingredient("Quince Paste", 0, "pieces"))
+    assert [i.name for i in database_repo.sort_ingredients_by_name("NCE PA")] == [
+        "Quince Paste"
+    ]
+
+
+def test_database_suggest_names_is_incremental(database_repo, sample_recipe):
+    assert ("Carrot", "ingredient") in database_repo.suggest_names("carr")
+
+    database_repo.add_recipe(sample_recipe)
+    assert database_repo.suggest_names("pancak") == [("Pancakes", "recipe")]
+
+
+def test_database_cookable_recipes_is_incremental(database_repo, sample_recipe):
+    assert database_repo.get_cookable_recipes(["Sugar"]) == []
+
+    database_repo.add_recipe(sample_recipe)
+    (recipe, missing), = database_repo.get_cookable_recipes(["sugar"])
+    assert (recipe.name, missing) == ("Pancakes", [])
+    assert [(r.name, m) for r, m in database_repo.get_cookable_recipes([], max_missing=1)] == [("Pancakes", ["Sugar"])]
+
+
+READ_METHODS = [
+    ("get_ingredient_by_name", ("Carrot",)),
+    ("get_ingredients_by_category", ("Vegetable",)),
+    ("get_all_ingredients", ()),
+    ("sort_ingredients_by_name", ("o",)),
+    ("sort_ingredients_by_category", ("veg",)),
+    ("get_user_by_username", ("grocer",)),
+    ("get_user_by_email", ("grocer@example.com",)),
+    ("get_all_users", ()),
+    ("get_recipe_by_name", ("Pineapple Chicken",)),
+    ("get_recipes_by_category", ("main",)),
+    ("get_recipes_by_cuisine", ("Italian",)),
+    ("get_recipes_by_tag", ("chicken",)),
+    ("get_all_recipes", ()),
+    ("sort_recipes_by_name", ("e",)),
+    ("sort_recipes_by_category", ("mai",)),
+]
+
+
+def _query_counts(repo, engine):
+    from tests.utils import count_queries
+
+    counts = {}
+    for method, args in READ_METHODS:
+        # start each call from an empty identity map
+        repo._session_cm.close_current_session()
+        with count_queries(engine) as statements:
+            getattr(repo, method)(*args)
+        counts[method] = len(statements)
+    return counts
+
+
+def _add_grocer(repo, n_items):
+    from pantry.domainmodel.user import User
+
+    user = repo.get_user_by_username("grocer")
+    if user is None:
+        repo.add_user(User(500, "grocer", "grocer@example.com", "hash"))
+        user = repo.get_user_by_username("grocer")
+    for ing in repo.get_all_ingredients()[:n_items]:
+        user.add_grocery(ing, 1)
+    user.save_recipe(1)
+    repo.update_user(user)
+
+
+def test_database_read_paths_issue_constant_queries(database_repo, database_engine):
+    from pantry.domainmodel.recipe import Recipe
+
+    _add_grocer(database_repo, 2)
+    before = _query_counts(database_repo, database_engine)
+
+    # grow every table the read paths touch
+    for i in range(25):
+        database_repo.add_recipe(
+            Recipe(
+                id=1000 + i, name=f"Generated Chicken Main {i}", description="",
+                ingredients=[("1", "kg", f"Thing {j}") for j in range(6)],
+                methods=[], prep_time_mins=0, cook_time_mins=0, total_time_mins=0,
+                difficulty="", category="main", cuisine="Italian", tags=["chicken"],
+                notes="", image_url="",
+            )
+        )
+    _add_grocer(database_repo, 30)
+    after = _query_counts(database_repo, database_engine)
+
+    assert after == before
+    for method, count in after.items():
+        assert count <= 4, f"{method} issued {count} queries"
+
+
+def _row_by_row_repo(engine):
+    from sqlalchemy.orm import sessionmaker
+    from pantry.adapters.database_repository import SqlAlchemyRepository
+    from pantry.adapters.datareader.reader import DataReader
+
+    repo = SqlAlchemyRepository(sessionmaker(bind=engine), str(engine.url))
+    reader = DataReader()
+    for category in reader.categories:
+        repo.add_category(category)
+    for ingredient in reader.ingredients:
+        repo.add_ingredient(ingredient)
+    for recipe in reader.recipes:
+        repo.add_recipe(recipe)
+    return repo
+
+
+def test_bulk_populate_matches_row_by_row(database_repo, tmp_path):
+    from sqlalchemy import create_engine, NullPool
+    from pantry.adapters import orm
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'row-by-row.db'}", poolclass=NullPool)
+    orm.Base.metadata.create_all(engine)
+    reference = _row_by_row_repo(engine)
+
+    assert database_repo.get_all_categories() == reference.get_all_categories()
+    for bulk, single in zip(database_repo.get_all_ingredients(), reference.get_all_ingredients()):
+        assert (bulk.name, bulk.unit, bulk.categories, bulk.range_min, bulk.range_max, bulk.step) == (
+            single.name, single.unit, single.categories, single.range_min, single.range_max, single.step
+        )
+    bulk_recipes = database_repo.get_all_recipes()
+    assert [(r.id, r.name, r.ingredients, r.tags) for r in bulk_recipes] == [
+        (r.id, r.name, r.ingredients, r.tags) for r in reference.get_all_recipes()
+    ]
+    reference._session_cm.close_current_session()
+    engine.dispose()
+
+
+def test_bulk_populate_is_batched_and_idempotent(database_repo, database_engine):
+    from pantry.adapters.datareader.reader import DataReader
+    from tests.utils import count_queries
+
+    reader = DataReader()
+    ingredient_count = len(database_repo.get_all_ingredients())
+    recipe_count = len(database_repo.get_all_recipes())
+
+    with count_queries(database_engine) as statements:
+        database_repo.add_multiple_categories(reader.categories)
+        database_repo.add_multiple_ingredients(reader.ingredients)
+        database_repo.add_multiple_recipes([])
+
+    # nothing new to write: just the key preloads
+    assert not any(s.lstrip().upper().startswith(("INSERT", "UPDATE")) for s in statements)
+    assert len(statements) <= 6
+    assert len(database_repo.get_all_ingredients()) == ingredient_count
+    assert len(database_repo.get_all_recipes()) == recipe_count
+
+
+def _writes(statements):
+    return [s for s in statements if s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+
+
+def test_update_user_writes_only_the_diff(database_repo, database_engine):
+    from tests.utils import count_queries
+
+    _add_grocer(database_repo, 50)
+    user = database_repo.get_user_by_username("grocer")
+    assert len(user.grocery_list) == 50
+
+    with count_queries(database_engine) as statements:
+        database_repo.update_user(user)
+    assert _writes(statements) == []
+
+    dropped = user.grocery_list[10]
+    user.remove_grocery(dropped)
+    with count_queries(database_engine) as statements:
+        database_repo.update_user(user)
+    assert len(_writes(statements)) == 1
+
+    user = database_repo.get_user_by_username("grocer")
+    user.grocery_list[0].quantity = 7
+    user.save_recipe(2)
+    with count_queries(database_engine) as statements:
+        database_repo.update_user(user)
+    assert len(_writes(statements)) == 2
+
+    reloaded = database_repo.get_user_by_username("grocer")
+    assert len(reloaded.grocery_list) == 49
+    assert dropped.name not in [i.name for i in reloaded.grocery_list]
+    assert reloaded.grocery_list[0].quantity == 7
+    assert reloaded.saved_recipes == [1, 2]
+
+
+def _count_commits(engine):
+    from sqlalchemy import event
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    return commits
+
+
+def _wrap(database_repo, tmp_path):
+    # the stack create_app builds in database mode
+    from pantry.adapters.caching_repository import CachingRepository
+    from pantry.adapters.version_channel import VersionChannel
+
+    return CachingRepository(database_repo, VersionChannel(tmp_path / "versions.sqlite"))
+
+
+def test_request_writes_commit_once(client, database_repo, database_engine, monkeypatch, tmp_path):
+    from pantry.adapters import repository
+    from pantry.adapters.version_channel import user_key
+    from tests.utils import make_user, login_user
+
+    repo = _wrap(database_repo, tmp_path)
+    monkeypatch.setattr(repository, "repo_instance", repo)
+    make_user(repo, username="uow", email="uow@example.com", password="Password1")
+    login_user(client, "uow", "Password1")
+
+    recipe = repo.get_all_recipes()[0]
+    selected = [f"{i};;g;;Item {i}" for i in range(15)]
+    version = repo.state_version(user_key("uow"))
+    commits = _count_commits(database_engine)
+    resp = client.post(f"/recipes/{recipe.name.replace(' ', '-')}", data={"ingredients[]": selected})
+    assert resp.status_code == 200
+    assert len(commits) == 1
+    # bumped once, after the commit
+    assert repo.state_version(user_key("uow")) == version + 1
+
+    user = repo.get_user_by_username("uow")
+    assert len(repo.get_user_recipe_ingredients_by_recipe_name(user, recipe.name)) == 15
+    assert recipe.id in user.saved_recipes
+
+
+def test_failed_request_commit_is_a_server_error(client, database_repo, database_engine, monkeypatch, tmp_path):
+    from sqlalchemy import event
+    from pantry.adapters import repository
+    from tests.utils import make_user, login_user
+
+    repo = _wrap(database_repo, tmp_path)
+    monkeypatch.setattr(repository, "repo_instance", repo)
+    make_user(repo, username="lost", email="lost@example.com", password="Password1")
+    login_user(client, "lost", "Password1")
+    recipe = repo.get_all_recipes()[0]
+
+    def fail(conn):
+        raise RuntimeError("disk full")
+
+    event.listen(database_engine, "commit", fail)
+    try:
+        resp = client.post(f"/recipes/{recipe.name.replace(' ', '-')}", data={"ingredients[]": ["1;;g;;Salt"]})
+    finally:
+        event.remove(database_engine, "commit", fail)
+    assert resp.status_code == 500
+
+    user = repo.get_user_by_username("lost")
+    assert repo.get_user_recipe_ingredients_by_recipe_name(user, recipe.name) == []
+    assert recipe.id not in user.saved_recipes
+
+
+def test_unit_of_work_rolls_back_on_error(database_repo):
+    from pantry.domainmodel.category import Category
+
+    database_repo.begin_unit_of_work()
+    database_repo.add_category(Category("Uncommitted"))
+    assert database_repo.get_category_by_name("Uncommitted") is not None
+    database_repo.end_unit_of_work(RuntimeError("view failed"))
+
+    assert database_repo.get_category_by_name("Uncommitted") is None
+
+
+def test_both_backends_share_category_instances(database_repo, memory_repo):
+    from pantry.domainmodel.category import Category
+
+    from_database = database_repo.get_ingredient_by_name("Carrot").categories
+    from_memory = memory_repo.get_ingredient_by_name("Carrot").categories
+    assert from_database and all(isinstance(c, Category) for c in from_database)
+    assert all(a is b for a, b in zip(from_database, from_memory))
+    assert database_repo.get_category_by_name(from_database[0].name) is from_database[0]
+    assert memory_repo.get_category_by_name(from_memory[0].name) is from_memory[0]
+
+
+def test_recipes_by_category_are_ordered_like_the_memory_repository(database_repo, memory_repo):
+    names = [r.name for r in database_repo.get_recipes_by_category("main")]
+    assert len(names) > 1
+    assert names == sorted(names)
+    assert names == [r.name for r in memory_repo.get_recipes_by_category("main")]
+
+
+def test_database_keeps_quantity_ranges(database_repo, memory_repo):
+    stored = database_repo.get_recipe_by_name("Pineapple Chicken")
+    line = next(line for line in stored.ingredients if line.name == "Chicken Thighs")
+    assert (line.quantity_text, line.quantity, line.quantity_max) == ("900-1000", 900.0, 1000.0)
+    assert stored.ingredients == memory_repo.get_recipe_by_name("Pineapple Chicken").ingredients
+
+
+def test_upgrade_schema_adds_quantity_max(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+    from pantry.adapters import orm
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE recipe_ingredients (id INTEGER PRIMARY KEY, name VARCHAR, quantity FLOAT)"))
+    orm.upgrade_schema(engine)
+    orm.upgrade_schema(engine)
+    assert "quantity_max" in {c["name"] for c in inspect(engine).get_columns("recipe_ingredients")}
+    engine.dispose()
+
+
+def test_sort_recipes_by_category_treats_wildcards_literally(database_repo):
+    assert database_repo.get_all_recipes()
+    assert database_repo.sort_recipes_by_category("%") == []
+    assert database_repo.sort_recipes_by_category("_") == []
@@ -0,0 +1,36 @@
+from tests.utils import make_user, login_user
+
+
+def test_suggest_api_returns_prefix_completions(client, memory_repo):
+    make_user(memory_repo, username="sue", email="sue@example.com", password="Password1")
+    login_user(client, "sue", "Password1")
+
+    resp = client.get("/search/api/suggest?q=car")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["query"] == "car"
+    names = [s["name"] for s in data["suggestions"]]
+    assert "Carrot" in names
+    assert all(n.lower().startswith("car") for n in names)
+    assert {"name": "Carrot", "type": "ingredient"} in data["suggestions"]
+
+    # recipes are suggested too, and the limit is honoured
+    resp2 = client.get("/search/api/suggest?q=b&k=2")
+    assert len(resp2.get_json()["suggestions"]) <= 2
+
+    resp3 = client.get("/search/api/suggest?q=")
+    assert resp3.get_json()["suggestions"] == []
+
+
+def test_suggest_api_sees_new_recipes(client, memory_repo, sample_recipe):
+    make_user(memory_repo, username="tom", email="tom@example.com", password="Password1")
+    login_user(client, "tom", "Password1")
+
+    memory_repo.add_recipe(sample_recipe)
+    data = client.get("/search/api/suggest?q=panc").get_json()
+    assert data["suggestions"] == [{"name": "Pancakes", "type": "recipe"}]
+
+
+def test_suggest_api_requires_login(client):
+    resp = client.get("/search/api/suggest?q=car")
+    assert resp.status_code in (301, 302)
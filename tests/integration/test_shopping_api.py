@@ -33,3 +33,98 @@ def test_shopping_remove_and_download(client, memory_repo):
     assert resp3.status_code == 200
     j2 = resp3.get_json()
     assert "Grocery List" in j2["shopping_list"]
+
+
+def test_shopping_page_loads_user_once_per_request(client, memory_repo, mocker):
+    make_user(memory_repo, username="ollie", email="ollie@example.com", password="Password1")
+    login_user(client, "ollie", "Password1")
+
+    spy = mocker.spy(memory_repo, "get_user_by_username")
+    resp = client.get("/shopping")
+    assert resp.status_code == 200
+    # login_required, the view and the nav context processor share one load
+    assert spy.call_count == 1
+
+    resp2 = client.get("/shopping")
+    assert resp2.status_code == 200
+    assert spy.call_count == 2
+
+
+def test_download_consolidates_selected_recipe_ingredients(client, memory_repo):
+    from pantry.domainmodel.recipe import Recipe
+
+    for rid, name in ((9001, "Soup A"), (9002, "Soup B")):
+        memory_repo.add_recipe(
+            Recipe(rid, name, "", [("500", "g", "Carrot"), ("1", "cup(s)", "Water")], [],
+                   1, 1, 2, "Easy", "Soup", "", [], "", "")
+        )
+    user = make_user(memory_repo, username="pat", email="pat@example.com", password="Password1")
+    user.add_grocery(memory_repo.get_ingredient_by_name("Carrot"), 1)
+    for name in ("Soup A", "Soup B"):
+        user.save_recipe(memory_repo.get_recipe_by_name(name).id)
+        user.add_multiple_recipe_ingredients(name, [["500", "g", "Carrot"], ["1", "cup(s)", "Water"]])
+    memory_repo.update_user(user)
+    login_user(client, "pat", "Password1")
+
+    resp = client.get("/shopping/api/download")
+    text = resp.get_json()["shopping_list"]
+    assert "Grocery List" in text
+    # 1 kg on the grocery list plus 500 g from each recipe
+    assert text.count("Carrot") == 1
+    assert "- Carrot: 2 kg" in text
+    assert "- Water: 500 g" in text
+
+
+def test_plan_subtracts_on_hand_and_rounds_to_step(client, memory_repo):
+    user = make_user(memory_repo, username="quinn", email="quinn@example.com", password="Password1")
+    user.add_grocery(memory_repo.get_ingredient_by_name("Carrot"), 3)
+    user.add_grocery(memory_repo.get_ingredient_by_name("Potato"), 1)
+    memory_repo.update_user(user)
+    login_user(client, "quinn", "Password1")
+
+    resp = client.post("/shopping/api/plan", json={"on_hand": {"Carrot": {"quantity": 1200, "unit": "g"}, "Potato": 1}})
+    assert resp.status_code == 200
+    items = {i["name"]: i for i in resp.get_json()["items"]}
+    # 3 kg less 1.2 kg, bought in whole kilograms
+    assert (items["Carrot"]["purchase"], items["Carrot"]["purchase_unit"]) == (2, "kg")
+    assert "Potato" not in items
+
+    assert client.get("/shopping/api/plan").get_json()["items"][0]["purchase"] == 3
+    bad = client.post("/shopping/api/plan", json={"on_hand": {"Carrot": "lots"}})
+    assert bad.status_code == 400
+
+
+def test_shopping_page_etag_follows_the_users_own_changes(client, memory_repo):
+    make_user(memory_repo, username="lena", email="lena@example.com", password="Password1")
+    make_user(memory_repo, username="max", email="max@example.com", password="Password1")
+    login_user(client, "lena", "Password1")
+    tag = client.get("/shopping").headers["ETag"]
+    assert client.get("/shopping", headers={"If-None-Match": tag}).status_code == 304
+
+    # someone else's list doesn't change lena's page
+    other = memory_repo.get_user_by_username("max")
+    other.add_grocery(memory_repo.get_ingredient_by_name("Carrot"), 1)
+    memory_repo.update_user(other)
+    assert client.get("/shopping", headers={"If-None-Match": tag}).status_code == 304
+
+    client.post("/inventory/update/Carrot", json={"quantity": 2})
+    changed = client.get("/shopping", headers={"If-None-Match": tag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != tag
+    assert "Carrot" in changed.get_data(as_text=True)
+
+
+def test_shopping_page_etag_changes_when_the_version_channel_restarts(client, memory_repo, monkeypatch, tmp_path):
+    from pantry.adapters import repository
+    from pantry.adapters.caching_repository import CachingRepository
+    from pantry.adapters.version_channel import VersionChannel
+
+    path = tmp_path / "versions.sqlite"
+    monkeypatch.setattr(repository, "repo_instance", CachingRepository(memory_repo, VersionChannel(path)))
+    make_user(memory_repo, username="ida", email="ida@example.com", password="Password1")
+    login_user(client, "ida", "Password1")
+    tag = client.get("/shopping").headers["ETag"]
+
+    # a wiped temp dir: every counter is back at 0, but the data isn't
+    path.unlink()
+    monkeypatch.setattr(repository, "repo_instance", CachingRepository(memory_repo, VersionChannel(path)))
+    assert client.get("/shopping", headers={"If-None-Match": tag}).status_code == 200
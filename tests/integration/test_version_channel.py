@@ -0,0 +1,137 @@
+import multiprocessing
+import time
+
+# short poll interval so the harness runs quickly; propagation must stay
+# within it plus some scheduling slack
+POLL_INTERVAL = 0.2
+SLACK = 1.0
+NEW_RECIPE = "Cross Worker Stew"
+
+
+def _open_repo(db_path, channel_path):
+    from sqlalchemy import create_engine, NullPool
+    from sqlalchemy.orm import sessionmaker
+    from pantry.adapters.caching_repository import CachingRepository
+    from pantry.adapters.database_repository import SqlAlchemyRepository
+    from pantry.adapters.version_channel import VersionChannel
+
+    engine = create_engine(f"sqlite:///{db_path}", poolclass=NullPool)
+    repo = SqlAlchemyRepository(sessionmaker(bind=engine), str(engine.url))
+    return CachingRepository(repo, VersionChannel(channel_path, poll_interval=POLL_INTERVAL))
+
+
+def _writer(db_path, channel_path, go, written_at):
+    from pantry.domainmodel.recipe import Recipe
+
+    repo = _open_repo(db_path, channel_path)
+    repo.get_all_recipes()
+    go.wait(30)
+    repo.add_recipe(
+        Recipe(
+            id=9001, name=NEW_RECIPE, description="", ingredients=[("1", "kg", "Beef")],
+            methods=[], prep_time_mins=0, cook_time_mins=0, total_time_mins=0,
+            difficulty="", category="", cuisine="", tags=[], notes="", image_url="",
+        )
+    )
+    written_at.value = time.time()
+
+
+def _reader(db_path, channel_path, ready, written_at, results):
+    repo = _open_repo(db_path, channel_path)
+    # warm every cache that could go stale
+    assert repo.get_recipe_by_name(NEW_RECIPE) is None
+    assert repo.suggest_names("cross worker") == []
+    ready.wait()
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if written_at.value and repo.get_recipe_by_name(NEW_RECIPE) is not None:
+            seen_at = time.time()
+            suggested = ("Cross Worker Stew", "recipe") in repo.suggest_names("cross worker")
+            results.put((seen_at - written_at.value, suggested))
+            return
+        time.sleep(0.01)
+    results.put((None, False))
+
+
+def test_catalog_writes_propagate_between_workers(database_repo, database_engine, tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    db_path = database_engine.url.database
+    channel_path = str(tmp_path / "versions.sqlite")
+    database_repo._session_cm.close_current_session()
+
+    ready = ctx.Barrier(3)
+    written_at = ctx.Value("d", 0.0)
+    results = ctx.Queue()
+    readers = [
+        ctx.Process(target=_reader, args=(db_path, channel_path, ready, written_at, results))
+        for _ in range(2)
+    ]
+    writer_go = ctx.Event()
+    writer = ctx.Process(target=_writer, args=(db_path, channel_path, writer_go, written_at))
+    for p in readers + [writer]:
+        p.start()
+    ready.wait(60)
+    writer_go.set()
+
+    outcomes = [results.get(timeout=60) for _ in readers]
+    for p in readers + [writer]:
+        p.join(30)
+        assert p.exitcode == 0
+
+    for delay, suggested in outcomes:
+        assert delay is not None, "write never became visible"
+        assert delay <= POLL_INTERVAL + SLACK
+        assert suggested
+
+
+def test_version_channel_shares_bumps(tmp_path):
+    from pantry.adapters.version_channel import VersionChannel
+
+    path = tmp_path / "versions.sqlite"
+    first = VersionChannel(path, poll_interval=60)
+    second = VersionChannel(path, poll_interval=60)
+    assert first.get("catalog") == second.get("catalog") == 0
+
+    assert first.bump("catalog") == 1
+    assert first.get("catalog") == 1
+    # within the poll interval the other side keeps its last reading
+    assert second.get("catalog") == 0
+    second.refresh()
+    assert second.get("catalog") == 1
+    assert second.bump("catalog") == 2
+
+
+def test_version_channel_reads_one_counter(tmp_path):
+    from pantry.adapters.version_channel import VersionChannel
+
+    path = tmp_path / "versions.sqlite"
+    first = VersionChannel(path, poll_interval=60)
+    second = VersionChannel(path, poll_interval=60)
+    assert second.get("catalog") == second.get("user:a") == 0
+
+    first.bump("catalog")
+    first.bump("user:a")
+    assert second.read("user:a") == 1
+    assert second.get("user:a") == 1
+    # the other counters keep their last reading until the next poll
+    assert second.get("catalog") == 0
+
+
+def test_version_channel_epoch_is_set_once_per_file(tmp_path):
+    from pantry.adapters.version_channel import EPOCH, VersionChannel
+
+    path = tmp_path / "versions.sqlite"
+    epoch = VersionChannel(path).get(EPOCH)
+    assert VersionChannel(path).get(EPOCH) == epoch
+
+    path.unlink()
+    assert VersionChannel(path).get(EPOCH) != epoch
+
+
+def test_version_channel_without_path_is_process_local():
+    from pantry.adapters.version_channel import VersionChannel
+
+    channel = VersionChannel()
+    assert channel.get("catalog") == 0
+    channel.bump("catalog")
+    assert channel.get("catalog") == 1
@@ -0,0 +1,99 @@
+import gzip
+
+from flask import Flask, url_for
+
+from pantry.utilities import assets
+from pantry.utilities.assets import AssetManifest, hashed_name
+
+
+def make_app(static_root):
+    app = Flask(__name__, static_folder=str(static_root), static_url_path="/static")
+    assets.init_app(app)
+    return app
+
+
+def test_hashed_name_keeps_directory_and_extension():
+    assert hashed_name("css/globals.css", "abc123") == "css/globals.abc123.css"
+    assert hashed_name("js/vendor.min.js", "abc123") == "js/vendor.min.abc123.js"
+    assert hashed_name("LICENSE", "abc123") == "LICENSE.abc123"
+
+
+def test_manifest_hash_follows_content(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_text("body{color:red}")
+    (tmp_path / "css" / "site.css.gz").write_bytes(b"compressed")
+
+    manifest = AssetManifest(tmp_path, watch=True)
+    built = manifest.build()
+    assert list(built) == ["css/site.css"]
+    first = manifest.hashed("css/site.css")
+    assert manifest.original(first) == "css/site.css"
+    assert manifest.hashed("css/missing.css") == "css/missing.css"
+
+    (tmp_path / "css" / "site.css").write_text("body{color:blue}")
+    second = manifest.hashed("css/site.css")
+    assert second != first and manifest.original(second) == "css/site.css"
+
+
+def test_hashed_urls_are_served_immutable(tmp_path):
+    (tmp_path / "app.js").write_text("console.log(1)")
+    app = make_app(tmp_path)
+    with app.test_request_context():
+        url = url_for("static", filename="app.js")
+    assert url != "/static/app.js" and url.endswith(".js")
+
+    client = app.test_client()
+    response = client.get(url)
+    assert response.status_code == 200 and response.data == b"console.log(1)"
+    assert response.cache_control.immutable and response.cache_control.max_age == 31536000
+
+    plain = client.get("/static/app.js")
+    assert plain.status_code == 200 and not plain.cache_control.immutable
+    assert client.get("/static/app.0000000000.js").status_code == 404
+
+
+def test_compress_static_writes_siblings_and_skips_unchanged(tmp_path):
+    css = tmp_path / "site.css"
+    css.write_text("body { color: red; }\n" * 50)
+    (tmp_path / "tiny.js").write_text("x()")
+    (tmp_path / "photo.png").write_bytes(b"\x89PNG" * 100)
+
+    assert assets.compress_static(tmp_path) == {"compressed": 1, "skipped": 0, "removed": 0}
+    assert gzip.decompress((tmp_path / "site.css.gz").read_bytes()) == css.read_bytes()
+    assert not (tmp_path / "tiny.js.gz").exists() and not (tmp_path / "photo.png.gz").exists()
+    assert assets.compress_static(tmp_path) == {"compressed": 0, "skipped": 1, "removed": 0}
+
+    css.unlink()
+    stats = assets.compress_static(tmp_path)
+    assert stats["removed"] == (2 if assets.brotli is not None else 1)
+    assert not (tmp_path / "site.css.gz").exists()
+
+
+def test_static_route_negotiates_precompressed_variants(tmp_path):
+    body = b"body { color: red; }\n" * 50
+    (tmp_path / "site.css").write_bytes(body)
+    assets.compress_static(tmp_path)
+    client = make_app(tmp_path).test_client()
+
+    plain = client.get("/static/site.css")
+    assert plain.content_encoding is None and plain.data == body
+    assert "Accept-Encoding" in plain.vary
+
+    gzipped = client.get("/static/site.css", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert gzipped.content_encoding == "gzip" and gzip.decompress(gzipped.data) == body
+    assert gzipped.mimetype == "text/css" and "Accept-Encoding" in gzipped.vary
+
+    if assets.brotli is not None:
+        best = client.get("/static/site.css", headers={"Accept-Encoding": "gzip, deflate, br"})
+        assert best.content_encoding == "br" and assets.brotli.decompress(best.data) == body
+
+    assert client.get("/static/site.css", headers={"Accept-Encoding": "deflate"}).content_encoding is None
+
+
+def test_stale_precompressed_variant_is_not_served(tmp_path):
+    (tmp_path / "site.css").write_text("body { color: red; }\n" * 50)
+    assets.compress_static(tmp_path)
+    (tmp_path / "site.css").write_text("body { color: blue; }\n" * 50)
+
+    response = make_app(tmp_path).test_client().get("/static/site.css", headers={"Accept-Encoding": "gzip"})
+    assert response.content_encoding is None and b"blue" in response.data
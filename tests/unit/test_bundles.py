@@ -0,0 +1,56 @@
+import pytest
+
+from pantry.utilities.bundles import BUNDLES, STATIC_ROOT, bundle_paths, build_bundles, minify_css, minify_js, render_bundle
+
+
+@pytest.mark.parametrize("name", sorted(BUNDLES))
+def test_committed_bundles_match_their_sources(name):
+    # run `flask --app wsgi build-bundles` after editing a bundled file
+    for path, text, sources in zip(bundle_paths(name), render_bundle(name), BUNDLES[name]):
+        if sources:
+            assert (STATIC_ROOT / path).read_text(encoding="utf-8") == text + "\n", path
+        else:
+            assert not (STATIC_ROOT / path).exists()
+
+
+def test_minify_css_strips_comments_and_whitespace():
+    source = """
+    /* header */
+    .a > .b ,
+    .c :hover {
+        content: "  keep  /* this */ ";
+        margin : 0 auto;
+    }
+    """
+    assert minify_css(source) == '.a>.b,.c :hover{content:"  keep  /* this */ ";margin :0 auto}'
+
+
+def test_minify_js_keeps_strings_templates_regexes_and_line_breaks():
+    source = """
+    // setup
+    const url = "http://example.com/a"; /* note */
+    let total = a / b / 2
+    const pattern = /\\/\\/ [a-z/]+/g;
+    el.innerHTML = `
+        <b>${ items.map(i => `${i}  `).join(", ") }</b>`;
+    return x
+        - -y
+    """
+    assert minify_js(source) == (
+        'const url="http://example.com/a";let total=a / b / 2\n'
+        "const pattern=/\\/\\/ [a-z/]+/g;el.innerHTML=`\n"
+        '        <b>${items.map(i=>`${i}  `).join(", ")}</b>`;return x\n- -y'
+    )
+
+
+def test_build_bundles_only_rewrites_changed_output(tmp_path, monkeypatch):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css" / "a.css").write_text("a { color: red; }")
+    (tmp_path / "js" / "a.js").write_text("go( 1 );")
+    monkeypatch.setattr("pantry.utilities.bundles.BUNDLES", {"page": (("css/a.css",), ("js/a.js",))})
+
+    assert build_bundles(tmp_path) == ["bundles/page.css", "bundles/page.js"]
+    assert (tmp_path / "bundles" / "page.css").read_text() == "a{color:red}\n"
+    assert build_bundles(tmp_path) == []
+    assert build_bundles(tmp_path, stale_only=True) == []
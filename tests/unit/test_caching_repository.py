@@ -0,0 +1,133 @@
+import pytest
+
+from pantry.adapters.caching_repository import CachingRepository
+
+
+def test_memory_get_recipes_by_ids_keeps_order(memory_repo):
+    ids = [r.id for r in memory_repo.get_all_recipes()[:3]]
+    recipes = memory_repo.get_recipes_by_ids(list(reversed(ids)) + [-1])
+    assert [r.id for r in recipes] == list(reversed(ids))
+
+
+def test_caching_repository_loads_catalog_once(memory_repo, mocker):
+    repo = CachingRepository(memory_repo)
+    load_recipes = mocker.spy(memory_repo, "get_all_recipes")
+    load_ingredients = mocker.spy(memory_repo, "get_all_ingredients")
+
+    first = repo.get_all_recipes()
+    ids = [r.id for r in first[:2]]
+    for _ in range(3):
+        assert [r.id for r in repo.get_recipes_by_ids(ids)] == ids
+        assert repo.get_recipe_by_name(first[0].name.upper()) is first[0]
+        assert repo.get_ingredient_by_name("carrot").name == "Carrot"
+    assert load_recipes.call_count == 1
+    assert load_ingredients.call_count == 1
+
+
+def test_caching_repository_reloads_after_catalog_write(memory_repo, sample_recipe, sample_ingredient):
+    repo = CachingRepository(memory_repo)
+    version = repo.catalog_version
+    assert repo.get_recipe_by_name("Pancakes") is None
+
+    repo.add_recipe(sample_recipe)
+    repo.add_ingredient(sample_ingredient)
+    assert repo.catalog_version > version
+    assert repo.get_recipes_by_ids([sample_recipe.id]) == [sample_recipe]
+    assert repo.get_ingredient_by_name("Sugar").unit == "kg"
+
+
+def test_caching_repository_hands_out_ingredient_copies(memory_repo):
+    repo = CachingRepository(memory_repo)
+    ingredient = repo.get_ingredient_by_name("Carrot")
+    ingredient.quantity = 42
+    assert repo.get_ingredient_by_name("Carrot").quantity == 0
+
+
+def test_caching_repository_delegates_everything_else(memory_repo):
+    repo = CachingRepository(memory_repo)
+    assert repo.get_user_by_username("CNK") is memory_repo.get_user_by_username("CNK")
+    assert repo.sort_ingredients_by_name("arro") == memory_repo.sort_ingredients_by_name("arro")
+    assert repo.suggest_names("carr") == memory_repo.suggest_names("carr")
+
+
+def test_cookable_recipes_match_across_backends(memory_repo, mocker):
+    recipe = memory_repo.get_all_recipes()[0]
+    pantry = [line.name for line in recipe.ingredients]
+
+    found = memory_repo.get_cookable_recipes(pantry)
+    assert (recipe, []) in found
+    missing_one = memory_repo.get_cookable_recipes(pantry[1:], max_missing=1)
+    assert (recipe, [recipe.ingredients[0].name]) in missing_one
+
+    repo = CachingRepository(memory_repo)
+    spy = mocker.spy(memory_repo, "get_cookable_recipes")
+    assert repo.get_cookable_recipes(pantry) == found
+    assert repo.get_cookable_recipes(pantry[1:], max_missing=1) == missing_one
+    assert spy.call_count == 0
+
+
+def test_caching_repository_recommendations_use_cached_catalog(memory_repo, mocker):
+    repo = CachingRepository(memory_repo)
+    ids = [r.id for r in memory_repo.get_all_recipes()[:2]]
+    similar = mocker.spy(memory_repo, "get_similar_recipes")
+
+    assert repo.get_similar_recipes(ids[0], 3) == memory_repo.get_similar_recipes(ids[0], 3)
+    assert repo.get_recommended_recipes(ids, 3) == memory_repo.get_recommended_recipes(ids, 3)
+    assert similar.call_count == 1  # only the direct call above
+
+
+def test_caching_repository_bumps_user_version_after_the_unit_of_work(memory_repo):
+    from pantry.adapters.version_channel import user_key
+
+    repo = CachingRepository(memory_repo)
+    user = repo.get_user_by_username("CNK")
+    key = user_key("CNK")
+    version = repo.state_version(key)
+
+    repo.begin_unit_of_work()
+    repo.update_user(user)
+    assert repo.state_version(key) == version
+    repo.end_unit_of_work()
+    assert repo.state_version(key) == version + 1
+
+    # outside a unit of work the write is visible at once
+    repo.add_saved_recipe(1, user)
+    assert repo.state_version(key) == version + 2
+
+
+def test_caching_repository_bumps_catalog_after_the_unit_of_work(memory_repo, sample_recipe, mocker):
+    repo = CachingRepository(memory_repo)
+    version = repo.catalog_version
+
+    # a failed request that wrote nothing to the catalog keeps every cache
+    repo.begin_unit_of_work()
+    repo.end_unit_of_work(RuntimeError("boom"))
+    assert repo.catalog_version == version
+
+    repo.begin_unit_of_work()
+    repo.add_recipe(sample_recipe)
+    assert repo.catalog_version == version
+    repo.end_unit_of_work()
+    assert repo.catalog_version == version + 1
+
+    # a commit that fails still drops caches loaded with the flushed rows
+    mocker.patch.object(memory_repo, "end_unit_of_work", side_effect=RuntimeError("commit failed"))
+    repo.begin_unit_of_work()
+    repo.add_recipe(sample_recipe)
+    with pytest.raises(RuntimeError):
+        repo.end_unit_of_work()
+    assert repo.catalog_version == version + 2
+
+
+def test_fresh_state_version_sees_other_workers_bumps(memory_repo, tmp_path):
+    from pantry.adapters.version_channel import VersionChannel, user_key
+
+    path = str(tmp_path / "versions.sqlite")
+    worker_a = CachingRepository(memory_repo, VersionChannel(path, poll_interval=60))
+    worker_b = CachingRepository(memory_repo, VersionChannel(path, poll_interval=60))
+    key = user_key("CNK")
+    before = worker_b.state_version(key)
+
+    worker_a.update_user(memory_repo.get_user_by_username("CNK"))
+    assert worker_b.state_version(key) == before
+    assert worker_b.state_version(key, fresh=True) == before + 1
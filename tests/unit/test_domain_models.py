@@ -54,6 +54,16 @@ def test_user_grocery_and_recipe_ingredients():
     assert len(u.grocery_list) == 1
     assert u.grocery_list[0].quantity == 2
 
+    # same ingredient at another quantity merges instead of duplicating
+    u.add_grocery(Ingredient("tomato", 0, "pc"), 3)
+    assert len(u.grocery_list) == 1
+    assert u.grocery_list[0].quantity == 5
+    assert ing.quantity == 1  # the list keeps its own copy
+    assert u.get_grocery("TOMATO") is u.grocery_list[0]
+    assert u.remove_grocery("TOMATO").name == "Tomato"
+    assert u.grocery_list == []
+    assert u.remove_grocery(ing) is None
+
     u.add_recipe_ingredient("Pancakes", "1 cup flour")
     assert "Pancakes" in u.recipe_ingredients
     u.remove_recipe_ingredient("Pancakes", "1 cup flour")
@@ -65,3 +75,81 @@ def test_user_grocery_and_recipe_ingredients():
     assert len(u.recipe_ingredients["Pancakes"]) == 1
     u.clear_recipe_ingredients_by_recipe("Pancakes")
     assert "Pancakes" not in u.recipe_ingredients
+
+
+def test_recipe_ingredient_selections_are_case_insensitive():
+    from pantry.domainmodel.recipe_selections import RecipeIngredientSelections
+
+    selections = RecipeIngredientSelections({"Pancakes": [["1", "cup", "Flour"]]})
+    selections.add_many("PANCAKES", [["2", "", "Egg"], ["1", "cup", "flour"], "Pinch of salt"])
+    assert selections.as_dict() == {
+        "Pancakes": [["1", "cup", "Flour"], ["2", "", "Egg"], "Pinch of salt"]
+    }
+    assert "pancakes" in selections
+    assert selections.get("pancakes")[1] == ["2", "", "Egg"]
+
+    selections.remove_many("pancakes", ["FLOUR", ["2", "", "egg"]])
+    assert selections.get("Pancakes") == ["Pinch of salt"]
+    assert selections.remove("Pancakes", "pinch of salt")
+    assert "Pancakes" not in selections
+    assert selections.as_dict() == {}
+
+
+def test_user_recipe_ingredients_view_and_lookup():
+    from pantry.domainmodel.user import User
+
+    u = User(1, "u", "u@example.com")
+    u.add_multiple_recipe_ingredients("Jam", [["1", "kg", "Sugar"], ["2", "kg", "Plums"]])
+    assert u.get_recipe_ingredients("JAM") == [["1", "kg", "Sugar"], ["2", "kg", "Plums"]]
+    u.recipe_ingredients["Jam"].clear()  # a snapshot, not the store
+    assert len(u.get_recipe_ingredients("jam")) == 2
+    u.remove_multiple_recipe_ingredients("jam", ["sugar", "plums"])
+    assert u.recipe_ingredients == {}
+
+
+def test_domain_objects_are_slotted_and_share_strings():
+    from pantry.domainmodel.category import Category
+    from pantry.domainmodel.ingredient import Ingredient
+    from pantry.domainmodel.recipe import Recipe
+    from pantry.domainmodel.user import User
+
+    def parsed(value):
+        return (" " + value)[1:]
+
+    for obj in (Category("Fruit"), Ingredient("Apple", 1, "kg"), User(1, "u", "u@example.com")):
+        assert not hasattr(obj, "__dict__")
+
+    r1, r2 = (
+        Recipe(i, f"R{i}", "", [(parsed("1"), parsed("cup"), parsed("Flour"))], ["mix"],
+               1, 2, 3, parsed("Easy"), parsed("Main"), parsed("Italian"), [parsed("quick")], "", "")
+        for i in range(2)
+    )
+    assert not hasattr(r1, "__dict__")
+    assert r1.cuisine is r2.cuisine
+    assert r1.tags[0] is r2.tags[0]
+    assert r1.ingredients[0][1] is r2.ingredients[0][1]
+    assert Ingredient("A", 1, parsed("kg")).unit is Ingredient("B", 1, parsed("kg")).unit
+
+
+def test_recipe_ingredient_lines_are_parsed_once():
+    from pantry.domainmodel.recipe import Recipe
+    from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine, parse_quantity
+
+    assert parse_quantity("1 1/2") == (1.5, None)
+    assert parse_quantity("½") == (0.5, None)
+    assert parse_quantity("900-1000") == (900, 1000)
+    assert parse_quantity("Handful") == (None, None)
+
+    line = RecipeIngredientLine.parse(("3", "cup(s)", "Flour"))
+    assert (line.quantity, line.unit, line.name) == (3.0, "cup", "Flour")
+    assert line[0] == "3"
+    split_name = RecipeIngredientLine.parse(("1", "whole", "Onion", " finely chopped"))
+    assert split_name.name == "Onion, finely chopped"
+    assert RecipeIngredientLine.parse(("", "", "")) is None
+
+    recipe = Recipe(1, "R", "", [("900-1000", "g", "Potatoes"), ("", "", "")], [],
+                    1, 1, 2, "Easy", "Main", "", [], "", "")
+    (potatoes,) = recipe.ingredients
+    assert (potatoes.quantity, potatoes.quantity_max) == (900, 1000)
+    # already-parsed lines are kept as they are
+    assert Recipe(2, "S", "", recipe.ingredients, [], 1, 1, 2, "Easy", "Main", "", [], "", "").ingredients is recipe.ingredients
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from pantry.utilities.images import ImageManifest, build_images, render_responsive_image
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def fake_url_for(endpoint, filename):
+    return f"/static/{filename}"
+
+
+@pytest.fixture
+def static_root(tmp_path):
+    (tmp_path / "images" / "recipes").mkdir(parents=True)
+    (tmp_path / "images" / "hero_carousel" / "small").mkdir(parents=True)
+    Image.new("RGB", (800, 600), "orange").save(tmp_path / "images" / "recipes" / "soup.png")
+    return tmp_path
+
+
+def test_build_images_skips_unchanged_sources(static_root):
+    assert build_images(static_root) == {"built": 1, "skipped": 0}
+    entry = ImageManifest(static_root).get("images/recipes/soup.png")
+    assert (entry["width"], entry["height"]) == (800, 600)
+    assert [w for w, _ in entry["variants"]["jpeg"]] == [320, 640, 800]
+    assert all((static_root / path).exists() for variants in entry["variants"].values() for _, path in variants)
+
+    assert build_images(static_root) == {"built": 0, "skipped": 1}
+
+    Image.new("RGB", (400, 300), "green").save(static_root / "images" / "recipes" / "soup.png")
+    assert build_images(static_root) == {"built": 1, "skipped": 0}
+    assert [w for w, _ in ImageManifest(static_root).get("images/recipes/soup.png")["variants"]["jpeg"]] == [320, 400]
+
+
+def test_responsive_image_markup(static_root):
+    build_images(static_root)
+    manifest = ImageManifest(static_root)
+
+    html = str(render_responsive_image(manifest, fake_url_for, "images/recipes/soup.png", "Soup", sizes="50vw"))
+    assert html.startswith('<picture class="responsive-image">')
+    assert 'type="image/webp"' in html
+    assert '-320.webp 320w' in html and 'sizes="50vw"' in html
+    assert 'loading="lazy"' in html and 'width="800" height="600"' in html
+
+    # not built yet: the original, without starting a build
+    plain = str(render_responsive_image(manifest, fake_url_for, "images/recipes/new.png", "<New>", on_demand=False))
+    assert plain == '<img src="/static/images/recipes/new.png" alt="&lt;New&gt;" loading="lazy" decoding="async">'
+
+
+def test_concurrent_builds_keep_each_others_entries(static_root):
+    for name in ("stew", "salad", "pie"):
+        Image.new("RGB", (400, 300), "green").save(static_root / "images" / "recipes" / f"{name}.png")
+    sources = ["images/recipes/soup.png", "images/recipes/stew.png", "images/recipes/salad.png",
+               "images/recipes/pie.png"]
+    # one manifest per worker, each loaded before the other has written
+    workers = [ImageManifest(static_root), ImageManifest(static_root)]
+    for manifest in workers:
+        manifest.entries()
+    threads = [threading.Thread(target=manifest.build, args=(sources[i::2],)) for i, manifest in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ImageManifest(static_root).entries()) == sorted(sources)
+
+
+def test_sources_outside_static_are_rejected(static_root):
+    Image.new("RGB", (400, 300), "red").save(static_root.parent / "secret.png")
+    manifest = ImageManifest(static_root)
+
+    with pytest.raises(ValueError):
+        manifest.build(["../secret.png"])
+    manifest.build_in_background("../secret.png")
+    assert not (static_root / "images" / "derived").exists()
+
+
+def test_replaced_source_falls_back_to_the_original(static_root):
+    build_images(static_root)
+    manifest = ImageManifest(static_root)
+    assert str(render_responsive_image(manifest, fake_url_for, "images/recipes/soup.png", "Soup")).startswith("<picture")
+
+    Image.new("RGB", (400, 300), "green").save(static_root / "images" / "recipes" / "soup.png")
+    html = str(render_responsive_image(manifest, fake_url_for, "images/recipes/soup.png", "Soup", on_demand=False))
+    assert html.startswith('<img src="/static/images/recipes/soup.png"')
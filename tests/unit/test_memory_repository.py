@@ -1,3 +1,6 @@
+from pantry.adapters import repository
+
+
 def test_memory_repository_basic_ops(
     memory_repo, sample_ingredient, sample_category, sample_recipe
 ):
@@ -41,3 +44,51 @@ def test_user_saved_recipe_and_ingredients(memory_repo, sample_recipe):
         memory_repo.get_user_recipe_ingredients_by_recipe_name(user, sample_recipe.name)
         == []
     )
+
+
+def test_memory_repository_name_lookups_are_case_insensitive(memory_repo):
+    assert memory_repo.get_ingredient_by_name("carrot").name == "Carrot"
+    assert memory_repo.get_ingredient_by_name("NoSuchIngredient") is None
+
+
+def test_memory_repository_user_lookups_match_exactly(memory_repo):
+    assert memory_repo.get_user_by_username("CNK").username == "CNK"
+    assert memory_repo.get_user_by_username("cnk") is None
+    assert memory_repo.get_user_by_email("example@gmail.com").username == "Connor"
+    assert memory_repo.get_user_by_email("EXAMPLE@gmail.com") is None
+
+
+def test_memory_repository_update_user_reindexes(memory_repo):
+    user = memory_repo.create_user("rita", "rita@example.com", "hash")
+    memory_repo.add_user(user)
+
+    user.username = "rita2"
+    user.email = "rita2@example.com"
+    memory_repo.update_user(user)
+
+    assert memory_repo.get_user_by_username("rita") is None
+    assert memory_repo.get_user_by_email("rita@example.com") is None
+    assert memory_repo.get_user_by_username("rita2") is user
+    assert memory_repo.get_user_by_email("rita2@example.com") is user
+
+
+def test_memory_repository_removes_multiple_recipe_ingredients(memory_repo):
+    user = memory_repo.get_user_by_username("CNK")
+    memory_repo.add_multiple_user_recipe_ingredients(
+        user, "Jam", [["1", "kg", "Sugar"], ["2", "kg", "Plums"], ["1", "", "Lemon"]]
+    )
+    memory_repo.remove_multiple_user_recipe_ingredients(user, "jam", ["Sugar", "LEMON"])
+    assert memory_repo.get_user_recipe_ingredients_by_recipe_name(user, "JAM") == [
+        ["2", "kg", "Plums"]
+    ]
+
+
+def test_memory_repository_runs_user_write_hook(memory_repo, monkeypatch):
+    written = []
+    monkeypatch.setattr(repository, "user_write_hook", written.append)
+    user = memory_repo.create_user("nell", "nell@example.com", "hash")
+    memory_repo.add_user(user)
+    memory_repo.add_user_recipe_ingredient(user, "Jam", ["1", "kg", "Sugar"])
+    memory_repo.update_user(user)
+
+    assert written == [user, user, user]
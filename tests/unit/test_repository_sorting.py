@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_repository_sorting_and_filters(memory_repo):
     # ensure repository has ingredients from populate
     all_ings = memory_repo.get_all_ingredients()
@@ -15,3 +18,106 @@ def test_repository_sorting_and_filters(memory_repo):
         catname = cats[0].name if hasattr(cats[0], "name") else str(cats[0])
         res2 = memory_repo.sort_ingredients_by_category(catname)
         assert isinstance(res2, list)
+
+
+def test_category_search_has_no_duplicates(memory_repo):
+    # "vegetable" matches several category names on the same ingredient
+    results = memory_repo.sort_ingredients_by_category("vegetable")
+    names = [ing.name for ing in results]
+    assert names
+    assert len(names) == len(set(names))
+    assert names == sorted(names)
+
+
+def test_get_ingredients_by_category_exact(memory_repo):
+    carrot = memory_repo.get_ingredient_by_name("Carrot")
+    catname = carrot.categories[0].name
+    results = memory_repo.get_ingredients_by_category(catname.upper())
+    assert carrot in results
+
+
+def test_recipe_category_cuisine_and_tag_indexes(memory_repo, sample_recipe):
+    memory_repo.add_recipe(sample_recipe)
+    assert sample_recipe in memory_repo.get_recipes_by_category("breakfast")
+    assert sample_recipe in memory_repo.get_recipes_by_cuisine("American")
+    assert sample_recipe in memory_repo.get_recipes_by_tag("SWEET")
+    assert sample_recipe in memory_repo.sort_recipes_by_category("break")
+    assert memory_repo.get_recipes_by_tag("savoury") == []
+
+
+def test_ngram_index_contains_queries():
+    from pantry.adapters.search_index import NGramIndex
+
+    index = NGramIndex()
+    index.add_many((name, name) for name in ["Sweet Potato", "Potato", "Tomato", "Oat"])
+    index.add("Potatoes", "Potatoes")
+
+    assert index.search("potat") == ["Potato", "Potatoes", "Sweet Potato"]
+    assert index.search("to") == ["Potato", "Potatoes", "Sweet Potato", "Tomato"]
+    assert index.search("oa") == ["Oat"]
+    # all trigrams present but not as a contiguous substring
+    assert index.search("tatomato") == []
+    assert index.search("") == ["Oat", "Potato", "Potatoes", "Sweet Potato", "Tomato"]
+
+
+def test_prefix_index_completions():
+    from pantry.adapters.search_index import PrefixIndex
+
+    index = PrefixIndex()
+    index.add_many([("Potato", "ingredient"), ("Pork Chops", "recipe"), ("Onion", "ingredient")])
+    index.add("Potatoes", "ingredient")
+    index.add("potato", "ingredient")  # duplicate after case folding
+
+    assert index.complete("po") == [
+        ("Pork Chops", "recipe"),
+        ("Potato", "ingredient"),
+        ("Potatoes", "ingredient"),
+    ]
+    assert index.complete("PO", limit=1) == [("Pork Chops", "recipe")]
+    assert index.complete("x") == []
+    assert index.complete("") == []
+
+
+def test_ingredient_bitset_index_cookable():
+    from pantry.adapters.search_index import IngredientBitsetIndex
+
+    index = IngredientBitsetIndex(["Egg", "Flour", "Milk"])
+    index.add_many([(1, ["Egg", "Flour", "Milk"]), (2, ["egg"]), (3, ["Flour", "Butter", "Sugar"])])
+
+    assert index.cookable(["EGG", "Flour", "Milk", "Saffron"]) == [(1, 0), (2, 0)]
+    assert index.cookable(["Egg"]) == [(2, 0)]
+    found = index.cookable(["Flour"], max_missing=2)
+    assert [rid for rid, _ in found] == [2, 1, 3]
+    assert index.names(found[2][1]) == ["Butter", "Sugar"]
+    # re-adding a recipe replaces its ingredients
+    index.add(2, ["Egg", "Salt"])
+    assert index.cookable(["Egg"]) == []
+
+
+def test_recipe_similarity_index():
+    from pantry.adapters.similarity_index import RecipeSimilarityIndex
+    from pantry.domainmodel.recipe import Recipe
+
+    def recipe(rid, ingredients, cuisine, tags=()):
+        return Recipe(rid, f"R{rid}", "", [("1", "", name) for name in ingredients], [],
+                      1, 1, 2, "Easy", "Main", cuisine, list(tags), "", "")
+
+    index = RecipeSimilarityIndex()
+    index.add_many([
+        recipe(1, ["Beef", "Pasta", "Tomato"], "Italian", ["dinner"]),
+        recipe(2, ["Beef", "Pasta", "Cheese"], "Italian", ["dinner"]),
+        recipe(3, ["Rice", "Curry Paste", "Chicken"], "Thai"),
+        recipe(4, ["Rice", "Chicken", "Coconut Milk"], "Thai"),
+    ])
+
+    # the shared "Main" category still links the two groups, weakly
+    ranked = [rid for rid, _ in index.similar(1)]
+    assert ranked[0] == 2 and sorted(ranked) == [2, 3, 4]
+    assert index.similar(3, 1)[0][0] == 4
+    assert {rid for rid, _ in index.recommend([1, 3], 2)} == {2, 4}
+    assert index.similar(99) == [] and index.recommend([]) == []
+
+    # new recipes are scored straight away
+    index.add(recipe(5, ["Beef", "Pasta", "Tomato"], "Italian", ["dinner"]))
+    assert index.similar(1, 1)[0][0] == 5
+    assert index.similar(1, 1)[0][1] == pytest.approx(1.0, abs=0.05)
@@ -0,0 +1,80 @@
+import pytest
+
+from pantry.domainmodel.ingredient import Ingredient
+from pantry.domainmodel.recipe_ingredient_line import RecipeIngredientLine
+from pantry.domainmodel.shopping_list import consolidate, plan_purchases
+from pantry.domainmodel.units import canonical_unit, display_amount, to_canonical
+
+
+def line(qty, unit, name):
+    return RecipeIngredientLine.parse((qty, unit, name))
+
+
+def test_units_convert_to_canonical():
+    assert to_canonical(1.5, "kg") == (1500.0, "g")
+    assert to_canonical(2, "Tablespoon") == (30.0, "ml")
+    assert to_canonical(1, "cup(s)") == (250.0, "ml")
+    assert to_canonical(3, "whole") == (3, "each")
+    assert canonical_unit("clove") == ("clove", 1.0)
+    # density overrides turn volumes into mass
+    assert to_canonical(1, "cup", "Flour") == pytest.approx((132.5, "g"))
+    assert display_amount(1500.0, "g") == ("1.5", "kg")
+    assert display_amount(250.0, "ml") == ("250", "ml")
+
+
+def test_consolidate_adds_up_across_recipes_and_groceries():
+    lines = [
+        line("500", "g", "Carrot"),
+        line("1", "kg", "carrot"),
+        Ingredient("Carrot", 2, "kg"),
+        line("1", "tsp", "Salt"),
+        line("2", "teaspoons", "Salt"),
+        line("900-1000", "ml", "Stock"),
+        line("1", "l", "Stock"),
+        line("2", "clove", "Garlic"),
+        line("1", "", "Garlic"),
+        line("Handful", "", "Basil"),
+    ]
+    items = {(i.name, i.unit): i for i in consolidate(lines)}
+
+    assert items[("Carrot", "g")].quantity == 3500
+    assert items[("Carrot", "g")].display() == "3.5 kg"
+    assert items[("Salt", "g")].quantity == pytest.approx(18.0)
+    stock = items[("Stock", "ml")]
+    assert (stock.quantity, stock.quantity_max) == (1900, 2000)
+    assert stock.display() == "1.9-2 l"
+    assert items[("Garlic", "clove")].quantity == 2
+    assert items[("Garlic", "each")].display() == "1"
+    assert items[("Basil", "each")].quantity is None
+    assert len(items) == 6
+
+
+def test_plan_purchases_subtracts_stock_and_rounds_to_step():
+    catalog = {
+        "carrot": Ingredient("Carrot", 0, "kg", step=1),
+        "milk": Ingredient("Milk", 0, "L", step=1),
+        "eggs": Ingredient("Eggs", 0, "pieces", step=6),
+    }
+    demand = consolidate([
+        line("1500", "g", "Carrot"),
+        line("1", "kg", "Carrot"),
+        line("300-400", "ml", "Milk"),
+        line("3", "", "Eggs"),
+        line("4", "whole", "Eggs"),
+        line("2", "tbsp", "Paprika"),
+        line("", "", "Basil"),
+        line("200", "g", "Rice"),
+    ])
+    on_hand = [line("1", "kg", "Carrot"), line("1", "l", "Milk"), line("250", "g", "rice")]
+    plan = {p.name: p for p in plan_purchases(demand, on_hand, lambda name: catalog.get(name.casefold()))}
+
+    carrot = plan["Carrot"]
+    assert (carrot.needed, carrot.on_hand, carrot.shortfall) == (2500, 1000, 1500)
+    assert (carrot.purchase, carrot.purchase_unit) == (2, "kg")
+    assert (plan["Eggs"].purchase, plan["Eggs"].purchase_unit) == (12, "pieces")
+    # not in the catalog: bought as needed in the canonical unit
+    assert (plan["Paprika"].purchase, plan["Paprika"].purchase_unit) == (30, "ml")
+    assert plan["Basil"].purchase is None
+    # milk (densities turn it into grams, which the catalog's litres match)
+    # and rice are covered by stock
+    assert "Milk" not in plan and "Rice" not in plan
@@ -1,3 +1,6 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash
 
 
@@ -14,3 +17,18 @@ def login_user(client, username, password):
         data={"username": username, "password": password},
         follow_redirects=True,
     )
+
+
+@contextmanager
+def count_queries(engine):
+    # collects the SQL statements executed on `engine` inside the block
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)